@@ -0,0 +1,4 @@
+"""
+Command-line tools
+Run from the backend directory, e.g. python -m app.cli.bulk_ingest --help
+"""
@@ -0,0 +1,340 @@
+"""
+Bulk resume ingestion
+
+Usage (from the backend directory):
+    python -m app.cli.bulk_ingest resumes.zip --output resumes.jsonl
+    python -m app.cli.bulk_ingest resumes/ --output resumes.parquet --workers 8
+    python -m app.cli.bulk_ingest resumes/ --output resumes.jsonl --insert --user-id <uuid>
+
+Parses every PDF of a directory (recursively) or zip archive with ResumeParser and
+SkillExtractor across a process pool. Results are written to JSONL, or to a directory
+of Parquet part files when the output ends in .parquet (needs pyarrow or fastparquet).
+With --insert, resumes are bulk-inserted through DatabaseService.insert_rows for the
+given user, one multi-row insert per batch. They are not added to the candidate index:
+it keeps only the latest resume of each user, so a whole import owned by one account
+would leave a single candidate.
+
+Progress is checkpointed after every batch, so rerunning the same command after an
+interruption skips the documents already processed. Documents that cannot be parsed
+are written with an error and counted as failures; they are not retried on rerun.
+Output is at-least-once: a batch written just before an interruption, but not yet
+checkpointed, is written again on rerun. Resume ids are derived from the source and
+document name, so consumers can drop repeats by resume_id.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+import zipfile
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Namespace for resume ids derived from the source and document names, so reruns reuse the same ids
+RESUME_ID_NAMESPACE = uuid.UUID("6f1d4c52-2b8e-4f7a-9a51-0d3c8e7b4a10")
+
+# Per-process state set by _init_worker
+_source: Optional[str] = None
+_archive: Optional[zipfile.ZipFile] = None
+_parser = None
+_extractor = None
+
+
+def list_documents(source: str) -> List[str]:
+    """
+    List the PDFs of a directory or zip archive
+
+    Returns:
+        Sorted document names: paths relative to the directory, or archive member names
+    """
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            names = [
+                info.filename for info in archive.infolist()
+                if not info.is_dir() and info.filename.lower().endswith(".pdf")
+            ]
+    else:
+        names = []
+        for root, _, files in os.walk(source):
+            for filename in files:
+                if filename.lower().endswith(".pdf"):
+                    names.append(os.path.relpath(os.path.join(root, filename), source))
+    return sorted(names)
+
+
+def _init_worker(source: str):
+    """Open the source and build the parsing services once per worker process"""
+    global _source, _archive, _parser, _extractor
+    from app.services.resume_parser import ResumeParser
+    from app.services.skill_extractor import SkillExtractor
+
+    _source = source
+    _archive = zipfile.ZipFile(source) if zipfile.is_zipfile(source) else None
+    _parser = ResumeParser()
+    _extractor = SkillExtractor()
+    # Parser warnings for broken PDFs are reported as failures instead
+    logging.getLogger("app.services").setLevel(logging.ERROR)
+
+
+def _read_document(name: str, max_size: int) -> bytes:
+    if _archive is not None:
+        size = _archive.getinfo(name).file_size
+    else:
+        size = os.path.getsize(os.path.join(_source, name))
+    if size > max_size:
+        raise ValueError(f"File size {size} exceeds the maximum of {max_size} bytes")
+
+    if _archive is not None:
+        return _archive.read(name)
+    with open(os.path.join(_source, name), "rb") as f:
+        return f.read()
+
+
+def process_document(name: str, max_size: int) -> Dict[str, Any]:
+    """
+    Parse one document in a worker process
+
+    Returns:
+        Result record; failures carry an error message and no text or skills
+    """
+    record = {
+        "name": name,
+        "resume_id": str(uuid.uuid5(RESUME_ID_NAMESPACE, f"{os.path.basename(os.path.normpath(_source))}/{name}")),
+        "filename": os.path.basename(name),
+        "extracted_text": "",
+        "extracted_skills": [],
+        "error": None
+    }
+    try:
+        content = _read_document(name, max_size)
+        if not _parser.validate_pdf(content):
+            raise ValueError("Invalid PDF file")
+        record["extracted_text"] = _parser.extract_text_from_pdf(content)
+        record["extracted_skills"] = _extractor.extract_skills(record["extracted_text"])
+    except Exception as e:
+        record["error"] = str(e) or type(e).__name__
+    return record
+
+
+def _process_chunk(names: List[str], max_size: int) -> List[Dict[str, Any]]:
+    # One task per chunk keeps inter-process overhead low for small resumes
+    return [process_document(name, max_size) for name in names]
+
+
+class Checkpoint:
+    """Append-only file of processed document names"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Set[str]:
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+
+    def record(self, names: Iterable[str]):
+        """Mark documents as processed; called only after their results are written"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(f"{name}\n" for name in names)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class ResultWriter:
+    """Writes result batches to JSONL, or to Parquet part files"""
+
+    def __init__(self, path: str, include_text: bool = True):
+        self.path = path
+        self.include_text = include_text
+        self.parquet = path.endswith(".parquet")
+        if self.parquet:
+            if not (importlib.util.find_spec("pyarrow") or importlib.util.find_spec("fastparquet")):
+                raise RuntimeError("Parquet output requires pyarrow or fastparquet")
+            os.makedirs(path, exist_ok=True)
+            # Continue numbering after the parts of an interrupted run
+            self._part = len([name for name in os.listdir(path) if name.endswith(".parquet")])
+
+    def write(self, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        if not self.include_text:
+            records = [{**record, "extracted_text": None} for record in records]
+
+        if self.parquet:
+            import pandas as pd
+            part_path = os.path.join(self.path, f"part-{self._part:05d}.parquet")
+            pd.DataFrame.from_records(records).to_parquet(part_path, index=False)
+            self._part += 1
+            return
+
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def insert_batch(records: List[Dict[str, Any]], user_id: str) -> int:
+    """
+    Insert parsed resumes with one multi-row insert, falling back to row by row
+
+    Resume ids are derived from document names, so rows inserted just before an
+    interruption clash on rerun; the fallback skips them as already inserted.
+
+    Returns:
+        Number of rows that could not be inserted
+    """
+    from app.services.database import DatabaseService
+    from app.services.storage import get_storage_backend, DuplicateRecordError
+
+    rows = [
+        DatabaseService.resume_row(
+            record["resume_id"], user_id, record["filename"], record["extracted_text"], record["extracted_skills"]
+        )
+        for record in records
+    ]
+    if not rows or DatabaseService.insert_rows("resumes", rows):
+        return 0
+
+    backend = get_storage_backend()
+    if not backend:
+        return len(rows)
+    failures = 0
+    for row in rows:
+        try:
+            backend.insert("resumes", [row])
+        except DuplicateRecordError:
+            pass
+        except Exception as e:
+            logger.error(f"Error inserting resume {row['resume_id']}: {str(e)}")
+            failures += 1
+    return failures
+
+
+def ingest(
+    source: str,
+    output: str,
+    workers: int = 0,
+    batch_size: int = 500,
+    checkpoint_path: Optional[str] = None,
+    user_id: Optional[str] = None,
+    insert: bool = False,
+    include_text: bool = True,
+    max_size: int = settings.MAX_UPLOAD_SIZE
+) -> Dict[str, Any]:
+    """
+    Parse every PDF of a directory or zip archive
+
+    Args:
+        source: Directory or zip archive of PDFs
+        output: JSONL file, or Parquet directory when it ends in .parquet
+        workers: Worker processes (0 uses one per CPU)
+        batch_size: Documents per batch; results, inserts and the checkpoint are written per batch
+        checkpoint_path: Checkpoint file (defaults to <output>.checkpoint)
+        user_id: Owner of inserted resumes
+        insert: Bulk-insert parsed resumes through DatabaseService
+        include_text: Write extracted text to the output
+        max_size: Documents larger than this many bytes fail without being parsed
+
+    Returns:
+        Run summary: counts, elapsed seconds and docs/sec
+    """
+    if insert and not user_id:
+        raise ValueError("--insert requires --user-id")
+
+    checkpoint = Checkpoint(checkpoint_path or f"{output}.checkpoint")
+    done = checkpoint.load()
+    names = [name for name in list_documents(source) if name not in done]
+    writer = ResultWriter(output, include_text=include_text)
+    workers = workers or os.cpu_count() or 1
+
+    summary = {
+        "documents": len(names) + len(done),
+        "skipped": len(done),
+        "processed": 0,
+        "failed": 0,
+        "insert_failures": 0,
+        "elapsed_seconds": 0.0,
+        "docs_per_second": 0.0
+    }
+    logger.info(f"Ingesting {len(names)} documents ({len(done)} already done) with {workers} workers")
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(source,)) as pool:
+        for start in range(0, len(names), batch_size):
+            batch = names[start:start + batch_size]
+            chunk = max(1, len(batch) // (workers * 4))
+            chunks = [batch[i:i + chunk] for i in range(0, len(batch), chunk)]
+            records = [
+                record
+                for chunk_records in pool.map(_process_chunk, chunks, [max_size] * len(chunks))
+                for record in chunk_records
+            ]
+
+            parsed = [record for record in records if record["error"] is None]
+            failed = [record for record in records if record["error"] is not None]
+            for record in failed:
+                logger.warning(f"Failed to parse {record['name']}: {record['error']}")
+
+            writer.write(records)
+            if insert:
+                summary["insert_failures"] += insert_batch(parsed, user_id)
+            checkpoint.record(batch)
+
+            summary["processed"] += len(batch)
+            summary["failed"] += len(failed)
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"{summary['processed']}/{len(names)} documents, "
+                f"{summary['processed'] / elapsed:.1f} docs/sec, {summary['failed']} failed"
+            )
+
+    elapsed = time.perf_counter() - started
+    summary["elapsed_seconds"] = round(elapsed, 3)
+    summary["docs_per_second"] = round(summary["processed"] / elapsed, 1) if elapsed > 0 else 0.0
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Parse a directory or zip archive of resume PDFs")
+    parser.add_argument("source", help="Directory (searched recursively) or zip archive of PDFs")
+    parser.add_argument("--output", required=True, help="JSONL file, or Parquet directory ending in .parquet")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents per checkpointed batch")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--user-id", default=None, help="Owner of inserted resumes")
+    parser.add_argument("--insert", action="store_true", help="Bulk-insert resumes through the storage backend")
+    parser.add_argument("--no-text", action="store_true", help="Leave extracted text out of the output")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if not os.path.exists(args.source):
+        parser.error(f"{args.source} does not exist")
+
+    try:
+        summary = ingest(
+            args.source,
+            args.output,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            checkpoint_path=args.checkpoint,
+            user_id=args.user_id,
+            insert=args.insert,
+            include_text=not args.no_text
+        )
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["failed"] or summary["insert_failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
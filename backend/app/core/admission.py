@@ -0,0 +1,163 @@
+"""
+Admission control for CPU-heavy routes
+ConcurrencyLimiter caps how many requests of one route run at once, with a bounded wait
+queue; TokenBucketLimiter caps how often a single user may call a route. Both reject
+with 429 and a Retry-After header instead of letting work pile up behind the limit.
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+import asyncio
+import math
+import threading
+import time
+
+from fastapi import HTTPException, status
+
+from app.core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_REJECTED
+
+
+def _too_many_requests(detail: str, retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+    )
+
+
+class ConcurrencyLimiter:
+    """
+    Per-route concurrency limit, used as a route dependency:
+
+        upload_limiter = ConcurrencyLimiter("resume_upload", max_concurrent=2, max_queue=8)
+
+        @router.post("/upload", dependencies=[Depends(upload_limiter)])
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout: float = 5.0,
+        retry_after: float = 1.0
+    ):
+        """
+        Initialize concurrency limiter
+
+        Args:
+            name: Limiter name used in metrics
+            max_concurrent: Requests allowed to run at once
+            max_queue: Requests allowed to wait for a slot; further requests are rejected
+            queue_timeout: Seconds a request may wait before it is rejected
+            retry_after: Retry-After value sent with rejections
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+            self.waiting = 0
+        return self._semaphore
+
+    async def acquire(self):
+        """Take a slot, waiting in the bounded queue if necessary; raises 429 when rejected"""
+        semaphore = self._get_semaphore()
+
+        if semaphore.locked():
+            if self.waiting >= self.max_queue:
+                ADMISSION_REJECTED.labels(self.name, "queue_full").inc()
+                raise _too_many_requests("Server is busy, please retry shortly", self.retry_after)
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                ADMISSION_REJECTED.labels(self.name, "queue_timeout").inc()
+                raise _too_many_requests("Server is busy, please retry shortly", self.retry_after)
+            finally:
+                self.waiting -= 1
+        else:
+            await semaphore.acquire()
+
+        ADMISSION_IN_FLIGHT.labels(self.name).inc()
+
+    def release(self):
+        """Give back a slot taken by acquire"""
+        ADMISSION_IN_FLIGHT.labels(self.name).dec()
+        self._semaphore.release()
+
+    async def __call__(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class TokenBucketLimiter:
+    """In-memory per-key token bucket rate limit (per worker process)"""
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, max_keys: int = 100000):
+        """
+        Initialize token bucket limiter
+
+        Args:
+            name: Limiter name used in metrics
+            rate_per_minute: Sustained requests allowed per key per minute
+            burst: Requests a key may make back to back
+            max_keys: Buckets kept in memory; the least recently used are evicted
+        """
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, key: str, count: int = 1) -> float:
+        """
+        Take count tokens for key, all or none
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until they are available
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+            wait = 0.0
+            if tokens >= count:
+                tokens -= count
+            else:
+                wait = (count - tokens) / self.rate
+
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def hit(self, key: str, count: int = 1):
+        """Take count tokens for key or raise 429 with Retry-After"""
+        wait = self.try_acquire(key, count)
+        if wait > 0:
+            ADMISSION_REJECTED.labels(self.name, "rate_limited").inc()
+            raise _too_many_requests("Rate limit exceeded, please retry later", wait)
+
+    def refund(self, key: str, count: int = 1):
+        """Give back tokens taken for work that was not done"""
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated = self._buckets[key]
+                self._buckets[key] = (min(self.burst, tokens + count), updated)
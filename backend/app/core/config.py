@@ -3,6 +3,10 @@ Configuration settings for the AI Career Intelligence Platform
 """
 from pydantic_settings import BaseSettings
 from typing import Optional
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
 
 
 class Settings(BaseSettings):
@@ -24,6 +28,10 @@ class Settings(BaseSettings):
     SUPABASE_KEY: Optional[str] = None
     SUPABASE_ANON_KEY: Optional[str] = None
     SUPABASE_SERVICE_ROLE_KEY: Optional[str] = None
+
+    # Storage backend: "supabase" (remote) or "sqlite" (local file, WAL mode)
+    STORAGE_BACKEND: str = "supabase"
+    SQLITE_PATH: str = "data/app.db"
     
     # File Upload
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
@@ -33,6 +41,73 @@ class Settings(BaseSettings):
     # ML/NLP Settings
     DATASET_PATH: str = "dataset/jobs.csv"
     MIN_SIMILARITY_THRESHOLD: float = 0.1
+    FEATURIZER: str = "tfidf"  # "tfidf" (fitted 1000-term vocabulary) or "hashing" (all terms, no vocabulary)
+    HASHING_FEATURES: int = 2 ** 18  # hashed columns for FEATURIZER=hashing
+    VECTOR_DTYPE: str = "float64"  # job vector values: float64, float32 or int8 (quantised per row)
+    SCORING_SHARDS: int = 0  # > 1 scores recommendations on a per-worker process pool with this many shards
+
+    # Related skills, precomputed from skill co-occurrence in the catalog
+    SKILL_NEIGHBOURS: int = 20  # related skills kept per skill
+    SKILL_MIN_COOCCURRENCE: int = 2  # jobs two skills must share to be related
+    SKILL_EXPANSION_MAX: int = 10  # related skills added to a query with expand=true
+    SKILL_EXPANSION_WEIGHT: float = 0.5  # weight of added skills relative to the user's own
+
+    # Write-behind buffer for session, resume and recommendation inserts
+    WRITE_BUFFER_ENABLED: bool = True
+    WRITE_BUFFER_BATCH_SIZE: int = 100
+    WRITE_BUFFER_FLUSH_INTERVAL: float = 1.0  # seconds
+    WRITE_BUFFER_MAX_PENDING: int = 10000
+    WRITE_BUFFER_MAX_RETRIES: int = 2  # retries of a failed batch before inserting its rows one by one
+    WRITE_BUFFER_RETRY_BACKOFF: float = 0.1  # seconds before the first retry, doubled per retry
+
+    # Recommendation result cache
+    RECOMMENDATION_CACHE_SIZE: int = 1024
+    # Shared tier in the recommendation_cache table; on Supabase the table has RLS and no
+    # policies, so only a service role SUPABASE_KEY can use it
+    RECOMMENDATION_CACHE_PERSISTENT: bool = True
+
+    # Recommendation pagination and streaming
+    RECOMMEND_MAX_PAGE_SIZE: int = 100  # top_n is capped to this per JSON page
+    RECOMMEND_MAX_RESULTS: int = 1000  # ranking depth reachable through cursors and streams
+    RECOMMEND_SNAPSHOT_TTL: float = 300.0  # seconds a ranked snapshot is kept for follow-up pages
+    RECOMMEND_SNAPSHOT_CACHE_SIZE: int = 1024
+
+    # Catalog browsing (GET /jobs/catalog, GET /jobs/{job_id})
+    CATALOG_CACHE_MAX_AGE: int = 300  # seconds clients may reuse a response before revalidating
+
+    # Candidate index for reverse matching (GET /jobs/{job_id}/candidates)
+    CANDIDATE_INDEX_DIR: str = "data/candidate_index"
+    CANDIDATE_INDEX_SNAPSHOT_EVERY: int = 1000  # log entries replayed between snapshots
+    RECRUITER_EMAILS_STR: Optional[str] = None  # comma-separated accounts allowed to search candidates
+
+    # Admission control (per worker process)
+    RESUME_UPLOAD_CONCURRENCY: int = 2  # PDF uploads parsed at once
+    RESUME_UPLOAD_QUEUE: int = 8  # uploads allowed to wait for a slot
+    RECOMMEND_CONCURRENCY: int = 32
+    RECOMMEND_QUEUE: int = 128
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0  # seconds a queued request waits before 429
+    ADMISSION_RETRY_AFTER: int = 1  # seconds
+    RATE_LIMIT_ENABLED: bool = True
+    RESUME_UPLOAD_RATE_PER_MINUTE: float = 10.0  # per user
+    RESUME_UPLOAD_BURST: int = 20  # also caps files per batch, which take one token each
+
+    # Batch resume upload (POST /resume/upload-batch)
+    RESUME_BATCH_MAX_FILES: int = 20  # PDFs per request, counting zip members
+    RESUME_BATCH_MAX_TOTAL_SIZE: int = 50 * 1024 * 1024  # files past this many bytes are skipped
+    RESUME_BATCH_CONCURRENCY: int = 2  # files of one request parsed at once
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: Optional[str] = None  # per-module overrides, e.g. "app.services.database=WARNING"
+    LOG_FORMAT: str = "json"  # "json" or "text"
+    LOG_SAMPLE_RATE: float = 0.1  # fraction of high-volume per-request events kept
+    LOG_MAX_FIELD_LENGTH: int = 1000
+    LOG_QUEUE_SIZE: int = 10000
+
+    # On-demand request profiling (disabled while PROFILE_TOKEN is empty)
+    PROFILE_TOKEN: str = ""
+    PROFILE_DIR: str = "profiles"
+    PROFILE_SAMPLE_INTERVAL: float = 0.005  # seconds between stack samples
 
     # CORS Settings
     CORS_ORIGINS_STR: Optional[str] = None
@@ -50,12 +125,19 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in self.CORS_ORIGINS_STR.split(",")]
         return []
 
+    @property
+    def RECRUITER_EMAILS(self):
+        """Parse recruiter emails from string"""
+        if self.RECRUITER_EMAILS_STR:
+            return [email.strip().lower() for email in self.RECRUITER_EMAILS_STR.split(",") if email.strip()]
+        return []
+
     # Supabase client property
     @property
     def supabase_client(self):
         """Get Supabase client instance"""
         if not self.SUPABASE_URL or not self.SUPABASE_KEY:
-            print("Warning: SUPABASE_URL or SUPABASE_KEY not set in .env file")
+            logger.warning("SUPABASE_URL or SUPABASE_KEY not set in .env file")
             return None
 
         try:
@@ -63,25 +145,41 @@ class Settings(BaseSettings):
             # Create client without auth features that might cause issues
             return create_client(self.SUPABASE_URL, self.SUPABASE_KEY)
         except ImportError:
-            print("Warning: supabase package not installed. Install with: pip install supabase")
+            logger.warning("supabase package not installed. Install with: pip install supabase")
             return None
         except Exception as e:
-            print(f"Warning: Could not initialize Supabase client: {e}")
-            print("Falling back to database-less mode")
+            logger.warning(f"Could not initialize Supabase client: {e}; falling back to database-less mode")
             return None
 
 
 settings = Settings()
 
-# Initialize Supabase client
-try:
-    supabase = settings.supabase_client
-    if supabase:
-        print("Supabase client initialized successfully")
-    else:
-        print("Supabase client not initialized - check your credentials")
-        supabase = None
-except Exception as e:
-    print(f"Error initializing Supabase client: {e}")
-    supabase = None
+_supabase_client = None
+_supabase_lock = threading.Lock()
+_supabase_initialized = False
+
+
+def get_supabase_client():
+    """Get the Supabase client, creating it on first use"""
+    global _supabase_client, _supabase_initialized
+    if not _supabase_initialized:
+        with _supabase_lock:
+            if not _supabase_initialized:
+                try:
+                    _supabase_client = settings.supabase_client
+                    if _supabase_client:
+                        logger.info("Supabase client initialized successfully")
+                    else:
+                        logger.warning("Supabase client not initialized - check your credentials")
+                except Exception as e:
+                    logger.error(f"Error initializing Supabase client: {e}")
+                    _supabase_client = None
+                _supabase_initialized = True
+    return _supabase_client
+
 
+def __getattr__(name):
+    """Keep `from app.core.config import supabase` working without creating the client at import"""
+    if name == "supabase":
+        return get_supabase_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,159 @@
+"""
+Application component lifecycle
+Heavy components are initialised in a startup phase instead of at import time, each
+one timed and isolated so a failure marks the component unready instead of killing
+the worker. /health/ready reports the per-component state.
+"""
+from typing import Callable, Dict, List, Optional, Any
+import logging
+import threading
+import time
+
+from prometheus_client import Gauge
+
+logger = logging.getLogger(__name__)
+
+STARTUP_DURATION = Gauge(
+    "app_component_startup_seconds",
+    "Time taken to initialise each application component",
+    ["component"],
+    multiprocess_mode="max"
+)
+
+# Only worker processes set this gauge: the preloading gunicorn master never starts the
+# components that are not fork-safe, so its values would hold the minimum at 0
+COMPONENT_READY = Gauge(
+    "app_component_ready",
+    "Whether each application component is ready (1) or not (0)",
+    ["component"],
+    multiprocess_mode="livemin"
+)
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+class Component:
+    """A named unit of startup work with its readiness state"""
+
+    def __init__(
+        self,
+        name: str,
+        start: Callable[[], Any],
+        stop: Optional[Callable[[], Any]] = None,
+        required: bool = True,
+        fork_safe: bool = False
+    ):
+        """
+        Initialize component
+
+        Args:
+            name: Component name reported by /health/ready
+            start: Initialisation callable; raising marks the component failed
+            stop: Optional shutdown callable
+            required: Whether the worker is unready while this component is not ready
+            fork_safe: Whether start can run in the gunicorn master before workers fork
+                (no threads, sockets or database connections)
+        """
+        self.name = name
+        self.start = start
+        self.stop = stop
+        self.required = required
+        self.fork_safe = fork_safe
+        self.state = PENDING
+        self.error: Optional[str] = None
+        self.duration: Optional[float] = None
+
+    def status(self) -> Dict[str, Any]:
+        """Get readiness details"""
+        status = {"state": self.state, "required": self.required}
+        if self.duration is not None:
+            status["startup_ms"] = round(self.duration * 1000, 1)
+        if self.error:
+            status["error"] = self.error
+        return status
+
+
+class ComponentRegistry:
+    """Ordered set of components started on worker startup and stopped on shutdown"""
+
+    def __init__(self):
+        self._components: List[Component] = []
+        self._lock = threading.Lock()
+        # Set once this process starts all components, i.e. it is a worker
+        self._report_ready = False
+
+    def register(self, name: str, start: Callable[[], Any], **options) -> Component:
+        """Register a component; components start in registration order"""
+        component = Component(name, start, **options)
+        self._components.append(component)
+        self._set_ready_gauge(component)
+        return component
+
+    def _set_ready_gauge(self, component: Component):
+        if self._report_ready:
+            COMPONENT_READY.labels(component.name).set(1 if component.state == READY else 0)
+
+    def start_all(self, fork_safe_only: bool = False):
+        """
+        Start every pending component
+
+        Args:
+            fork_safe_only: Only start components that may run before forking
+                (used from the gunicorn master when preloading)
+        """
+        with self._lock:
+            if not fork_safe_only and not self._report_ready:
+                self._report_ready = True
+                for component in self._components:
+                    self._set_ready_gauge(component)
+            for component in self._components:
+                if component.state == READY or (fork_safe_only and not component.fork_safe):
+                    continue
+                self._start(component)
+
+    def _start(self, component: Component):
+        start = time.perf_counter()
+        try:
+            component.start()
+            component.state = READY
+            component.error = None
+        except Exception as e:
+            component.state = FAILED
+            component.error = f"{type(e).__name__}: {str(e)}"
+            logger.exception(f"Component {component.name} failed to start")
+        finally:
+            component.duration = time.perf_counter() - start
+
+        STARTUP_DURATION.labels(component.name).set(component.duration)
+        self._set_ready_gauge(component)
+        logger.info(
+            f"Component {component.name} {component.state} in {component.duration * 1000:.1f}ms",
+            extra={"component": component.name, "startup_ms": round(component.duration * 1000, 1)}
+        )
+
+    def stop_all(self):
+        """Stop started components in reverse order"""
+        with self._lock:
+            for component in reversed(self._components):
+                if component.state != READY or component.stop is None:
+                    continue
+                try:
+                    component.stop()
+                except Exception as e:
+                    logger.error(f"Error stopping component {component.name}: {str(e)}")
+                component.state = PENDING
+                self._set_ready_gauge(component)
+
+    @property
+    def ready(self) -> bool:
+        """Whether every required component is ready"""
+        return all(c.state == READY for c in self._components if c.required)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-component readiness details"""
+        return {component.name: component.status() for component in self._components}
+
+
+registry = ComponentRegistry()
@@ -0,0 +1,196 @@
+"""
+Logging configuration
+Records are handed to a bounded queue on the calling thread and formatted and written
+by a background listener, so request handlers never block on stdout
+"""
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+
+from app.core.config import settings
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_fork_hook_registered = False
+_traceback_formatter = logging.Formatter()
+
+
+def sampled(rate: Optional[float] = None, **fields: Any) -> Dict[str, Any]:
+    """
+    Build `extra` for a high-volume log event that should only be kept at a sample rate
+
+    Args:
+        rate: Fraction of events to keep, defaults to LOG_SAMPLE_RATE
+        **fields: Structured fields to attach to the event
+
+    Returns:
+        Dict to pass as `extra=` to a logging call
+    """
+    return {"sample_rate": settings.LOG_SAMPLE_RATE if rate is None else rate, **fields}
+
+
+def _truncate(value: Any, limit: int) -> Any:
+    """Cap string values at limit characters"""
+    if not isinstance(value, str):
+        value = str(value) if not isinstance(value, (int, float, bool, type(None))) else value
+    if isinstance(value, str) and len(value) > limit:
+        return f"{value[:limit]}...[{len(value) - limit} more chars]"
+    return value
+
+
+class SamplingFilter(logging.Filter):
+    """Keep records carrying a sample_rate attribute with that probability"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = getattr(record, "sample_rate", None)
+        if rate is None or rate >= 1:
+            return True
+        return random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with size-capped fields"""
+
+    def __init__(self, max_field_length: int):
+        super().__init__()
+        self.max_field_length = max_field_length
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": _truncate(record.getMessage(), self.max_field_length)
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = _truncate(value, self.max_field_length)
+        if record.exc_text:
+            # Tracebacks get a larger budget than regular fields
+            entry["exc"] = _truncate(record.exc_text, self.max_field_length * 4)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The original plain-text format, with size-capped messages and extra fields appended"""
+
+    def __init__(self, max_field_length: int):
+        super().__init__("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        self.max_field_length = max_field_length
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        record.message = _truncate(record.message, self.max_field_length)
+        line = super().formatMessage(record)
+        fields = [
+            f"{key}={_truncate(value, self.max_field_length)}"
+            for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRIBUTES
+        ]
+        return f"{line} {' '.join(fields)}" if fields else line
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge args into the message but keep the traceback separate for the formatter"""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_levels(levels: Optional[str]) -> Dict[str, str]:
+    """Parse "logger=LEVEL,logger=LEVEL" into a dict"""
+    parsed = {}
+    for item in (levels or "").split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            parsed[name.strip()] = level.strip().upper()
+    return parsed
+
+
+def configure_logging() -> QueueListener:
+    """
+    Route all logging through a background queue listener
+
+    Safe to call more than once; only the first call installs handlers.
+
+    Returns:
+        The running queue listener
+    """
+    global _listener, _queue_handler, _fork_hook_registered
+    if _listener is not None:
+        return _listener
+
+    if settings.LOG_FORMAT == "json":
+        formatter = JsonFormatter(settings.LOG_MAX_FIELD_LENGTH)
+    else:
+        formatter = TextFormatter(settings.LOG_MAX_FIELD_LENGTH)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    queue_handler = DroppingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    queue_handler.addFilter(SamplingFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    for name, level in _parse_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _queue_handler = queue_handler
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    if not _fork_hook_registered:
+        atexit.register(shutdown_logging)
+        os.register_at_fork(after_in_child=_restart_after_fork)
+        _fork_hook_registered = True
+    return _listener
+
+
+def _restart_after_fork():
+    """Give a forked worker its own queue and listener thread (threads do not survive fork)"""
+    if _listener is None or _queue_handler is None:
+        return
+    fresh_queue = queue.Queue(settings.LOG_QUEUE_SIZE)
+    _queue_handler.queue = fresh_queue
+    _listener.queue = fresh_queue
+    _listener._thread = None
+    _listener.start()
+
+
+def shutdown_logging():
+    """Stop the listener after writing out queued records"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,171 @@
+"""
+Prometheus metrics for the request pipeline
+Set PROMETHEUS_MULTIPROC_DIR (an empty directory) before starting gunicorn to aggregate across workers
+"""
+from contextlib import contextmanager
+from functools import wraps
+from typing import Tuple
+import asyncio
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client import multiprocess
+
+from app.core.profiling import record
+
+# Sub-millisecond to multi-second buckets: stages range from dict lookups to PDF parsing
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+REQUEST_LATENCY = Histogram(
+    "app_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+STAGE_LATENCY = Histogram(
+    "app_stage_duration_seconds",
+    "Latency of pipeline stages (pdf_validate, pdf_extract, skill_extract, vectorize, score, materialise, serialise)",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+
+DB_LATENCY = Histogram(
+    "app_db_call_duration_seconds",
+    "Latency of DatabaseService calls",
+    ["operation"],
+    buckets=LATENCY_BUCKETS
+)
+
+CACHE_LOOKUPS = Counter(
+    "app_recommendation_cache_lookups_total",
+    "Recommendation cache lookups by result (memory_hit, persistent_hit, miss, snapshot_hit, snapshot_miss)",
+    ["result"]
+)
+
+WRITE_BUFFER_PENDING = Gauge(
+    "app_write_buffer_pending",
+    "Rows waiting in the write-behind buffer",
+    multiprocess_mode="livesum"
+)
+
+WRITE_BUFFER_DROPPED = Counter(
+    "app_write_buffer_dropped_total",
+    "Buffered writes dropped because the buffer was full or the insert failed"
+)
+
+ADMISSION_REJECTED = Counter(
+    "app_admission_rejected_total",
+    "Requests rejected with 429 by admission control",
+    ["limiter", "reason"]
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "app_admission_in_flight",
+    "Requests currently holding a concurrency limiter slot",
+    ["limiter"],
+    multiprocess_mode="livesum"
+)
+
+CATALOG_SIZE = Gauge(
+    "app_catalog_jobs",
+    "Number of jobs in the loaded catalog",
+    multiprocess_mode="max"
+)
+
+
+@contextmanager
+def time_stage(stage: str):
+    """Record the duration of a pipeline stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_LATENCY.labels(stage).observe(duration)
+        record(stage, duration)
+
+
+def db_call(func):
+    """Decorator recording the duration of a DatabaseService call under its function name"""
+    histogram = DB_LATENCY.labels(func.__name__)
+    timing_name = f"db_{func.__name__}"
+
+    if asyncio.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                histogram.observe(duration)
+                record(timing_name, duration)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            histogram.observe(duration)
+            record(timing_name, duration)
+    return wrapper
+
+
+class RequestLatencyMiddleware:
+    """
+    ASGI middleware recording request latency per route template
+
+    Plain ASGI rather than @app.middleware("http"), which would wrap every request in
+    BaseHTTPMiddleware's extra task and response streaming.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Use the matched route template so path parameters do not explode label cardinality
+            route_path = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_LATENCY.labels(scope["method"], route_path, str(status_code)).observe(
+                time.perf_counter() - start
+            )
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render metrics in Prometheus text format
+
+    Returns:
+        Tuple of (body, content type)
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # Aggregate the per-worker files written by every gunicorn worker
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,198 @@
+"""
+On-demand per-request profiling
+A request carrying the admin profiling token in the X-Debug-Profile header gets its
+stage and database call timings back in a Server-Timing header, and optionally a
+sampled call-stack profile written to PROFILE_DIR in folded (flamegraph) format
+"""
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Debug-Profile"
+PROFILE_STACKS_HEADER = "X-Debug-Profile-Stacks"
+PROFILE_FILE_HEADER = "X-Profile-File"
+
+# Profile of the request being handled; None unless profiling was requested
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("active_profile", default=None)
+
+
+class RequestProfile:
+    """Timings collected for a single profiled request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = OrderedDict()
+        self.counts: Dict[str, int] = Counter()
+        # Threads that ran profiled code, sampled by StackSampler
+        self.threads: Set[int] = {threading.get_ident()}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, duration: float):
+        """Add a timing; repeated names are summed"""
+        with self._lock:
+            self.timings[name] = self.timings.get(name, 0.0) + duration
+            self.counts[name] += 1
+            self.threads.add(threading.get_ident())
+
+    def server_timing(self) -> str:
+        """Format timings as a Server-Timing header value (durations in milliseconds)"""
+        entries = []
+        with self._lock:
+            for name, duration in self.timings.items():
+                entry = f"{name};dur={duration * 1000:.3f}"
+                if self.counts[name] > 1:
+                    entry += f';desc="x{self.counts[name]}"'
+                entries.append(entry)
+        entries.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.3f}")
+        return ", ".join(entries)
+
+
+def record(name: str, duration: float):
+    """Record a timing on the active request profile, if any"""
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.add(name, duration)
+
+
+def profiling_requested(header_value: Optional[str]) -> bool:
+    """Check whether a request header carries the admin profiling token"""
+    if not header_value or not settings.PROFILE_TOKEN:
+        return False
+    return hmac.compare_digest(header_value.encode(), settings.PROFILE_TOKEN.encode())
+
+
+def start_profile() -> RequestProfile:
+    """Activate profiling for the current request context"""
+    profile = RequestProfile()
+    _active_profile.set(profile)
+    return profile
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware returning per-stage timings for requests carrying the profiling token
+
+    Plain ASGI so unprofiled requests cost one header lookup: the timings are added to
+    the response start message rather than through BaseHTTPMiddleware.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.PROFILE_TOKEN:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        token = headers.get(PROFILE_HEADER.lower().encode())
+        if not profiling_requested(token.decode("latin-1") if token else None):
+            await self.app(scope, receive, send)
+            return
+
+        profile = start_profile()
+        sampler = None
+        if headers.get(PROFILE_STACKS_HEADER.lower().encode()) == b"1":
+            sampler = StackSampler(profile, settings.PROFILE_SAMPLE_INTERVAL)
+            sampler.start()
+
+        async def send_with_timings(message):
+            nonlocal sampler
+            if message["type"] == "http.response.start":
+                extra_headers = []
+                if sampler:
+                    sampler.stop()
+                    profile_file = sampler.write(settings.PROFILE_DIR)
+                    sampler = None
+                    if profile_file:
+                        extra_headers.append((PROFILE_FILE_HEADER.lower().encode(), profile_file.encode()))
+                server_timing = profile.server_timing()
+                extra_headers.append((b"server-timing", server_timing.encode()))
+                message = {**message, "headers": [*message.get("headers", []), *extra_headers]}
+                logger.info(f"Profiled {scope['method']} {scope['path']}: {server_timing}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            if sampler:
+                sampler.stop()
+
+
+class StackSampler:
+    """Samples the call stacks of a profile's threads on a background thread"""
+
+    def __init__(self, profile: RequestProfile, interval: float):
+        """
+        Initialize stack sampler
+
+        Args:
+            profile: Profile whose threads are sampled
+            interval: Seconds between samples
+        """
+        self.profile = profile
+        self.interval = interval
+        self.stacks: Dict[str, int] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident in list(self.profile.threads):
+                frame = frames.get(ident)
+                if frame is None or ident == own_ident:
+                    continue
+                self.stacks[self._fold(frame)] += 1
+
+    @staticmethod
+    def _fold(frame) -> str:
+        """Render a frame chain as a root-first, semicolon-separated stack"""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def write(self, directory: str) -> Optional[str]:
+        """
+        Write folded stacks to a new file
+
+        Returns:
+            File name, or None if nothing was sampled or the write failed
+        """
+        if not self.stacks:
+            return None
+
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        filename = f"profile-{timestamp}-{uuid.uuid4().hex[:8]}.folded"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, filename), "w") as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            logger.error(f"Error writing stack profile: {str(e)}")
+            return None
+        return filename
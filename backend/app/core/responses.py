@@ -0,0 +1,38 @@
+"""
+Fast JSON response class
+Serialises pre-built dicts and lists directly, without pydantic validation
+"""
+from fastapi.responses import JSONResponse
+from typing import Any
+import json
+
+from app.core.metrics import time_stage
+
+try:
+    import orjson
+except ImportError:
+    # Fall back to the standard library encoder
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialise content to compact JSON bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        with time_stage("serialise"):
+            return dumps(content)
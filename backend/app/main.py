@@ -2,31 +2,73 @@
 Main FastAPI application entry point
 AI-Driven Career Intelligence & Employability Platform
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
 import logging
 import os
+import time
+
+from app.core.logging_config import configure_logging, shutdown_logging
+
+# Configure logging before importing modules that log while loading
+configure_logging()
 
 from app.core.config import settings
+from app.core.metrics import RequestLatencyMiddleware, render_metrics
+from app.core import profiling
+from app.core.lifecycle import registry
 from app.routes import auth, resume, recommend
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+from app.services.database import write_buffer
+from app.services.storage import get_storage_backend
 
 logger = logging.getLogger(__name__)
 
+
+def start_storage():
+    """Connect the configured storage backend"""
+    if get_storage_backend() is None:
+        raise RuntimeError(f"{settings.STORAGE_BACKEND} storage backend is not configured")
+
+
+# Startup components, started in this order. Only fork-safe components run in the
+# gunicorn master when the app is preloaded (see gunicorn.conf.py).
+registry.register("recommender", recommend.load_recommender, fork_safe=True)
+registry.register("sharded_scorer", recommend.start_sharded_scorer,
+                  stop=recommend.stop_sharded_scorer, required=False)
+registry.register("storage", start_storage)
+registry.register("recommendation_cache", recommend.attach_recommendation_cache, required=False)
+registry.register("candidate_index", recommend.attach_candidate_index,
+                  stop=recommend.candidate_index.close, required=False)
+registry.register("write_buffer", write_buffer.start, stop=write_buffer.stop, required=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start components before the worker accepts requests and stop them on shutdown"""
+    configure_logging()
+    start = time.perf_counter()
+    await run_in_threadpool(registry.start_all)
+    logger.info(
+        f"Worker started in {(time.perf_counter() - start) * 1000:.1f}ms (ready={registry.ready})",
+        extra={"components": registry.status()}
+    )
+    yield
+    registry.stop_all()
+    shutdown_logging()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="AI-Driven Career Intelligence & Employability Platform - Phase 1",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure security and CORS based on environment
@@ -66,32 +108,29 @@ app.add_middleware(
     allow_headers=["*"],   # allow all headers
 )
 # Include routers
-print("=== STARTING ROUTER INCLUSION ===")
-print("Testing routers import...")
-try:
-    from app.routes import auth, resume, recommend
-    print("[SUCCESS] Routers imported successfully")
-except Exception as e:
-    print(f"[ERROR] Failed to import routers: {e}")
-    exit(1)
-
-try:
-    print(f"Including routers with prefix: {settings.API_V1_PREFIX}")
-    app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
-    app.include_router(resume.router, prefix=settings.API_V1_PREFIX)
-    app.include_router(recommend.router, prefix=settings.API_V1_PREFIX)
-    print("[SUCCESS] All routers included successfully")
-except Exception as e:
-    print(f"[ERROR] Failed to include routers: {e}")
-    import traceback
-    traceback.print_exc()
-    exit(1)
-
-print("[SUCCESS] ROUTER INCLUSION COMPLETED")
-print("Available API routes:")
-for route in app.routes:
-    if hasattr(route, 'path') and '/api/v1' in route.path:
-        print(f"  {route.methods} {route.path}")
+app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
+app.include_router(resume.router, prefix=settings.API_V1_PREFIX)
+app.include_router(recommend.router, prefix=settings.API_V1_PREFIX)
+
+logger.debug(
+    "Registered API routes: " + ", ".join(
+        f"{sorted(route.methods)} {route.path}" for route in app.routes
+        if hasattr(route, 'path') and route.path.startswith(settings.API_V1_PREFIX)
+    )
+)
+
+
+app.add_middleware(RequestLatencyMiddleware)
+
+
+app.add_middleware(profiling.ProfilingMiddleware)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 
 @app.get("/")
@@ -114,6 +153,18 @@ async def health_check():
     }
 
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness check: 503 until every required component has started"""
+    return JSONResponse(
+        status_code=200 if registry.ready else 503,
+        content={
+            "status": "ready" if registry.ready else "unavailable",
+            "components": registry.status()
+        }
+    )
+
+
 @app.post("/test-register")
 async def test_register(email: str, password: str, full_name: str):
     """Simple test endpoint"""
@@ -137,13 +188,11 @@ async def global_exception_handler(request, exc):
     if isinstance(exc, (HTTPException, StarletteHTTPException)):
         raise exc
 
-    print(f"=== GLOBAL EXCEPTION HANDLER ===")
-    print(f"Request: {request.method} {request.url}")
-    print(f"Exception: {type(exc).__name__}: {exc}")
-    import traceback
-    traceback.print_exc()
-
-    logger.error(f"Unhandled exception: {str(exc)}")
+    logger.error(
+        f"Unhandled exception: {type(exc).__name__}: {str(exc)}",
+        exc_info=exc,
+        extra={"method": request.method, "path": request.url.path}
+    )
     return JSONResponse(
         status_code=500,
         content={
@@ -43,6 +43,29 @@ class SkillExtractionResponse(BaseModel):
     skill_count: int
 
 
+class ResumeHistoryItem(BaseModel):
+    """Single resume in a user's upload history"""
+    resume_id: str
+    filename: Optional[str] = None
+    extracted_skills: List[str] = []
+    uploaded_at: datetime
+
+
+class ResumeHistoryResponse(BaseModel):
+    """One page of a user's upload history"""
+    items: List[ResumeHistoryItem]
+    next_cursor: Optional[str] = None
+
+
+class ResumeDetailResponse(BaseModel):
+    """Single stored resume including its text"""
+    resume_id: str
+    filename: Optional[str] = None
+    extracted_text: Optional[str] = None
+    extracted_skills: List[str] = []
+    uploaded_at: datetime
+
+
 # ============ Job Recommendation Schemas ============
 class JobRecommendation(BaseModel):
     """Single job recommendation"""
@@ -56,11 +79,99 @@ class JobRecommendation(BaseModel):
     skill_gap_count: int
 
 
+class CatalogJob(BaseModel):
+    """Job from the catalog"""
+    job_id: str
+    job_title: str
+    required_skills: List[str]
+
+
+class CatalogPage(BaseModel):
+    """One page of the job catalog"""
+    catalog_version: str
+    total: int
+    jobs: List[CatalogJob]
+    next_cursor: Optional[str] = None
+
+
+class SkillOpportunity(BaseModel):
+    """Missing skill ranked by its effect across the catalog"""
+    skill: str
+    unlocked_jobs: int
+    match_gain: float
+    job_count: int
+
+
+class SkillOpportunitiesResponse(BaseModel):
+    """Response model for catalog-wide skill gap ranking"""
+    user_skills: List[str]
+    matched_jobs: int
+    match_threshold: float
+    skills: List[SkillOpportunity]
+
+
+class RelatedSkill(BaseModel):
+    """Skill often required together with another"""
+    skill: str
+    score: float  # normalised PMI: 1 = always required together, 0 = independent
+    co_occurrences: int
+    job_count: int
+
+
+class RelatedSkillsResponse(BaseModel):
+    """Response model for related skill lookups"""
+    skill: str
+    job_count: int
+    related: List[RelatedSkill]
+
+
+class CandidateMatch(BaseModel):
+    """Candidate ranked for a job"""
+    user_id: str
+    resume_id: str
+    match_score: float = Field(..., ge=0.0, le=1.0)
+    match_percentage: float = Field(..., ge=0.0, le=100.0)
+    matched_skills: List[str]
+    missing_skills: List[str]
+
+
+class JobCandidatesResponse(BaseModel):
+    """Response model for candidates ranked for a job"""
+    job_id: str
+    job_title: str
+    total_candidates: int
+    candidates: List[CandidateMatch]
+
+
 class JobRecommendationResponse(BaseModel):
     """Response containing job recommendations"""
     user_skills: List[str]
     total_jobs_found: int
     recommendations: List[JobRecommendation]
+    next_cursor: Optional[str] = None
+    expanded_skills: Optional[List[str]] = None  # related skills added to the query with expand=true
+
+
+class RecommendationHistoryItem(BaseModel):
+    """Single entry in a user's recommendation history"""
+    recommendation_id: str
+    user_skills: List[str]
+    created_at: datetime
+
+
+class RecommendationHistoryResponse(BaseModel):
+    """One page of a user's recommendation history"""
+    items: List[RecommendationHistoryItem]
+    next_cursor: Optional[str] = None
+
+
+class RecommendationHistoryDetail(BaseModel):
+    """Stored recommendation rehydrated from the job catalog"""
+    recommendation_id: str
+    user_skills: List[str]
+    created_at: datetime
+    catalog_changed: bool = False
+    recommendations: List[JobRecommendation]
 
 
 # ============ Error Schemas ============
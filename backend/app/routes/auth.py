@@ -7,14 +7,19 @@ from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 import hashlib
+import logging
 import uuid
 
 from app.models.schemas import UserRegister, UserLogin, TokenResponse
 from app.core.config import settings
 from app.services.database import DatabaseService
+from app.services.storage import DuplicateRecordError
+from app.services.candidate_index import candidate_index
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+logger = logging.getLogger(__name__)
+
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -72,16 +77,25 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     # Get user from database
     user = DatabaseService.get_user_by_email(email)
     if not user:
-        print(f"DEBUG: User not found for email: {email}")
+        logger.debug("Token subject not found")
         raise credentials_exception
 
     return user
 
 
+async def get_current_recruiter(current_user: dict = Depends(get_current_user)):
+    """Get current user, requiring a recruiter account (see RECRUITER_EMAILS_STR)"""
+    if str(current_user.get("email", "")).lower() not in settings.RECRUITER_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Recruiter access required"
+        )
+    return current_user
+
+
 @router.post("/register-simple")
 async def register_simple(email: str, password: str, full_name: str):
     """Simple test endpoint"""
-    print(f"SIMPLE REGISTER: {email}, {full_name}")
     return {"message": f"Received: {email}, {full_name}", "status": "success"}
 
 
@@ -93,42 +107,27 @@ async def register(user_data: UserRegister):
     Returns:
         JWT access token and user information
     """
-    print("=== REGISTRATION ENDPOINT CALLED ===")
-    print(f"Raw user_data: {user_data}")
-    print(f"Email: {user_data.email}, Password length: {len(user_data.password)}, Full name: {user_data.full_name}")
-
     try:
-        print(f"=== REGISTRATION ATTEMPT ===")
-        print(f"Email: {user_data.email}")
-
-        # Check if user already exists
-        existing_user = DatabaseService.get_user_by_email(user_data.email)
-        print(f"Existing user check: {existing_user is not None}")
-        if existing_user:
+        # Create new user; the unique email constraint rejects existing users in the same round trip
+        password_hash = hash_password(user_data.password)
+        try:
+            user = DatabaseService.create_user(
+                user_data.email,
+                password_hash,
+                user_data.full_name
+            )
+        except DuplicateRecordError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
 
-        # Create new user
-        password_hash = hash_password(user_data.password)
-        print("Creating user in database...")
-        user = DatabaseService.create_user(
-            user_data.email,
-            password_hash,
-            user_data.full_name
-        )
-
-        print(f"DatabaseService.create_user returned: {user}")
         if not user:
-            print("User creation failed - no user returned")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create user"
             )
 
-        print(f"User created successfully: {user}")
-
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
@@ -136,8 +135,7 @@ async def register(user_data: UserRegister):
             expires_delta=access_token_expires
         )
 
-        print("Access token created successfully")
-        print("Registration completed successfully")
+        logger.info("User registered", extra={"user_id": str(user['user_id'])})
 
         return TokenResponse(
             access_token=access_token,
@@ -149,9 +147,7 @@ async def register(user_data: UserRegister):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Unexpected error in registration: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Unexpected error in registration: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -166,7 +162,7 @@ async def login(user_credentials: UserLogin):
     email = user_credentials.email
 
     # Check if user exists
-    user = DatabaseService.get_user_by_email(email)
+    user = DatabaseService.get_user_credentials(email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -189,7 +185,7 @@ async def login(user_credentials: UserLogin):
         expires_delta=access_token_expires
     )
 
-    # Create user session in database
+    # Queue user session for a batched insert (kept off the request path)
     try:
         import hashlib
         from datetime import datetime, timezone
@@ -198,7 +194,7 @@ async def login(user_credentials: UserLogin):
         token_hash = hashlib.sha256(access_token.encode()).hexdigest()
         expires_at = datetime.now(timezone.utc) + access_token_expires
 
-        DatabaseService.create_session(
+        DatabaseService.queue_session(
             user_id=str(user["user_id"]),
             token_hash=token_hash,
             expires_at=expires_at
@@ -207,8 +203,7 @@ async def login(user_credentials: UserLogin):
 
     except Exception as e:
         # Log the error but don't fail the login
-        print(f"Warning: Session creation failed: {e}")
-        pass
+        logger.warning(f"Session creation failed: {str(e)}")
 
     return TokenResponse(
         access_token=access_token,
@@ -230,4 +225,14 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     }
 
 
-
+@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_current_user(current_user: dict = Depends(get_current_user)):
+    """
+    Delete the current user's account and all associated data
+    """
+    if not await DatabaseService.delete_user_data(str(current_user["user_id"])):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to delete account"
+        )
+    candidate_index.remove_user(str(current_user["user_id"]))
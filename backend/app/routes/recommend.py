@@ -1,48 +1,227 @@
 """
 Job recommendation routes
 """
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from typing import Dict, List, Literal, Optional
+import hashlib
 import logging
 
-from app.models.schemas import JobRecommendationResponse, JobRecommendation
+from app.models.schemas import (
+    JobRecommendationResponse, JobRecommendation,
+    RecommendationHistoryResponse, RecommendationHistoryDetail,
+    CatalogJob, CatalogPage, JobCandidatesResponse, SkillOpportunitiesResponse,
+    RelatedSkillsResponse
+)
+from app.services.compact_storage import unpack_recommendations
+from app.services.pagination import encode_cursor, decode_cursor
 from app.services.recommender import JobRecommender
-from app.routes.auth import get_current_user
+from app.services.recommendation_cache import RecommendationCache, RankingSnapshotCache
+from app.services.candidate_index import candidate_index
+from app.services.database import write_buffer
+from app.routes.auth import get_current_user, get_current_recruiter
 from app.core.config import settings
-from pydantic import BaseModel
+from app.core.responses import FastJSONResponse, dumps
+from app.core.metrics import CATALOG_SIZE
+from app.core.logging_config import sampled
+from app.core.admission import ConcurrencyLimiter
+from pydantic import BaseModel, Field
 
 router = APIRouter(prefix="/jobs", tags=["Job Recommendations"])
 
-# Initialize recommender
-try:
-    recommender = JobRecommender(dataset_path=settings.DATASET_PATH)
-except Exception as e:
-    logging.error(f"Failed to initialize recommender: {str(e)}")
-    recommender = None
+# Recommender, loaded by the "recommender" startup component (see app.main)
+recommender: Optional[JobRecommender] = None
+
+# Recommendation cache, invalidated whenever the catalog version changes
+recommendation_cache = RecommendationCache(
+    max_entries=settings.RECOMMENDATION_CACHE_SIZE,
+    persistent=settings.RECOMMENDATION_CACHE_PERSISTENT
+)
+
+# Ranked snapshots that follow-up pages are read from
+ranking_snapshots = RankingSnapshotCache(
+    ttl=settings.RECOMMEND_SNAPSHOT_TTL,
+    max_entries=settings.RECOMMEND_SNAPSHOT_CACHE_SIZE
+)
+
+# Separate budget from resume uploads so a burst of uploads cannot starve recommendations
+recommend_limiter = ConcurrencyLimiter(
+    "recommend",
+    max_concurrent=settings.RECOMMEND_CONCURRENCY,
+    max_queue=settings.RECOMMEND_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+    retry_after=settings.ADMISSION_RETRY_AFTER
+)
 
 logger = logging.getLogger(__name__)
 
 
+def load_recommender() -> JobRecommender:
+    """
+    Load the job catalog and fit the recommender
+
+    Only builds in-memory data, so it can run in the gunicorn master and be
+    shared copy-on-write with the workers.
+    """
+    global recommender
+    if recommender is None:
+        loaded = JobRecommender(
+            dataset_path=settings.DATASET_PATH,
+            vector_dtype=settings.VECTOR_DTYPE,
+            featurizer=settings.FEATURIZER,
+            hashing_features=settings.HASHING_FEATURES,
+            neighbours_per_skill=settings.SKILL_NEIGHBOURS,
+            min_cooccurrence=settings.SKILL_MIN_COOCCURRENCE
+        )
+        if loaded.jobs_df is None or loaded.job_vectors is None:
+            raise RuntimeError(f"Job catalog could not be loaded from {settings.DATASET_PATH}")
+        recommender = loaded
+    return recommender
+
+
+def attach_recommendation_cache():
+    """Point the recommendation cache at the loaded catalog (purges stale persisted entries)"""
+    if recommender is None:
+        raise RuntimeError("Recommender is not loaded")
+    recommendation_cache.set_catalog(recommender)
+    ranking_snapshots.clear()
+    CATALOG_SIZE.set(len(recommender.jobs_df))
+
+
+def start_sharded_scorer():
+    """Start the sharded scoring pool when SCORING_SHARDS > 1"""
+    if recommender is None:
+        raise RuntimeError("Recommender is not loaded")
+    if settings.SCORING_SHARDS > 1:
+        recommender.enable_sharding(settings.SCORING_SHARDS)
+
+
+def stop_sharded_scorer():
+    """Stop the sharded scoring pool"""
+    if recommender is not None:
+        recommender.close()
+
+
+def attach_candidate_index():
+    """
+    Load the candidate index in the loaded catalog's vector space
+
+    Resumes are indexed once their row is inserted, so candidate search never returns
+    a resume the write buffer dropped.
+    """
+    if recommender is None:
+        raise RuntimeError("Recommender is not loaded")
+    candidate_index.attach(recommender)
+    write_buffer.on_written('resumes', candidate_index.add_rows)
+
+
 class JobRecommendationRequest(BaseModel):
     """Request model for job recommendations"""
     user_skills: List[str]
-    top_n: int = 10
+    top_n: int = Field(10, ge=1)  # page size; capped at RECOMMEND_MAX_PAGE_SIZE
+    cursor: Optional[str] = None  # next_cursor of the previous page
+    # Allowed values per catalog column, e.g. {"location": ["remote", "berlin"], "seniority": ["senior"]}
+    filters: Optional[Dict[str, List[str]]] = None
+    # Also match jobs requiring skills that usually come with the user's (see GET /jobs/skills/{skill}/related)
+    expand: bool = False
+
 
+# Fields a client can select with fields=; slim=true drops the per-item copy of user_skills
+# and required_skills, which clients can get (and cache) from GET /jobs/{job_id}
+RECOMMENDATION_FIELDS = list(JobRecommendation.model_fields)
+SLIM_EXCLUDED_FIELDS = {"user_skills", "required_skills"}
+
+
+def _select_fields(fields: Optional[str], slim: bool) -> Optional[List[str]]:
+    """
+    Resolve the recommendation fields to return
 
-@router.post("/recommend", response_model=JobRecommendationResponse)
+    Returns:
+        List of field names, or None for all fields
+
+    Raises:
+        HTTPException: If fields names an unknown field
+    """
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in selected if f not in RECOMMENDATION_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown recommendation fields: {unknown}. Allowed: {RECOMMENDATION_FIELDS}"
+            )
+        return selected
+
+    if slim:
+        return [f for f in RECOMMENDATION_FIELDS if f not in SLIM_EXCLUDED_FIELDS]
+
+    return None
+
+
+def _ranking(normalized_skills: List[str], filters: Dict[str, List[str]], expand: bool, snapshot_key: str):
+    """Ranked (positions, scores) for a query, from the snapshot cache or freshly ranked"""
+    snapshot = ranking_snapshots.get(snapshot_key)
+    if snapshot is None:
+        snapshot = recommender.rank(
+            normalized_skills,
+            settings.RECOMMEND_MAX_RESULTS,
+            min_similarity=settings.MIN_SIMILARITY_THRESHOLD,
+            filters=filters,
+            expand_skills=settings.SKILL_EXPANSION_MAX if expand else 0,
+            expansion_weight=settings.SKILL_EXPANSION_WEIGHT
+        )
+        ranking_snapshots.set(snapshot_key, *snapshot)
+    return snapshot
+
+
+def _project(recommendations, item_fields: Optional[List[str]], user_skills: List[str]):
+    """
+    Shape recommendations for the response
+
+    Cached entries are shared, so this builds new dicts rather than mutating them.
+    They come straight from the recommender, so they are serialised without re-validation.
+    """
+    for rec in recommendations:
+        if item_fields is None:
+            yield {**rec, "user_skills": user_skills}
+        else:
+            item = {field: rec[field] for field in item_fields}
+            if "user_skills" in item:
+                item["user_skills"] = user_skills
+            yield item
+
+
+@router.post(
+    "/recommend",
+    response_model=JobRecommendationResponse,
+    response_class=FastJSONResponse
+)
 async def recommend_jobs(
     request: JobRecommendationRequest,
+    slim: bool = Query(False, description="Omit user_skills and required_skills from each recommendation"),
+    fields: Optional[str] = Query(None, description="Comma-separated recommendation fields to return"),
+    stream: bool = Query(False, description="Stream recommendations as NDJSON, one per line"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get job recommendations based on user skills
     
     Args:
-        request: JobRecommendationRequest with user_skills and top_n
+        request: JobRecommendationRequest with user_skills, top_n (page size), an
+            optional cursor from the previous page, filters and expand (also match
+            related skills; the skills added are returned in expanded_skills)
+        slim: Drop user_skills (returned once at top level) and required_skills
+            (available from GET /jobs/{job_id}) from each recommendation
+        fields: Return only these recommendation fields
+        stream: Return application/x-ndjson with one recommendation per line; the cursor
+            of the next page is sent in the X-Next-Cursor header
         
     Returns:
         Job recommendations with match scores and skill gaps
     """
+    item_fields = _select_fields(fields, slim)
+
     if not recommender:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -54,40 +233,154 @@ async def recommend_jobs(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User skills are required"
         )
-    
+
     try:
-        # Get job recommendations
-        recommendations_data = recommender.recommend_jobs(
-            user_skills=request.user_skills,
-            top_n=request.top_n,
-            min_similarity=settings.MIN_SIMILARITY_THRESHOLD
-        )
-        
-        # Convert to response models
-        recommendations = [
-            JobRecommendation(**rec) for rec in recommendations_data
+        filters = recommender.normalize_filters(request.filters)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Results depend only on the normalised skill set, filters and expansion, so equivalent
+    # requests share a cache entry
+    normalized_skills = RecommendationCache.normalize_skills(request.user_skills)
+    expansion = {}
+    if request.expand:
+        expansion["expansion"] = [
+            settings.SKILL_EXPANSION_MAX, settings.SKILL_EXPANSION_WEIGHT,
+            settings.SKILL_NEIGHBOURS, settings.SKILL_MIN_COOCCURRENCE
         ]
+    snapshot_key = RecommendationCache.make_key(
+        normalized_skills,
+        settings.RECOMMEND_MAX_RESULTS,
+        recommender.catalog_version,
+        min_similarity=settings.MIN_SIMILARITY_THRESHOLD,
+        filters=filters,
+        **expansion
+    )
+    query_id = snapshot_key[:16]
+
+    offset = 0
+    if request.cursor:
+        try:
+            cursor_version, cursor_query, offset = decode_cursor(request.cursor, 3)
+            if not isinstance(offset, int) or offset < 0:
+                raise ValueError("Invalid pagination cursor")
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if cursor_version != recommender.catalog_version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Job catalog changed since this cursor was issued; restart from the first page"
+            )
+        if cursor_query != query_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor was issued for different skills or filters"
+            )
+
+    # Streams materialise one result at a time, so they may cover the whole ranking depth
+    page_size = min(
+        request.top_n,
+        settings.RECOMMEND_MAX_RESULTS if stream else settings.RECOMMEND_MAX_PAGE_SIZE
+    )
+    
+    # Taken here rather than as a dependency: FastAPI releases dependencies before a
+    # streaming body is sent, so streams hand the slot over to their body instead
+    await recommend_limiter.acquire()
+    slot_handed_over = False
+    try:
+        page = None
+        if offset == 0 and not stream:
+            cache_key = RecommendationCache.make_key(
+                normalized_skills,
+                page_size,
+                recommender.catalog_version,
+                min_similarity=settings.MIN_SIMILARITY_THRESHOLD,
+                filters=filters,
+                **expansion
+            )
+            # An LRU miss reads the persistent tier, a blocking database round trip
+            cached = await run_in_threadpool(recommendation_cache.get, cache_key)
+            if cached is not None:
+                # The cached page carries the ranking length, so a hit needs no ranking
+                page, total = cached
+                end = len(page)
+        if page is None:
+            # Scoring and materialising are CPU-bound (and wait on the shard pool when
+            # sharded), so they run in the threadpool to keep the event loop free
+            positions, scores = await run_in_threadpool(
+                _ranking, normalized_skills, filters, request.expand, snapshot_key
+            )
+            total = len(positions)
+            end = min(offset + page_size, total)
+            if offset == 0 and not stream:
+                page = await run_in_threadpool(recommender.materialise, positions[:end], scores[:end], normalized_skills)
+                recommendation_cache.set(cache_key, page, total)
+        has_more = end < total
+
+        next_cursor = encode_cursor(recommender.catalog_version, query_id, end) if has_more else None
+        expanded_skills = None
+        if request.expand:
+            expanded_skills = [
+                skill for skill, _ in recommender.expand_skills(normalized_skills, settings.SKILL_EXPANSION_MAX)
+            ]
+
+        if stream:
+            headers = {"X-Total-Results": str(total)}
+            if next_cursor:
+                headers["X-Next-Cursor"] = next_cursor
+            if expanded_skills:
+                headers["X-Expanded-Skills"] = ",".join(expanded_skills)
+
+            def lines():
+                items = recommender.iter_recommendations(positions[offset:end], scores[offset:end], normalized_skills)
+                for item in _project(items, item_fields, request.user_skills):
+                    yield dumps(item) + b"\n"
+
+            async def body():
+                try:
+                    async for chunk in iterate_in_threadpool(lines()):
+                        yield chunk
+                finally:
+                    recommend_limiter.release()
+
+            logger.info(
+                "Recommendations streamed",
+                extra=sampled(user_id=str(current_user['user_id']), count=end - offset, offset=offset)
+            )
+            slot_handed_over = True
+            return StreamingResponse(body(), media_type="application/x-ndjson", headers=headers)
+
+        if page is None:
+            page = await run_in_threadpool(
+                recommender.materialise, positions[offset:end], scores[offset:end], normalized_skills
+            )
+        recommendations = list(_project(page, item_fields, request.user_skills))
         
-        # Save recommendations to database for caching
-        from app.services.database import DatabaseService
-        save_success = DatabaseService.save_job_recommendation(
-            current_user['user_id'],
-            request.user_skills,
-            recommendations_data  # Save the raw data
-        )
+        # Queue the first page for a batched insert into the user's history
+        if offset == 0:
+            from app.services.database import DatabaseService
+            save_success = DatabaseService.queue_job_recommendation(
+                current_user['user_id'],
+                request.user_skills,
+                page,
+                recommender.catalog_version
+            )
 
-        if not save_success:
-            logger.warning(f"Failed to save job recommendations to database for user {current_user['user_id']}")
+            if not save_success:
+                logger.warning(f"Failed to queue job recommendations for user {current_user['user_id']}")
 
         logger.info(
-            f"Generated {len(recommendations)} recommendations for user {current_user['user_id']}"
+            "Recommendations generated",
+            extra=sampled(user_id=str(current_user['user_id']), count=len(recommendations), offset=offset)
         )
 
-        return JobRecommendationResponse(
-            user_skills=request.user_skills,
-            total_jobs_found=len(recommendations),
-            recommendations=recommendations
-        )
+        return FastJSONResponse({
+            "user_skills": request.user_skills,
+            "total_jobs_found": len(recommendations),
+            "recommendations": recommendations,
+            "next_cursor": next_cursor,
+            "expanded_skills": expanded_skills
+        })
         
     except Exception as e:
         logger.error(f"Error generating recommendations: {str(e)}")
@@ -95,6 +388,72 @@ async def recommend_jobs(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error generating recommendations: {str(e)}"
         )
+    finally:
+        if not slot_handed_over:
+            recommend_limiter.release()
+
+
+@router.get("/history", response_model=RecommendationHistoryResponse)
+async def get_recommendation_history(
+    limit: int = Query(10, ge=1, le=100, description="Number of entries per page"),
+    cursor: str = Query(None, description="Cursor returned by the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get the current user's recommendation history, newest first
+
+    Returns the skills each recommendation was requested for; pass next_cursor to get the next page
+    """
+    from app.services.database import DatabaseService
+
+    try:
+        history, next_cursor = DatabaseService.get_user_recommendations(
+            current_user['user_id'],
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return RecommendationHistoryResponse(items=history, next_cursor=next_cursor)
+
+
+@router.get("/history/{recommendation_id}", response_model=RecommendationHistoryDetail)
+async def get_recommendation_history_detail(
+    recommendation_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get a stored recommendation, rehydrated from the current job catalog
+    """
+    from app.services.database import DatabaseService
+
+    if not recommender:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recommendation service is not available"
+        )
+
+    stored = DatabaseService.get_recommendation(current_user['user_id'], recommendation_id)
+    if not stored:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Recommendation {recommendation_id} not found"
+        )
+
+    payload = stored['recommendations']
+    recommendations = unpack_recommendations(payload, stored['user_skills'], recommender)
+
+    return RecommendationHistoryDetail(
+        recommendation_id=stored['recommendation_id'],
+        user_skills=stored['user_skills'],
+        created_at=stored['created_at'],
+        catalog_changed=isinstance(payload, dict) and payload.get('catalog_version') != recommender.catalog_version,
+        recommendations=recommendations
+    )
 
 
 class SkillGapRequest(BaseModel):
@@ -144,3 +503,216 @@ async def get_skill_gap(
             detail=f"Error in skill gap analysis: {str(e)}"
         )
 
+
+class SkillOpportunitiesRequest(BaseModel):
+    """Request model for catalog-wide skill gap ranking"""
+    user_skills: List[str]
+    top_n: int = Field(10, ge=1, le=100)
+    match_threshold: float = Field(0.5, gt=0.0, le=1.0)
+    rank_by: Literal["jobs", "score"] = "jobs"
+
+
+@router.post("/skill-gap", response_model=SkillOpportunitiesResponse, response_class=FastJSONResponse)
+async def get_catalog_skill_gap(
+    request: SkillOpportunitiesRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Rank the skills a user is missing by how many jobs each would unlock
+
+    A job is unlocked when learning the skill brings the user to match_threshold of its
+    required skills. rank_by=score ranks by the summed match percentage gained instead.
+    """
+    if not recommender:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recommendation service is not available"
+        )
+
+    result = await run_in_threadpool(
+        recommender.rank_missing_skills,
+        user_skills=request.user_skills,
+        top_n=request.top_n,
+        match_threshold=request.match_threshold,
+        rank_by=request.rank_by
+    )
+    return {"user_skills": request.user_skills, **result}
+
+
+def _etag(*parts) -> str:
+    """Strong ETag for a catalog response, derived from the catalog version and request parameters"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[:16]
+    return f'"{recommender.catalog_version}-{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Check If-None-Match against an ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def _catalog_response(request: Request, etag: str, build_content) -> Response:
+    """Return 304 if the client's copy is current, otherwise the content with caching headers"""
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.CATALOG_CACHE_MAX_AGE}"
+    }
+    if _not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FastJSONResponse(build_content(), headers=headers)
+
+
+@router.get("/filters", response_class=FastJSONResponse)
+async def get_filters(request: Request):
+    """
+    Get the catalog columns recommendations can be filtered on, with their values
+
+    Supports If-None-Match like GET /jobs/catalog.
+    """
+    if not recommender:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recommendation service is not available"
+        )
+
+    return _catalog_response(request, _etag("filters"), recommender.filter_values)
+
+
+@router.get("/catalog", response_model=CatalogPage, response_class=FastJSONResponse)
+async def get_catalog(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500, description="Number of jobs per page"),
+    cursor: str = Query(None, description="Cursor returned by the previous page")
+):
+    """
+    Browse the job catalog in dataset order
+
+    Responses carry a strong ETag derived from the catalog version; send it back in
+    If-None-Match to get 304 Not Modified while the catalog is unchanged.
+    """
+    if not recommender:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recommendation service is not available"
+        )
+
+    offset = 0
+    if cursor:
+        try:
+            cursor_version, offset = decode_cursor(cursor, 2)
+            if not isinstance(offset, int) or offset < 0:
+                raise ValueError("Invalid pagination cursor")
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if cursor_version != recommender.catalog_version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Job catalog changed since this cursor was issued; restart from the first page"
+            )
+
+    def build_page():
+        total = len(recommender.jobs_df)
+        jobs = recommender.list_jobs(offset, limit)
+        next_offset = offset + len(jobs)
+        return {
+            "catalog_version": recommender.catalog_version,
+            "total": total,
+            "jobs": jobs,
+            "next_cursor": encode_cursor(recommender.catalog_version, next_offset) if next_offset < total else None
+        }
+
+    return _catalog_response(request, _etag("catalog", offset, limit), build_page)
+
+
+@router.get("/{job_id}/candidates", response_model=JobCandidatesResponse, response_class=FastJSONResponse)
+async def get_job_candidates(
+    job_id: str,
+    limit: int = Query(20, ge=1, le=200, description="Number of candidates to return"),
+    current_user: dict = Depends(get_current_recruiter)
+):
+    """
+    Rank candidates for a job by how well their latest resume matches it
+
+    Recruiter accounts only (RECRUITER_EMAILS_STR).
+    """
+    if not recommender or candidate_index.recommender is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Candidate search is not available"
+        )
+
+    candidates = await run_in_threadpool(candidate_index.top_candidates, job_id, limit)
+    if candidates is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job ID {job_id} not found"
+        )
+
+    job = recommender.get_job(job_id)
+    return {
+        "job_id": job["job_id"],
+        "job_title": job["job_title"],
+        "total_candidates": candidate_index.size,
+        "candidates": candidates
+    }
+
+
+@router.get(
+    "/skills/{skill:path}/related",
+    response_model=RelatedSkillsResponse,
+    response_class=FastJSONResponse
+)
+async def get_related_skills(
+    skill: str,
+    request: Request,
+    top_n: int = Query(10, ge=1, le=100, description="Number of related skills to return")
+):
+    """
+    Get the skills most often required together with a skill
+
+    Related skills are precomputed from the catalog and ranked by normalised PMI.
+    Supports If-None-Match like GET /jobs/catalog.
+    """
+    if not recommender:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recommendation service is not available"
+        )
+
+    related = recommender.related_skills(skill, top_n)
+    if related is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Skill {skill} is not required by any job"
+        )
+
+    return _catalog_response(request, _etag("related", related["skill"], top_n), lambda: related)
+
+
+# Declared last so /jobs/{job_id} does not shadow the fixed /jobs/* routes
+@router.get("/{job_id}", response_model=CatalogJob, response_class=FastJSONResponse)
+async def get_catalog_job(job_id: str, request: Request):
+    """
+    Get a single job from the catalog
+
+    Supports If-None-Match like GET /jobs/catalog.
+    """
+    if not recommender:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recommendation service is not available"
+        )
+
+    job = recommender.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job ID {job_id} not found"
+        )
+
+    return _catalog_response(request, _etag("job", job_id), lambda: job)
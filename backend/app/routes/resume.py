@@ -1,17 +1,30 @@
 """
 Resume upload and processing routes
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, status, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, status, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile as FormFile
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import functools
 import uuid
 import logging
+import zipfile
 
-from app.models.schemas import ResumeUploadResponse, SkillExtractionResponse
+from app.models.schemas import (
+    ResumeUploadResponse, SkillExtractionResponse,
+    ResumeHistoryResponse, ResumeDetailResponse
+)
 from app.services.resume_parser import ResumeParser
 from app.services.skill_extractor import SkillExtractor
 from app.services.database import DatabaseService
 from app.routes.auth import get_current_user
 from app.core.config import settings
+from app.core.metrics import time_stage
+from app.core.responses import dumps
+from app.core.logging_config import sampled
+from app.core.admission import ConcurrencyLimiter, TokenBucketLimiter
 
 router = APIRouter(prefix="/resume", tags=["Resume"])
 
@@ -19,10 +32,49 @@ router = APIRouter(prefix="/resume", tags=["Resume"])
 resume_parser = ResumeParser()
 skill_extractor = SkillExtractor()
 
+# PDF parsing is CPU-bound: cap concurrent uploads so cheap routes keep their latency
+upload_limiter = ConcurrencyLimiter(
+    "resume_upload",
+    max_concurrent=settings.RESUME_UPLOAD_CONCURRENCY,
+    max_queue=settings.RESUME_UPLOAD_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+    retry_after=settings.ADMISSION_RETRY_AFTER
+)
+upload_rate_limiter = TokenBucketLimiter(
+    "resume_upload_user",
+    rate_per_minute=settings.RESUME_UPLOAD_RATE_PER_MINUTE,
+    burst=settings.RESUME_UPLOAD_BURST
+)
+
 logger = logging.getLogger(__name__)
 
 
-@router.post("/upload", response_model=ResumeUploadResponse)
+def process_resume_pdf(file_content: bytes) -> Tuple[str, List[str]]:
+    """
+    Validate a PDF and extract its text and skills (CPU-bound, run in a worker thread)
+
+    Returns:
+        Tuple of (extracted text, extracted skills)
+    """
+    with time_stage("pdf_validate"):
+        valid_pdf = resume_parser.validate_pdf(file_content)
+    if not valid_pdf:
+        raise ValueError("Invalid PDF file")
+
+    with time_stage("pdf_extract"):
+        extracted_text = resume_parser.extract_text_from_pdf(file_content)
+
+    with time_stage("skill_extract"):
+        extracted_skills = skill_extractor.extract_skills(extracted_text)
+
+    return extracted_text, extracted_skills
+
+
+@router.post(
+    "/upload",
+    response_model=ResumeUploadResponse,
+    dependencies=[Depends(upload_limiter)]
+)
 async def upload_resume(
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user)
@@ -32,17 +84,14 @@ async def upload_resume(
 
     Extracts text and skills from uploaded PDF resume
     """
-    logger.info("DEBUG: upload_resume function called")
-    logger.info(f"DEBUG: File: {file.filename}")
-    logger.info(f"DEBUG: Current user: {current_user}")
+    if settings.RATE_LIMIT_ENABLED:
+        upload_rate_limiter.hit(str(current_user['user_id']))
 
     # Read file content
     file_content = await file.read()
-    logger.info(f"DEBUG: File size: {len(file_content)} bytes")
 
     # Validate file type
     if not file.filename.endswith(".pdf"):
-        print("DEBUG: File type validation failed")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only PDF files are allowed"
@@ -58,31 +107,19 @@ async def upload_resume(
                 detail=f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE / (1024*1024)}MB"
             )
         
-        # Validate PDF
-        if not resume_parser.validate_pdf(file_content):
-            raise ValueError("Invalid PDF file")
-        
-        # Extract text from PDF
-        extracted_text = resume_parser.extract_text_from_pdf(file_content)
-        
-        # Extract skills from text
-        extracted_skills = skill_extractor.extract_skills(extracted_text)
+        # Validate PDF and extract text and skills off the event loop
+        extracted_text, extracted_skills = await run_in_threadpool(process_resume_pdf, file_content)
         
         # Generate resume ID
         resume_id = str(uuid.uuid4())
         
-        # Debug: Log current user info
-        print(f"DEBUG: Current user object: {current_user}")
-        print(f"DEBUG: Current user type: {type(current_user)}")
-        print(f"DEBUG: User ID: {current_user.get('user_id', 'NOT FOUND')}")
-        print(f"DEBUG: User email: {current_user.get('email', 'NOT FOUND')}")
-
         # Ensure user_id exists
         if 'user_id' not in current_user:
-            raise ValueError(f"User object missing user_id: {current_user}")
+            raise ValueError("User object missing user_id")
 
-        # Save resume to database
-        save_success = DatabaseService.save_resume(
+        # Queue resume for a batched insert
+        save_success = DatabaseService.queue_resume(
+            resume_id,
             current_user['user_id'],
             file.filename,
             extracted_text,
@@ -90,13 +127,16 @@ async def upload_resume(
         )
 
         if not save_success:
-            logger.warning(f"Failed to save resume to database for user {current_user['user_id']}")
-        else:
-            logger.info(f"Successfully saved resume for user {current_user['user_id']}")
+            logger.warning(f"Failed to queue resume for user {current_user['user_id']}")
 
         logger.info(
-            f"Resume processed for user {current_user['user_id']}: "
-            f"{len(extracted_skills)} skills extracted"
+            "Resume processed",
+            extra=sampled(
+                user_id=str(current_user['user_id']),
+                resume_id=resume_id,
+                size_bytes=len(file_content),
+                skills=len(extracted_skills)
+            )
         )
 
         return ResumeUploadResponse(
@@ -107,25 +147,263 @@ async def upload_resume(
         )
         
     except ValueError as e:
-        print(f"DEBUG: ValueError caught: {e}")
+        logger.info(f"Rejected resume upload: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except HTTPException:
-        print("DEBUG: HTTPException re-raised")
         raise  # Re-raise HTTPException to be handled by FastAPI
     except Exception as e:
         error_msg = str(e) if str(e) else f"Unknown error: {type(e).__name__}"
-        print(f"DEBUG: General exception: {error_msg}, type: {type(e)}")
-        logger.error(f"Error processing resume: {error_msg}")
-        logger.error(f"Full exception: {repr(e)}")
+        logger.exception(f"Error processing resume: {error_msg}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing resume: {error_msg}"
         )
 
 
+# Multipart body of /upload-batch, parsed by the route itself (see upload_resume_batch)
+BATCH_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["files"],
+                    "properties": {
+                        "files": {
+                            "type": "array",
+                            "items": {"type": "string", "format": "binary"},
+                            "description": "PDF resumes, or a single zip archive of PDFs"
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+BatchDocument = Tuple[str, Optional[int], Callable[[], Awaitable[bytes]]]
+
+
+def _read_zip_member(archive: zipfile.ZipFile, name: str, limit: int) -> bytes:
+    # Read at most one byte past the limit, whatever size the archive declares
+    with archive.open(name) as member:
+        return member.read(limit + 1)
+
+
+def _batch_documents(uploads: List[FormFile]) -> Tuple[List[BatchDocument], Optional[zipfile.ZipFile]]:
+    """
+    List the documents of a batch upload
+
+    Returns:
+        Tuple of ((filename, declared size, reader) per document, open zip archive or None)
+    """
+    if len(uploads) == 1 and (uploads[0].filename or "").lower().endswith(".zip"):
+        try:
+            archive = zipfile.ZipFile(uploads[0].file)
+        except zipfile.BadZipFile:
+            raise ValueError("Invalid zip archive")
+        documents = [
+            (
+                info.filename,
+                info.file_size,
+                functools.partial(run_in_threadpool, _read_zip_member, archive, info.filename, settings.MAX_UPLOAD_SIZE)
+            )
+            for info in archive.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(".pdf")
+            and not info.filename.startswith("__MACOSX/")
+        ]
+        return documents, archive
+
+    return [(upload.filename or "", upload.size, upload.read) for upload in uploads], None
+
+
+def _limit_body(receive, limit: int):
+    """Wrap an ASGI receive callable so reading more than limit body bytes raises 413"""
+    received = 0
+
+    async def limited_receive():
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Batch exceeds maximum total size of {limit / (1024*1024)}MB"
+                )
+        return message
+
+    return limited_receive
+
+
+async def _process_batch_file(index: int, filename: str, content: bytes, user_id: str) -> Dict[str, Any]:
+    """Parse one file of a batch upload under the upload concurrency limit and store it"""
+    result: Dict[str, Any] = {"index": index, "filename": filename}
+    try:
+        try:
+            await upload_limiter.acquire()
+        except HTTPException as e:
+            # Busy, not a bad file: the file was not parsed, so its rate token is given back
+            if settings.RATE_LIMIT_ENABLED:
+                upload_rate_limiter.refund(user_id)
+            result.update(status="skipped", error=e.detail)
+            return result
+        try:
+            extracted_text, extracted_skills = await run_in_threadpool(process_resume_pdf, content)
+        finally:
+            upload_limiter.release()
+
+        resume_id = str(uuid.uuid4())
+        if not DatabaseService.queue_resume(resume_id, user_id, filename, extracted_text, extracted_skills):
+            logger.warning(f"Failed to queue resume for user {user_id}")
+
+        result.update(
+            status="processed",
+            resume_id=resume_id,
+            extracted_skills=extracted_skills,
+            skill_count=len(extracted_skills)
+        )
+    except HTTPException as e:
+        result.update(status="failed", error=e.detail)
+    except ValueError as e:
+        result.update(status="failed", error=str(e))
+    except Exception as e:
+        error_msg = str(e) if str(e) else f"Unknown error: {type(e).__name__}"
+        logger.exception(f"Error processing resume {filename}: {error_msg}")
+        result.update(status="failed", error=f"Error processing resume: {error_msg}")
+    return result
+
+
+@router.post("/upload-batch", openapi_extra=BATCH_UPLOAD_BODY)
+async def upload_resume_batch(
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Upload and process several resume PDFs, or one zip archive of PDFs
+
+    Files are parsed concurrently and one NDJSON line is streamed per file as soon as it
+    is done, in completion order: index, filename, status ("processed", "failed" or
+    "skipped") and either resume_id and extracted_skills or error. Files after the total
+    size limit is reached are skipped. Every file takes a token from the user's upload
+    rate limit, like a single upload; a batch the bucket cannot cover is rejected with
+    429 before any file is parsed, and skipped files get their token back.
+    """
+    user_id = str(current_user['user_id'])
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.RESUME_BATCH_MAX_TOTAL_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds maximum total size of {settings.RESUME_BATCH_MAX_TOTAL_SIZE / (1024*1024)}MB"
+        )
+
+    # Parsed here rather than with File() parameters: FastAPI closes uploaded files when
+    # the route returns, before a streaming response has read them. Body bytes are
+    # counted as they arrive, so chunked bodies without Content-Length are capped too.
+    limited_request = Request(request.scope, _limit_body(request.receive, settings.RESUME_BATCH_MAX_TOTAL_SIZE))
+    form = await limited_request.form(max_files=settings.RESUME_BATCH_MAX_FILES, max_fields=10)
+    try:
+        uploads = [value for value in form.getlist("files") if isinstance(value, FormFile)]
+        if not uploads:
+            raise ValueError("No files uploaded")
+        documents, archive = _batch_documents(uploads)
+        if not documents:
+            raise ValueError("No PDF files found in the zip archive")
+        max_files = settings.RESUME_BATCH_MAX_FILES
+        if settings.RATE_LIMIT_ENABLED:
+            # A batch larger than the bucket could never be admitted
+            max_files = min(max_files, upload_rate_limiter.burst)
+        if len(documents) > max_files:
+            raise ValueError(f"At most {max_files} files are allowed per batch")
+    except ValueError as e:
+        await form.close()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if settings.RATE_LIMIT_ENABLED:
+        try:
+            upload_rate_limiter.hit(user_id, len(documents))
+        except HTTPException:
+            await form.close()
+            raise
+
+    def skip(result: Dict[str, Any], error: str) -> Dict[str, Any]:
+        if settings.RATE_LIMIT_ENABLED:
+            upload_rate_limiter.refund(user_id)
+        return {**result, "status": "skipped", "error": error}
+
+    async def lines():
+        pending = set()
+        counts = {"processed": 0, "failed": 0, "skipped": 0}
+        total_size = 0
+
+        def line(result: Dict[str, Any]) -> bytes:
+            counts[result["status"]] += 1
+            return dumps(result) + b"\n"
+
+        try:
+            for index, (filename, size, read) in enumerate(documents):
+                # Bounded worker pool: wait for a slot, emitting results as they complete
+                while len(pending) >= settings.RESUME_BATCH_CONCURRENCY:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield line(task.result())
+
+                result = {"index": index, "filename": filename}
+                if total_size > settings.RESUME_BATCH_MAX_TOTAL_SIZE:
+                    yield line(skip(result, "Batch total size limit reached"))
+                    continue
+                if not filename.lower().endswith(".pdf"):
+                    yield line({**result, "status": "failed", "error": "Only PDF files are allowed"})
+                    continue
+
+                content = b"" if size is not None and size > settings.MAX_UPLOAD_SIZE else await read()
+                file_size = max(size or 0, len(content))
+                if file_size > settings.MAX_UPLOAD_SIZE:
+                    yield line({
+                        **result,
+                        "status": "failed",
+                        "error": f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE / (1024*1024)}MB"
+                    })
+                    continue
+
+                total_size += file_size
+                if total_size > settings.RESUME_BATCH_MAX_TOTAL_SIZE:
+                    yield line(skip(result, "Batch total size limit reached"))
+                    continue
+
+                pending.add(asyncio.ensure_future(_process_batch_file(index, filename, content, user_id)))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield line(task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+            if archive is not None:
+                archive.close()
+            await form.close()
+            logger.info(
+                "Resume batch processed",
+                extra=sampled(user_id=user_id, files=len(documents), bytes=total_size, **counts)
+            )
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"X-Batch-Files": str(len(documents))}
+    )
+
+
 @router.post("/extract-skills", response_model=SkillExtractionResponse)
 async def extract_skills_from_text(
     text: str = Query(..., description="Text content to extract skills from"),
@@ -144,7 +422,8 @@ async def extract_skills_from_text(
         )
     
     try:
-        skills = skill_extractor.extract_skills(text)
+        with time_stage("skill_extract"):
+            skills = skill_extractor.extract_skills(text)
         
         return SkillExtractionResponse(
             skills=skills,
@@ -158,3 +437,46 @@ async def extract_skills_from_text(
             detail=f"Error extracting skills: {str(e)}"
         )
 
+
+@router.get("/history", response_model=ResumeHistoryResponse)
+async def get_resume_history(
+    limit: int = Query(20, ge=1, le=100, description="Number of resumes per page"),
+    cursor: str = Query(None, description="Cursor returned by the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get the current user's resume upload history, newest first
+
+    Returns filenames and extracted skills only; pass next_cursor to get the next page
+    """
+    try:
+        resumes, next_cursor = DatabaseService.get_user_resumes(
+            current_user['user_id'],
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return ResumeHistoryResponse(items=resumes, next_cursor=next_cursor)
+
+
+@router.get("/history/{resume_id}", response_model=ResumeDetailResponse)
+async def get_resume_detail(
+    resume_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get a single stored resume of the current user, including its text
+    """
+    resume = DatabaseService.get_resume(current_user['user_id'], resume_id)
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Resume {resume_id} not found"
+        )
+
+    return ResumeDetailResponse(**resume)
@@ -0,0 +1,305 @@
+"""
+Candidate index for reverse matching (job -> best candidates)
+Resume skill vectors live in a sparse matrix in the same TF-IDF space as the job
+vectors, so ranking every candidate for a job is one sparse matrix-vector product.
+
+The index is persisted as an append-only JSONL log of resume additions and user
+deletions, plus a single npz snapshot holding the matrix and its row metadata. Every
+worker appends to the same log and replays entries written by other workers before
+answering a query.
+"""
+from typing import Any, Dict, List, Optional
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LOG_FILE = "log.jsonl"
+SNAPSHOT_FILE = "snapshot.npz"
+
+
+class CandidateIndex:
+    """Sparse index of the latest resume of every user"""
+
+    def __init__(self, directory: str, snapshot_every: int = 1000):
+        """
+        Initialize candidate index
+
+        Args:
+            directory: Directory holding the log and snapshot
+            snapshot_every: Write a new snapshot after this many replayed log entries
+        """
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.log_path = os.path.join(directory, LOG_FILE)
+
+        self.recommender = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Drop in-memory state (must hold the lock or be in __init__)"""
+        self._matrix = None
+        self._pending: List[Any] = []
+        self._resume_ids: List[str] = []
+        self._user_ids: List[str] = []
+        self._skills: List[List[str]] = []
+        self._active: List[bool] = []
+        self._user_rows: Dict[str, int] = {}
+        self._log_offset = 0
+        self._since_snapshot = 0
+
+    @property
+    def size(self) -> int:
+        """Number of candidates (users with an indexed resume)"""
+        return len(self._user_rows)
+
+    def attach(self, recommender):
+        """
+        Load the index for the recommender's vector space
+
+        Loads the snapshot if it was built for the same catalog version and replays the
+        rest of the log; otherwise rebuilds every vector from the log.
+        """
+        with self._lock:
+            self.recommender = recommender
+            self._reset()
+            os.makedirs(self.directory, exist_ok=True)
+
+            if self._load_snapshot():
+                logger.info(f"Loaded candidate index snapshot with {len(self._resume_ids)} resumes")
+            self._sync()
+            if self._since_snapshot:
+                self._save_snapshot()
+        logger.info(f"Candidate index ready with {self.size} candidates")
+
+    def add(self, resume_id: str, user_id: str, skills: List[str]) -> bool:
+        """
+        Record a resume; it replaces the user's previous resume in the index
+
+        Returns:
+            True if the entry was written to the log
+        """
+        return self._append({"op": "add", "resume_id": str(resume_id), "user_id": str(user_id), "skills": skills})
+
+    def add_rows(self, rows: List[Dict[str, Any]]):
+        """Record inserted resumes table rows (write buffer callback, see app.routes.recommend)"""
+        for row in rows:
+            self.add(row["resume_id"], row["user_id"], row["extracted_skills"])
+
+    def remove_user(self, user_id: str) -> bool:
+        """Record that a user's resumes must no longer be returned"""
+        return self._append({"op": "delete", "user_id": str(user_id)})
+
+    def _append(self, entry: Dict[str, Any]) -> bool:
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # O_APPEND with a single write keeps lines from concurrent workers intact
+            fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            return True
+        except OSError as e:
+            logger.error(f"Error writing candidate index log: {str(e)}")
+            return False
+
+    def top_candidates(self, job_id: str, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """
+        Rank indexed candidates for a job
+
+        Args:
+            job_id: Catalog job ID
+            limit: Maximum number of candidates
+
+        Returns:
+            Candidates sorted by match score, or None if the job is not in the catalog
+        """
+        position = self.recommender.job_position(job_id)
+        if position is None:
+            return None
+        job = self.recommender.get_job(job_id)
+
+        with self._lock:
+            self._sync()
+            self._flush_pending()
+            if self._matrix is None or not self._user_rows:
+                return []
+
+            # Rows are L2-normalised TF-IDF vectors, so the dot product is the cosine similarity
+            job_vector = self.recommender.job_vector(position)
+            scores = np.asarray((self._matrix @ job_vector.T).todense()).ravel()
+            scores[~np.asarray(self._active, dtype=bool)] = -1.0
+
+            k = min(limit, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            rows = [(int(row), float(scores[row])) for row in top if scores[row] > 0]
+            entries = [(self._resume_ids[row], self._user_ids[row], self._skills[row], score) for row, score in rows]
+
+        required = job["required_skills"]
+        candidates = []
+        for resume_id, user_id, skills, score in entries:
+            skill_set = {skill.lower() for skill in skills}
+            candidates.append({
+                "user_id": user_id,
+                "resume_id": resume_id,
+                "match_score": score,
+                "match_percentage": round(score * 100, 2),
+                "matched_skills": [skill for skill in required if skill in skill_set],
+                "missing_skills": [skill for skill in required if skill not in skill_set]
+            })
+        return candidates
+
+    def _sync(self):
+        """Replay log entries written since the last sync (must hold the lock)"""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Only consume complete lines; a concurrent writer may be mid-line
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return
+        entries = []
+        for line in data[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                logger.warning("Skipping malformed candidate index log line")
+        self._log_offset += end
+        self._apply(entries)
+
+        self._since_snapshot += len(entries)
+        if self._since_snapshot >= self.snapshot_every:
+            self._save_snapshot()
+
+    def _apply(self, entries: List[Dict[str, Any]]):
+        """Apply log entries, vectorising all added resumes in one batch"""
+        added = []
+        for entry in entries:
+            user_id = entry.get("user_id")
+            previous = self._user_rows.pop(user_id, None)
+            if previous is not None:
+                self._active[previous] = False
+            if entry.get("op") != "add":
+                continue
+
+            self._user_rows[user_id] = len(self._resume_ids)
+            self._resume_ids.append(entry["resume_id"])
+            self._user_ids.append(user_id)
+            self._skills.append(entry.get("skills") or [])
+            self._active.append(True)
+            added.append(" ".join(entry.get("skills") or []).lower())
+
+        if added:
+            self._pending.append(sparse.csr_matrix(self.recommender.vectorizer.transform(added)))
+
+    def _flush_pending(self):
+        """Stack vectors added since the last query onto the matrix (must hold the lock)"""
+        if self._pending:
+            blocks = ([self._matrix] if self._matrix is not None else []) + self._pending
+            self._matrix = sparse.vstack(blocks, format="csr")
+            self._pending = []
+
+    def _load_snapshot(self) -> bool:
+        """Load the snapshot if it matches the current catalog (must hold the lock)"""
+        try:
+            with np.load(os.path.join(self.directory, SNAPSHOT_FILE), allow_pickle=False) as snapshot:
+                meta = json.loads(snapshot["meta"].tobytes().decode("utf-8"))
+                if meta.get("catalog_version") != self.recommender.catalog_version:
+                    logger.info("Candidate index snapshot is for another catalog version; rebuilding from log")
+                    return False
+                matrix = sparse.csr_matrix(
+                    (snapshot["data"], snapshot["indices"], snapshot["indptr"]),
+                    shape=tuple(snapshot["shape"])
+                )
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable candidate index snapshot: {str(e)}")
+            return False
+
+        if not (matrix.shape[0] == len(meta["resume_ids"]) == len(meta["user_ids"]) == len(meta["active"])):
+            logger.warning("Candidate index snapshot rows do not match its metadata; rebuilding from log")
+            return False
+
+        self._matrix = matrix
+        self._resume_ids = meta["resume_ids"]
+        self._user_ids = meta["user_ids"]
+        self._skills = meta["skills"]
+        self._active = meta["active"]
+        self._user_rows = {
+            user_id: row for row, user_id in enumerate(self._user_ids) if self._active[row]
+        }
+        self._log_offset = meta["log_offset"]
+        return True
+
+    def _compact(self):
+        """Drop rows of replaced and deleted resumes (must hold the lock, after _flush_pending)"""
+        if self._matrix is None or all(self._active):
+            return
+        keep = np.flatnonzero(np.asarray(self._active, dtype=bool))
+        self._matrix = self._matrix[keep]
+        self._resume_ids = [self._resume_ids[row] for row in keep]
+        self._user_ids = [self._user_ids[row] for row in keep]
+        self._skills = [self._skills[row] for row in keep]
+        self._active = [True] * len(keep)
+        self._user_rows = {user_id: row for row, user_id in enumerate(self._user_ids)}
+
+    def _save_snapshot(self):
+        """Compact the index and write the matrix and metadata as one file (must hold the lock)"""
+        self._flush_pending()
+        self._compact()
+        if self._matrix is None:
+            return
+
+        meta = {
+            "catalog_version": self.recommender.catalog_version,
+            "log_offset": self._log_offset,
+            "resume_ids": self._resume_ids,
+            "user_ids": self._user_ids,
+            "skills": self._skills,
+            "active": self._active
+        }
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        # np.savez appends .npz to names without it
+        temp_path = f"{snapshot_path}.{os.getpid()}.tmp.npz"
+        try:
+            # One file replaced once, so readers never pair a matrix with other metadata
+            np.savez(
+                temp_path,
+                data=self._matrix.data,
+                indices=self._matrix.indices,
+                indptr=self._matrix.indptr,
+                shape=np.array(self._matrix.shape),
+                meta=np.frombuffer(json.dumps(meta, separators=(",", ":")).encode("utf-8"), dtype=np.uint8)
+            )
+            os.replace(temp_path, snapshot_path)
+            self._since_snapshot = 0
+        except OSError as e:
+            logger.error(f"Error writing candidate index snapshot: {str(e)}")
+
+    def close(self):
+        """Snapshot the index on shutdown"""
+        with self._lock:
+            if self.recommender is not None and self._since_snapshot:
+                self._save_snapshot()
+
+
+candidate_index = CandidateIndex(
+    settings.CANDIDATE_INDEX_DIR,
+    snapshot_every=settings.CANDIDATE_INDEX_SNAPSHOT_EVERY
+)
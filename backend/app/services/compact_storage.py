@@ -0,0 +1,97 @@
+"""
+Compact persisted formats for resume text and job recommendations
+Resume text is stored zlib-compressed; recommendations are stored as job references
+and rehydrated from the in-memory job catalog on read
+"""
+from typing import List, Dict, Any, Optional
+import base64
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATION_FORMAT = "refs-v1"
+
+
+def compress_text(text: str) -> str:
+    """Compress text to a base64-encoded zlib string"""
+    return base64.b64encode(zlib.compress(text.encode("utf-8"), 6)).decode("ascii")
+
+
+def decompress_text(data: str) -> str:
+    """Decompress text produced by compress_text"""
+    return zlib.decompress(base64.b64decode(data)).decode("utf-8")
+
+
+def pack_recommendations(recommendations: List[Dict[str, Any]], catalog_version: str) -> Dict[str, Any]:
+    """
+    Pack recommendations into job references
+
+    Each entry becomes [job_id, match_score, missing skill positions], where the
+    positions index the job's required_skills in the given catalog version.
+
+    Args:
+        recommendations: Recommendation dicts from JobRecommender
+        catalog_version: Version of the catalog the recommendations were computed from
+
+    Returns:
+        JSON-serialisable compact payload
+    """
+    items = []
+    for rec in recommendations:
+        missing = set(rec["missing_skills"])
+        missing_positions = [
+            position for position, skill in enumerate(rec["required_skills"])
+            if skill in missing
+        ]
+        items.append([rec["job_id"], round(rec["match_score"], 6), missing_positions])
+
+    return {
+        "format": RECOMMENDATION_FORMAT,
+        "catalog_version": catalog_version,
+        "items": items
+    }
+
+
+def is_packed(payload: Any) -> bool:
+    """Check whether a stored payload uses the compact format"""
+    return isinstance(payload, dict) and payload.get("format") == RECOMMENDATION_FORMAT
+
+
+def unpack_recommendations(payload: Any, user_skills: List[str], recommender) -> List[Dict[str, Any]]:
+    """
+    Rehydrate recommendations from a compact payload
+
+    Entries whose job is no longer in the catalog are skipped. If the payload was
+    computed from another catalog version, skill gaps are recomputed from user_skills.
+
+    Args:
+        payload: Output of pack_recommendations, or a legacy list of full dicts
+        user_skills: Skills the recommendations were computed for
+        recommender: JobRecommender holding the current catalog
+
+    Returns:
+        List of recommendation dicts
+    """
+    if not is_packed(payload):
+        # Rows written before the compact format already hold full dicts
+        return payload or []
+
+    same_version = payload.get("catalog_version") == recommender.catalog_version
+
+    recommendations = []
+    for job_id, match_score, missing_positions in payload["items"]:
+        job = recommender.get_job(job_id)
+        if job is None:
+            logger.debug(f"Skipping stored recommendation for unknown job {job_id}")
+            continue
+
+        missing_skills: Optional[List[str]] = None
+        if same_version:
+            missing_skills = [job["required_skills"][position] for position in missing_positions]
+
+        recommendations.append(
+            recommender.build_recommendation(job, match_score, user_skills, missing_skills)
+        )
+
+    return recommendations
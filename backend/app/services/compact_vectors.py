@@ -0,0 +1,123 @@
+"""
+Compact in-memory formats for the job vector matrix
+Vectors are kept as CSR with float64, float32 or int8 values. int8 values are
+quantised per row (value = q * row_scale), which cuts value storage to one byte per
+non-zero; scoring dequantises one block of rows at a time so the transient copy stays
+small.
+"""
+from typing import Optional, Tuple
+import logging
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+VECTOR_DTYPES = ("float64", "float32", "int8")
+
+# Rows dequantised per step when scoring int8 vectors
+SCORE_BLOCK_ROWS = 65536
+
+
+def compact(matrix: sparse.spmatrix, dtype: str) -> Tuple[sparse.csr_matrix, Optional[np.ndarray]]:
+    """
+    Convert a matrix to the compact representation
+
+    Args:
+        matrix: Job vectors (one row per job)
+        dtype: "float64", "float32" or "int8"
+
+    Returns:
+        Tuple of (CSR matrix, per-row scales for int8 or None)
+    """
+    if dtype not in VECTOR_DTYPES:
+        raise ValueError(f"Unknown vector dtype {dtype!r}; expected one of {VECTOR_DTYPES}")
+
+    matrix = sparse.csr_matrix(matrix)
+    matrix.sum_duplicates()
+    # scipy's sparse kernels take int32 or int64 indices; use int32 whenever it fits
+    if matrix.nnz < np.iinfo(np.int32).max and matrix.shape[1] < np.iinfo(np.int32).max:
+        index_dtype = np.int32
+    else:
+        index_dtype = np.int64
+    indices = matrix.indices.astype(index_dtype, copy=False)
+    indptr = matrix.indptr.astype(index_dtype, copy=False)
+
+    if dtype != "int8":
+        data = matrix.data.astype(dtype, copy=False)
+        return sparse.csr_matrix((data, indices, indptr), shape=matrix.shape, copy=False), None
+
+    counts = np.diff(matrix.indptr)
+    scales = np.zeros(matrix.shape[0], dtype=np.float32)
+    non_empty = counts > 0
+    if matrix.nnz:
+        row_max = np.maximum.reduceat(np.abs(matrix.data), matrix.indptr[:-1][non_empty])
+        scales[non_empty] = row_max / 127.0
+    row_scales = np.repeat(scales, counts)
+    safe_scales = np.where(row_scales > 0, row_scales, 1.0)
+    data = np.rint(matrix.data / safe_scales).astype(np.int8)
+    return sparse.csr_matrix((data, indices, indptr), shape=matrix.shape, copy=False), scales
+
+
+def row_view(matrix: sparse.csr_matrix, start: int, end: int) -> sparse.csr_matrix:
+    """CSR view of rows [start, end) that shares data and indices with matrix"""
+    indptr = matrix.indptr[start:end + 1]
+    first, last = int(indptr[0]), int(indptr[-1])
+    return sparse.csr_matrix(
+        (matrix.data[first:last], matrix.indices[first:last], indptr - first),
+        shape=(end - start, matrix.shape[1]),
+        copy=False
+    )
+
+
+def dense_query(query: sparse.spmatrix, dtype) -> np.ndarray:
+    """Dense 1-D copy of a 1 x n_features query vector"""
+    query = sparse.csr_matrix(query)
+    dense = np.zeros(query.shape[1], dtype=dtype)
+    dense[query.indices] = query.data
+    return dense
+
+
+def score(matrix: sparse.csr_matrix, query: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Dot product of every row with a dense query
+
+    Args:
+        matrix: Compact matrix from compact()
+        query: Dense query vector
+        scales: Per-row scales for int8 matrices
+
+    Returns:
+        Scores, one per row
+    """
+    if scales is None:
+        return matrix @ query.astype(matrix.dtype, copy=False)
+
+    query = query.astype(np.float32, copy=False)
+    scores = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], SCORE_BLOCK_ROWS):
+        end = min(start + SCORE_BLOCK_ROWS, matrix.shape[0])
+        block = row_view(matrix, start, end)
+        block = sparse.csr_matrix(
+            (block.data.astype(np.float32), block.indices, block.indptr), shape=block.shape, copy=False
+        )
+        scores[start:end] = block @ query
+    scores *= scales
+    return scores
+
+
+def dequantise_row(matrix: sparse.csr_matrix, scales: Optional[np.ndarray], position: int) -> sparse.csr_matrix:
+    """One row as a float CSR matrix"""
+    row = row_view(matrix, position, position + 1)
+    if scales is None:
+        return row
+    return sparse.csr_matrix(
+        (row.data.astype(np.float32) * scales[position], row.indices, row.indptr), shape=row.shape
+    )
+
+
+def nbytes(matrix: Optional[sparse.spmatrix]) -> int:
+    """Bytes held by a CSR/CSC matrix's arrays"""
+    if matrix is None:
+        return 0
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
@@ -1,54 +1,90 @@
 """
 Database service for Supabase integration
 Handles all database operations for the AI Career Intelligence Platform
+Queries go through the configured storage backend (Supabase or local SQLite)
 """
-from app.core.config import supabase
-from typing import Optional, Dict, Any, List
+from app.core.config import settings
+from app.core.metrics import db_call
+from app.services.storage import get_storage_backend, Keyset, DuplicateRecordError
+from app.services.write_buffer import WriteBehindBuffer
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.compact_storage import compress_text, decompress_text, pack_recommendations
+from typing import Optional, Dict, Any, List, Tuple
+from datetime import datetime, timezone
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
+# Column projections; password hashes and resume text are only read where needed
+USER_COLUMNS = 'user_id, email, full_name, created_at'
+USER_CREDENTIAL_COLUMNS = 'user_id, email, password_hash'
+RESUME_HISTORY_COLUMNS = 'resume_id, filename, extracted_skills, uploaded_at'
+RESUME_DETAIL_COLUMNS = 'resume_id, filename, extracted_text, extracted_text_compressed, extracted_skills, uploaded_at'
+RECOMMENDATION_DETAIL_COLUMNS = 'recommendation_id, user_skills, recommendations, created_at'
+RECOMMENDATION_HISTORY_COLUMNS = 'recommendation_id, user_skills, created_at'
+
+# Tables written with upserts, mapped to their conflict key
+UPSERT_KEYS = {
+    'recommendation_cache': 'cache_key',
+    # Logins by the same user within one second are issued identical tokens
+    'user_sessions': 'token_hash'
+}
+
 
 class DatabaseService:
     """Database service for user management and data persistence"""
 
     @staticmethod
+    @db_call
     def create_user(email: str, password_hash: str, full_name: str) -> Optional[Dict[str, Any]]:
-        """Create a new user in database"""
-        if not supabase:
-            logger.error("Supabase client not available")
+        """
+        Create a new user in database
+
+        Relies on the unique email constraint instead of a separate existence check.
+
+        Raises:
+            DuplicateRecordError: If the email is already registered
+        """
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
             return None
 
         try:
-            result = supabase.table('users').insert({
+            rows = backend.insert('users', [{
                 'email': email,
                 'password_hash': password_hash,
                 'full_name': full_name
-            }).execute()
+            }])
 
-            if result.data and len(result.data) > 0:
+            if rows:
                 logger.info(f"User created successfully: {email}")
-                return result.data[0]
+                return rows[0]
             else:
                 logger.error(f"Failed to create user: {email}")
                 return None
 
+        except DuplicateRecordError:
+            raise
         except Exception as e:
             logger.error(f"Error creating user {email}: {str(e)}")
             return None
 
     @staticmethod
+    @db_call
     def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
-        """Get user by email"""
-        if not supabase:
-            logger.error("Supabase client not available")
+        """Get user by email (without password hash)"""
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
             return None
 
         try:
-            result = supabase.table('users').select('*').eq('email', email).execute()
+            rows = backend.select('users', USER_COLUMNS, {'email': email}, limit=1)
 
-            if result.data and len(result.data) > 0:
-                return result.data[0]
+            if rows:
+                return rows[0]
             else:
                 return None
 
@@ -57,13 +93,40 @@ class DatabaseService:
             return None
 
     @staticmethod
+    @db_call
+    def get_user_credentials(email: str) -> Optional[Dict[str, Any]]:
+        """Get user ID and password hash by email, for login"""
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return None
+
+        try:
+            rows = backend.select('users', USER_CREDENTIAL_COLUMNS, {'email': email}, limit=1)
+
+            if rows:
+                return rows[0]
+            else:
+                return None
+
+        except Exception as e:
+            logger.error(f"Error getting credentials for {email}: {str(e)}")
+            return None
+
+    @staticmethod
+    @db_call
     async def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return None
+
         try:
-            result = supabase.table('users').select('*').eq('user_id', user_id).execute()
+            rows = backend.select('users', USER_COLUMNS, {'user_id': user_id}, limit=1)
 
-            if result.data and len(result.data) > 0:
-                return result.data[0]
+            if rows:
+                return rows[0]
             else:
                 return None
 
@@ -72,12 +135,12 @@ class DatabaseService:
             return None
 
     @staticmethod
+    @db_call
     def save_resume(user_id: str, filename: str, extracted_text: str, extracted_skills: List[str]) -> bool:
         """Save resume data to database"""
-        logger.info(f"Attempting to save resume for user_id: {user_id}, filename: {filename}")
-
-        if not supabase:
-            logger.error("Supabase client not available")
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
             return False
 
         try:
@@ -85,53 +148,141 @@ class DatabaseService:
             resume_data = {
                 'user_id': user_id,
                 'filename': filename,
-                'extracted_text': extracted_text,
+                'extracted_text_compressed': compress_text(extracted_text),
                 'extracted_skills': extracted_skills
             }
 
-            logger.info(f"Inserting resume data: user_id={user_id}, filename={filename}")
-
-            result = supabase.table('resumes').insert(resume_data).execute()
+            rows = backend.insert('resumes', [resume_data])
 
-            if result.data and len(result.data) > 0:
-                logger.info(f"Resume saved successfully for user {user_id}: {result.data[0]}")
+            if rows:
+                logger.debug(f"Resume saved for user {user_id}")
                 return True
             else:
                 logger.error(f"Failed to save resume for user {user_id}: No data returned")
                 return False
 
         except Exception as e:
-            logger.error(f"Error saving resume for user {user_id}: {str(e)}")
-            logger.error(f"Error type: {type(e)}")
+            logger.error(f"Error saving resume for user {user_id}: {type(e).__name__}: {str(e)}")
             return False
 
     @staticmethod
-    async def get_user_resumes(user_id: str) -> List[Dict[str, Any]]:
-        """Get all resumes for a user"""
+    def _keyset_page(backend, table: str, columns: str, user_id: str, time_column: str, id_column: str,
+                     limit: int, cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Fetch one page of a user's rows, newest first, using keyset pagination
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        keyset = None
+        if cursor:
+            last_time, last_id = decode_cursor(cursor, 2)
+            try:
+                # Both values end up inside a filter expression, so only accept well-formed ones
+                last_time = datetime.fromisoformat(str(last_time)).isoformat()
+                last_id = str(uuid.UUID(str(last_id)))
+            except ValueError:
+                raise ValueError("Invalid pagination cursor")
+            # (time, id) < (last_time, last_id), served by the (user_id, time DESC, id DESC) index
+            keyset = Keyset(time_column, id_column, last_time, last_id)
+
+        # Fetch one extra row to know whether another page exists
+        rows = backend.select(
+            table, columns, {'user_id': user_id},
+            order=[(time_column, True), (id_column, True)],
+            limit=limit + 1,
+            keyset=keyset
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][time_column], rows[-1][id_column])
+
+        return rows, next_cursor
+
+    @staticmethod
+    @db_call
+    def get_user_resumes(user_id: str, limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of a user's resume history (without resume text)
+
+        Returns:
+            Tuple of (resume rows, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return [], None
+
+        try:
+            return DatabaseService._keyset_page(
+                backend, 'resumes', RESUME_HISTORY_COLUMNS, user_id,
+                'uploaded_at', 'resume_id', limit, cursor
+            )
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting resumes for user {user_id}: {str(e)}")
+            return [], None
+
+    @staticmethod
+    @db_call
+    def get_resume(user_id: str, resume_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single resume of a user, with its text decompressed"""
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return None
+
         try:
-            result = supabase.table('resumes').select('*').eq('user_id', user_id).order('uploaded_at', desc=True).execute()
+            rows = backend.select('resumes', RESUME_DETAIL_COLUMNS, {'user_id': user_id, 'resume_id': resume_id}, limit=1)
 
-            if result.data:
-                return result.data
+            if rows:
+                resume = rows[0]
             else:
-                return []
+                # Uploads are inserted by the write-behind buffer; serve one not flushed yet
+                resume = write_buffer.find(
+                    'resumes',
+                    lambda row: row.get('resume_id') == resume_id and str(row.get('user_id')) == str(user_id)
+                )
+                if resume is None:
+                    return None
+                resume.pop('user_id', None)
+                # Set by the database on insert; the upload was at most a flush interval ago
+                resume['uploaded_at'] = datetime.now(timezone.utc)
+
+            compressed = resume.pop('extracted_text_compressed', None)
+            if compressed:
+                resume['extracted_text'] = decompress_text(compressed)
+            return resume
 
         except Exception as e:
-            logger.error(f"Error getting resumes for user {user_id}: {str(e)}")
-            return []
+            logger.error(f"Error getting resume {resume_id} for user {user_id}: {str(e)}")
+            return None
 
     @staticmethod
-    def save_job_recommendation(user_id: str, user_skills: List[str], recommendations: List[Dict[str, Any]]) -> bool:
+    @db_call
+    def save_job_recommendation(user_id: str, user_skills: List[str], recommendations: List[Dict[str, Any]], catalog_version: str) -> bool:
         """Save job recommendations for caching"""
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return False
+
         try:
-            result = supabase.table('job_recommendations').insert({
+            rows = backend.insert('job_recommendations', [{
                 'user_id': user_id,
                 'user_skills': user_skills,
-                'recommendations': recommendations
-            }).execute()
+                'recommendations': pack_recommendations(recommendations, catalog_version)
+            }])
 
-            if result.data and len(result.data) > 0:
-                logger.info(f"Job recommendations saved for user {user_id}")
+            if rows:
+                logger.debug(f"Job recommendations saved for user {user_id}")
                 return True
             else:
                 return False
@@ -141,27 +292,71 @@ class DatabaseService:
             return False
 
     @staticmethod
-    async def get_user_recommendations(user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent job recommendations for a user"""
+    @db_call
+    def get_user_recommendations(user_id: str, limit: int = 10, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get one page of a user's recommendation history (without stored payloads)
+
+        Returns:
+            Tuple of (recommendation rows, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return [], None
+
+        try:
+            return DatabaseService._keyset_page(
+                backend, 'job_recommendations', RECOMMENDATION_HISTORY_COLUMNS, user_id,
+                'created_at', 'recommendation_id', limit, cursor
+            )
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error getting recommendations for user {user_id}: {str(e)}")
+            return [], None
+
+    @staticmethod
+    @db_call
+    def get_recommendation(user_id: str, recommendation_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single stored recommendation of a user, with its packed payload"""
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return None
+
         try:
-            result = supabase.table('job_recommendations').select('*').eq('user_id', user_id).order('created_at', desc=True).limit(limit).execute()
+            rows = backend.select(
+                'job_recommendations', RECOMMENDATION_DETAIL_COLUMNS,
+                {'user_id': user_id, 'recommendation_id': recommendation_id}, limit=1
+            )
 
-            if result.data:
-                return result.data
+            if rows:
+                return rows[0]
             else:
-                return []
+                return None
 
         except Exception as e:
-            logger.error(f"Error getting recommendations for user {user_id}: {str(e)}")
-            return []
+            logger.error(f"Error getting recommendation {recommendation_id} for user {user_id}: {str(e)}")
+            return None
 
     @staticmethod
+    @db_call
     async def update_user_profile(user_id: str, updates: Dict[str, Any]) -> bool:
         """Update user profile information"""
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return False
+
         try:
-            result = supabase.table('users').update(updates).eq('user_id', user_id).execute()
+            rows = backend.update('users', updates, {'user_id': user_id})
 
-            if result.data and len(result.data) > 0:
+            if rows:
                 logger.info(f"User profile updated: {user_id}")
                 return True
             else:
@@ -172,24 +367,26 @@ class DatabaseService:
             return False
 
     @staticmethod
+    @db_call
     def create_session(user_id: str, token_hash: str, expires_at) -> Optional[str]:
         """Create a new user session"""
-        if not supabase:
-            logger.error("Supabase client not available")
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
             return None
 
         try:
             expires_at_str = expires_at.isoformat() if hasattr(expires_at, 'isoformat') else str(expires_at)
 
-            result = supabase.table('user_sessions').insert({
+            rows = backend.insert('user_sessions', [{
                 'user_id': user_id,
                 'token_hash': token_hash,
                 'expires_at': expires_at_str
-            }).execute()
+            }])
 
-            if result.data and len(result.data) > 0:
-                session_id = result.data[0]['session_id']
-                logger.info(f"Session created for user {user_id}: {session_id}")
+            if rows:
+                session_id = rows[0]['session_id']
+                logger.debug(f"Session created for user {user_id}: {session_id}")
                 return session_id
             else:
                 logger.error(f"Failed to create session for user {user_id}")
@@ -200,14 +397,159 @@ class DatabaseService:
             return None
 
     @staticmethod
+    @db_call
+    def insert_rows(table: str, rows: List[Dict[str, Any]]) -> bool:
+        """Insert several rows into a table with a single multi-row insert"""
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return False
+
+        try:
+            conflict_key = UPSERT_KEYS.get(table)
+            if conflict_key:
+                # A single statement cannot upsert the same key twice; keep the latest row
+                rows = list({row[conflict_key]: row for row in rows}.values())
+                written = backend.upsert(table, rows, on_conflict=conflict_key)
+            else:
+                written = backend.insert(table, rows)
+
+            if len(written) == len(rows):
+                logger.debug(f"Inserted {len(rows)} rows into {table}")
+                return True
+            else:
+                logger.error(f"Failed to insert {len(rows)} rows into {table}")
+                return False
+
+        except Exception as e:
+            logger.error(f"Error inserting {len(rows)} rows into {table}: {str(e)}")
+            return False
+
+    @staticmethod
+    def _write_behind(table: str, row: Dict[str, Any]) -> bool:
+        """Queue a row on the write-behind buffer, or insert it directly when the buffer is disabled"""
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return False
+
+        if settings.WRITE_BUFFER_ENABLED:
+            return write_buffer.submit(table, row)
+
+        if not DatabaseService.insert_rows(table, [row]):
+            return False
+        write_buffer.notify_written(table, [row])
+        return True
+
+    @staticmethod
+    @db_call
+    def queue_session(user_id: str, token_hash: str, expires_at) -> bool:
+        """Queue a new user session for a batched insert"""
+        expires_at_str = expires_at.isoformat() if hasattr(expires_at, 'isoformat') else str(expires_at)
+
+        return DatabaseService._write_behind('user_sessions', {
+            'user_id': user_id,
+            'token_hash': token_hash,
+            'expires_at': expires_at_str
+        })
+
+    @staticmethod
+    @db_call
+    def queue_resume(resume_id: str, user_id: str, filename: str, extracted_text: str, extracted_skills: List[str]) -> bool:
+        """Queue resume data for a batched insert"""
+        return DatabaseService._write_behind(
+            'resumes',
+            DatabaseService.resume_row(resume_id, user_id, filename, extracted_text, extracted_skills)
+        )
+
+    @staticmethod
+    def resume_row(resume_id: str, user_id: str, filename: str, extracted_text: str, extracted_skills: List[str]) -> Dict[str, Any]:
+        """Row written to the resumes table, for queue_resume and bulk inserts through insert_rows"""
+        return {
+            'resume_id': resume_id,
+            'user_id': user_id,
+            'filename': filename,
+            'extracted_text_compressed': compress_text(extracted_text),
+            'extracted_skills': extracted_skills
+        }
+
+    @staticmethod
+    @db_call
+    def queue_job_recommendation(user_id: str, user_skills: List[str], recommendations: List[Dict[str, Any]], catalog_version: str) -> bool:
+        """Queue job recommendations for a batched insert"""
+        return DatabaseService._write_behind('job_recommendations', {
+            'user_id': user_id,
+            'user_skills': user_skills,
+            'recommendations': pack_recommendations(recommendations, catalog_version)
+        })
+
+    @staticmethod
+    @db_call
+    def get_cached_recommendations(cache_key: str, catalog_version: str) -> Optional[Dict[str, Any]]:
+        """Get packed cached recommendations computed from the given catalog version"""
+        backend = get_storage_backend()
+        if not backend:
+            return None
+
+        try:
+            rows = backend.select(
+                'recommendation_cache', 'recommendations',
+                {'cache_key': cache_key, 'catalog_version': catalog_version}, limit=1
+            )
+
+            if rows:
+                return rows[0]['recommendations']
+            else:
+                return None
+
+        except Exception as e:
+            logger.error(f"Error getting cached recommendations {cache_key}: {str(e)}")
+            return None
+
+    @staticmethod
+    @db_call
+    def queue_cached_recommendations(
+        cache_key: str, catalog_version: str, recommendations: List[Dict[str, Any]], total: int
+    ) -> bool:
+        """Queue cached recommendations, with the length of the ranking they were cut from, for a batched upsert"""
+        return DatabaseService._write_behind('recommendation_cache', {
+            'cache_key': cache_key,
+            'catalog_version': catalog_version,
+            'recommendations': {**pack_recommendations(recommendations, catalog_version), 'total': total}
+        })
+
+    @staticmethod
+    @db_call
+    def purge_cached_recommendations(keep_version: str) -> bool:
+        """Delete cached recommendations computed from any other catalog version"""
+        backend = get_storage_backend()
+        if not backend:
+            return False
+
+        try:
+            backend.delete('recommendation_cache', {}, exclude={'catalog_version': keep_version})
+            logger.info(f"Purged cached recommendations not matching catalog version {keep_version}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error purging cached recommendations: {str(e)}")
+            return False
+
+    @staticmethod
+    @db_call
     async def delete_user_data(user_id: str) -> bool:
         """Delete all user data (GDPR compliance)"""
+        backend = get_storage_backend()
+        if not backend:
+            logger.error("Storage backend not available")
+            return False
+
+        # Pending buffered rows would violate foreign keys once the user is gone
+        write_buffer.discard(lambda table, row: row.get('user_id') == user_id)
+
         try:
-            # Delete in correct order due to foreign keys
-            supabase.table('job_recommendations').delete().eq('user_id', user_id).execute()
-            supabase.table('resumes').delete().eq('user_id', user_id).execute()
-            supabase.table('user_sessions').delete().eq('user_id', user_id).execute()
-            supabase.table('users').delete().eq('user_id', user_id).execute()
+            # One atomic statement; resumes, recommendations and sessions go through ON DELETE CASCADE
+            backend.delete('users', {'user_id': user_id})
 
             logger.info(f"All data deleted for user: {user_id}")
             return True
@@ -215,3 +557,14 @@ class DatabaseService:
         except Exception as e:
             logger.error(f"Error deleting user data {user_id}: {str(e)}")
             return False
+
+
+# Shared write-behind buffer; the flush thread starts on first use so it is fork-safe
+write_buffer = WriteBehindBuffer(
+    flush_fn=DatabaseService.insert_rows,
+    batch_size=settings.WRITE_BUFFER_BATCH_SIZE,
+    flush_interval=settings.WRITE_BUFFER_FLUSH_INTERVAL,
+    max_pending=settings.WRITE_BUFFER_MAX_PENDING,
+    max_retries=settings.WRITE_BUFFER_MAX_RETRIES,
+    retry_backoff=settings.WRITE_BUFFER_RETRY_BACKOFF
+)
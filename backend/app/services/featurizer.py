@@ -0,0 +1,94 @@
+"""
+Stateless hashing featurizer with streaming IDF
+Terms are hashed into a fixed number of columns instead of being looked up in a fitted
+vocabulary, so every term of a large catalog is kept and any process can vectorise text.
+The only fitted state is the IDF weight array, built from document frequencies that
+can be accumulated chunk by chunk and merged across independently built shards.
+"""
+from typing import Iterable, List
+import logging
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+logger = logging.getLogger(__name__)
+
+
+class HashingFeaturizer:
+    """TF-IDF over hashed terms; a drop-in for TfidfVectorizer.transform"""
+
+    def __init__(self, n_features: int = 2 ** 18, dtype=np.float64):
+        """
+        Initialize hashing featurizer
+
+        Args:
+            n_features: Number of hashed columns
+            dtype: Output value type
+        """
+        self.n_features = n_features
+        self.dtype = dtype
+        # Same tokenisation as the TF-IDF vectorizer of JobRecommender
+        self._hasher = HashingVectorizer(
+            n_features=n_features,
+            lowercase=True,
+            stop_words='english',
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm=None,
+            dtype=dtype
+        )
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self._idf = None
+
+    def partial_fit(self, texts: Iterable[str]) -> "HashingFeaturizer":
+        """Add a chunk of documents to the document frequencies"""
+        counts = self._hasher.transform(texts)
+        self.document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += counts.shape[0]
+        self._idf = None
+        return self
+
+    def merge(self, other: "HashingFeaturizer") -> "HashingFeaturizer":
+        """Add the document frequencies of a featurizer fitted on another shard"""
+        if other.n_features != self.n_features:
+            raise ValueError("Cannot merge featurizers with different n_features")
+        self.document_frequency += other.document_frequency
+        self.n_documents += other.n_documents
+        self._idf = None
+        return self
+
+    @property
+    def idf(self) -> np.ndarray:
+        """Smoothed IDF weights, as computed by TfidfVectorizer"""
+        if self._idf is None:
+            idf = np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1
+            # Terms no document contains are dropped, like out-of-vocabulary terms
+            idf[self.document_frequency == 0] = 0
+            self._idf = idf.astype(self.dtype)
+        return self._idf
+
+    def transform(self, texts: List[str]) -> sparse.csr_matrix:
+        """
+        Vectorise texts
+
+        Returns:
+            L2-normalised TF-IDF matrix, one row per text
+        """
+        counts = self._hasher.transform(texts)
+        counts.data *= self.idf[counts.indices]
+        counts.eliminate_zeros()
+        return normalize(counts, norm="l2", copy=False)
+
+    def fit_transform(self, texts: List[str], chunk_size: int = 50000) -> sparse.csr_matrix:
+        """Fit document frequencies, then vectorise, in chunks of chunk_size texts"""
+        if not texts:
+            return sparse.csr_matrix((0, self.n_features), dtype=self.dtype)
+        for start in range(0, len(texts), chunk_size):
+            self.partial_fit(texts[start:start + chunk_size])
+        return sparse.vstack(
+            [self.transform(texts[start:start + chunk_size]) for start in range(0, len(texts), chunk_size)],
+            format="csr"
+        )
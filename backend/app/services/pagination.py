@@ -0,0 +1,46 @@
+"""
+Opaque cursor helpers for keyset pagination
+"""
+from typing import Any, List
+import base64
+import json
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last returned row as an opaque cursor
+
+    Args:
+        *values: Sort key values, e.g. (uploaded_at, resume_id)
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string from a previous page
+        size: Expected number of sort key values
+
+    Returns:
+        List of sort key values
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid pagination cursor")
+
+    return values
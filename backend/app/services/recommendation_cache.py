@@ -0,0 +1,202 @@
+"""
+Read-through cache for job recommendations
+In-process LRU tier backed by a shared persistent tier in the database, plus a
+short-lived cache of ranked snapshots that paginated requests read pages from
+"""
+from collections import OrderedDict
+from typing import List, Dict, Optional, Any, Tuple
+import hashlib
+import json
+import threading
+import time
+import logging
+
+import numpy as np
+
+from app.core.metrics import CACHE_LOOKUPS
+from app.services.database import DatabaseService
+from app.services.compact_storage import unpack_recommendations
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationCache:
+    """Two-tier cache of recommendation results keyed by normalised skill set"""
+
+    def __init__(self, max_entries: int = 1024, persistent: bool = True):
+        """
+        Initialize recommendation cache
+
+        Args:
+            max_entries: Maximum number of results held in the in-process LRU tier
+            persistent: Whether to read and write the shared database tier
+        """
+        self.max_entries = max_entries
+        self.persistent = persistent
+        self.recommender = None
+        self.catalog_version = None
+
+        # key -> (recommendations, length of the ranking they were cut from)
+        self._entries: "OrderedDict[str, Tuple[List[Dict[str, Any]], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_skills(user_skills: List[str]) -> List[str]:
+        """Normalise a skill list to its sorted, lowercased, de-duplicated form"""
+        return sorted({s.strip().lower() for s in user_skills if s and s.strip()})
+
+    @staticmethod
+    def make_key(normalized_skills: List[str], top_n: int, catalog_version: str, **params) -> str:
+        """
+        Build a cache key
+
+        Args:
+            normalized_skills: Output of normalize_skills
+            top_n: Number of requested recommendations
+            catalog_version: Version of the job catalog the result was computed from
+            **params: Any other parameters that change the result
+
+        Returns:
+            Hex digest identifying the result
+        """
+        payload = json.dumps(
+            [catalog_version, top_n, normalized_skills, sorted(params.items())],
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def set_catalog(self, recommender):
+        """
+        Bind the cache to a job catalog, invalidating both tiers when its version changes
+
+        Args:
+            recommender: JobRecommender used to rehydrate persisted results
+        """
+        self.recommender = recommender
+        catalog_version = recommender.catalog_version
+        if catalog_version == self.catalog_version:
+            return
+
+        with self._lock:
+            self._entries.clear()
+        previous = self.catalog_version
+        self.catalog_version = catalog_version
+
+        if self.persistent:
+            DatabaseService.purge_cached_recommendations(keep_version=catalog_version)
+
+        logger.info(f"Recommendation cache invalidated: catalog {previous} -> {catalog_version}")
+
+    def get(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Look up a result in the LRU tier, then the persistent tier
+
+        Returns:
+            Tuple of (recommendations, total ranked results), or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                CACHE_LOOKUPS.labels("memory_hit").inc()
+                return entry
+
+        if self.persistent and self.recommender is not None:
+            payload = DatabaseService.get_cached_recommendations(key, self.catalog_version)
+            # Entries persisted without a total cannot answer has_more and are recomputed
+            if isinstance(payload, dict) and payload.get("total") is not None:
+                # Callers replace user_skills with the requested skills
+                entry = (unpack_recommendations(payload, [], self.recommender), payload["total"])
+                self._remember(key, *entry)
+                self.persistent_hits += 1
+                CACHE_LOOKUPS.labels("persistent_hit").inc()
+                return entry
+
+        self.misses += 1
+        CACHE_LOOKUPS.labels("miss").inc()
+        return None
+
+    def set(self, key: str, recommendations: List[Dict[str, Any]], total: int):
+        """
+        Store a result in both tiers
+
+        Args:
+            key: Cache key from make_key
+            recommendations: Recommendation dicts
+            total: Length of the ranking the recommendations were cut from
+        """
+        self._remember(key, recommendations, total)
+
+        if self.persistent:
+            DatabaseService.queue_cached_recommendations(key, self.catalog_version, recommendations, total)
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters"""
+        return {
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses
+        }
+
+    def _remember(self, key: str, recommendations: List[Dict[str, Any]], total: int):
+        """Insert into the LRU tier, evicting the least recently used entry"""
+        with self._lock:
+            self._entries[key] = (recommendations, total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class RankingSnapshotCache:
+    """In-process LRU of ranked (positions, scores) arrays that expire after a TTL"""
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024):
+        """
+        Initialize ranking snapshot cache
+
+        Args:
+            ttl: Seconds a snapshot is served after it was ranked
+            max_entries: Maximum number of snapshots held
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Get an unexpired snapshot"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                CACHE_LOOKUPS.labels("snapshot_miss").inc()
+                return None
+            created, positions, scores = entry
+            if time.monotonic() - created > self.ttl:
+                del self._entries[key]
+                CACHE_LOOKUPS.labels("snapshot_miss").inc()
+                return None
+            self._entries.move_to_end(key)
+        CACHE_LOOKUPS.labels("snapshot_hit").inc()
+        return positions, scores
+
+    def set(self, key: str, positions: np.ndarray, scores: np.ndarray):
+        """Store a snapshot"""
+        entry = (time.monotonic(), positions.astype(np.int32), scores)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every snapshot"""
+        with self._lock:
+            self._entries.clear()
@@ -4,31 +4,79 @@ Recommends jobs based on user skills extracted from resume
 """
 import pandas as pd
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict
+from sklearn.preprocessing import normalize
+from typing import List, Dict, Optional, Tuple
+import hashlib
 import logging
 import os
 
+from app.core.metrics import time_stage
+from app.services import compact_vectors
+from app.services.featurizer import HashingFeaturizer
+
 logger = logging.getLogger(__name__)
 
+# Optional categorical catalog columns that recommendations can be filtered on
+FILTER_COLUMNS = ("location", "seniority", "remote", "salary_band")
+
+# Skills whose co-occurrence row is computed per sparse product when building related skills
+SKILL_NEIGHBOUR_BLOCK = 1024
+
 
 class JobRecommender:
     """Service for recommending jobs based on user skills"""
     
-    def __init__(self, dataset_path: str = "dataset/jobs.csv"):
+    def __init__(
+        self,
+        dataset_path: str = "dataset/jobs.csv",
+        vector_dtype: str = "float64",
+        featurizer: str = "tfidf",
+        hashing_features: int = 2 ** 18,
+        neighbours_per_skill: int = 20,
+        min_cooccurrence: int = 2
+    ):
         """
         Initialize job recommender with dataset
         
         Args:
             dataset_path: Path to jobs CSV file
+            vector_dtype: Job vector value type: "float64", "float32" or "int8" (quantised per row)
+            featurizer: "tfidf" (fitted vocabulary of 1000 terms) or "hashing" (hashed terms, no vocabulary)
+            hashing_features: Number of hashed columns for the hashing featurizer
+            neighbours_per_skill: Related skills kept per skill (see _build_skill_neighbours)
+            min_cooccurrence: Jobs two skills must share to be related
         """
+        if featurizer not in ("tfidf", "hashing"):
+            raise ValueError(f"Unknown featurizer {featurizer!r}; expected 'tfidf' or 'hashing'")
         self.dataset_path = dataset_path
+        self.vector_dtype = vector_dtype
+        self.featurizer = featurizer
+        self.hashing_features = hashing_features
+        self.neighbours_per_skill = neighbours_per_skill
+        self.min_cooccurrence = min_cooccurrence
+        self.catalog_version = None
         self.jobs_df = None
+        self._job_positions = {}
         self.vectorizer = None
         self.job_vectors = None
+        self._row_scales = None
+        self.skill_vocabulary = []
+        self._skill_index = {}
+        self.skill_matrix = None
+        self._skill_counts = None
+        self._skill_job_counts = None
+        self.skill_neighbours = None
+        self._skill_cooccurrence = None
+        self._skill_vectors = None
+        self.scorer = None
+        self._filter_indexes = {}
         self._load_dataset()
         self._initialize_vectorizer()
+        self._build_skill_matrix()
+        self._build_skill_neighbours()
+        self._build_filter_indexes()
     
     def _load_dataset(self):
         """Load jobs dataset from CSV"""
@@ -53,6 +101,7 @@ class JobRecommender:
                 abs_path = os.path.abspath(path)
                 if os.path.exists(abs_path):
                     self.jobs_df = pd.read_csv(abs_path)
+                    self.catalog_version = self._compute_catalog_version(abs_path, self._vector_space())
                     dataset_found = True
                     logger.info(f"Loaded dataset from: {abs_path}")
                     break
@@ -69,46 +118,371 @@ class JobRecommender:
             if missing_cols:
                 raise ValueError(f"Missing required columns: {missing_cols}")
             
-            logger.info(f"Loaded {len(self.jobs_df)} jobs from dataset")
+            # Row position by job ID, for constant-time lookups
+            self._job_positions = {
+                str(job_id): position
+                for position, job_id in enumerate(self.jobs_df["job_id"])
+            }
+            
+            logger.info(f"Loaded {len(self.jobs_df)} jobs from dataset (version {self.catalog_version})")
             
         except Exception as e:
             logger.error(f"Error loading dataset: {str(e)}")
             raise
+
+    def _vector_space(self) -> str:
+        """Identify vector settings that change scores; empty for the default TF-IDF space"""
+        if self.featurizer == "hashing":
+            return f"hashing:{self.hashing_features}"
+        return ""
+
+    @staticmethod
+    def _compute_catalog_version(path: str, vector_space: str = "") -> str:
+        """Compute a content hash of the dataset file, used to invalidate cached results"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        # Results from another vector space are not comparable, so they get another version
+        if vector_space:
+            digest.update(vector_space.encode())
+        return digest.hexdigest()[:16]
     
     def _initialize_vectorizer(self):
         """Initialize TF-IDF vectorizer and create job vectors"""
         try:
-            # Combine job title and skills for better matching
-            self.jobs_df["combined_text"] = (
+            # Combine job title and skills for better matching (not kept after fitting)
+            combined_text = (
                 self.jobs_df["job_title"].astype(str) + " " + 
                 self.jobs_df["skills"].astype(str)
             )
             
-            # Initialize TF-IDF vectorizer
-            self.vectorizer = TfidfVectorizer(
-                lowercase=True,
-                stop_words='english',
-                ngram_range=(1, 2),  # Unigrams and bigrams
-                min_df=1,
-                max_features=1000
-            )
+            value_dtype = np.float64 if self.vector_dtype == "float64" else np.float32
+            if self.featurizer == "hashing":
+                self.vectorizer = HashingFeaturizer(n_features=self.hashing_features, dtype=value_dtype)
+            else:
+                # Initialize TF-IDF vectorizer
+                self.vectorizer = TfidfVectorizer(
+                    lowercase=True,
+                    stop_words='english',
+                    ngram_range=(1, 2),  # Unigrams and bigrams
+                    min_df=1,
+                    max_features=1000,
+                    dtype=value_dtype
+                )
             
             # Fit and transform job descriptions
-            self.job_vectors = self.vectorizer.fit_transform(
-                self.jobs_df["combined_text"].tolist()
-            )
+            job_vectors = self.vectorizer.fit_transform(combined_text.tolist())
+            del combined_text
+            self.job_vectors, self._row_scales = compact_vectors.compact(job_vectors, self.vector_dtype)
             
-            logger.info("TF-IDF vectorizer initialized successfully")
+            logger.info(f"{self.featurizer} vectorizer initialized successfully ({self.vector_dtype} vectors)")
             
         except Exception as e:
             logger.error(f"Error initializing vectorizer: {str(e)}")
             raise
     
+    def _build_skill_matrix(self):
+        """Build the binary job x skill matrix used for catalog-wide skill gap queries"""
+        indptr = [0]
+        indices = []
+        for skills_str in self.jobs_df["skills"]:
+            for skill in dict.fromkeys(self.parse_skills(skills_str)):
+                indices.append(self._skill_index.setdefault(skill, len(self._skill_index)))
+            indptr.append(len(indices))
+
+        self.skill_vocabulary = list(self._skill_index)
+        self.skill_matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(self.jobs_df), len(self.skill_vocabulary))
+        )
+        self._skill_counts = np.diff(self.skill_matrix.indptr).astype(np.float32)
+        self._skill_job_counts = np.bincount(self.skill_matrix.indices, minlength=len(self.skill_vocabulary))
+        logger.info(f"Skill matrix built with {len(self.skill_vocabulary)} distinct skills")
+
+    def _build_skill_neighbours(self):
+        """
+        Precompute the most related skills of every skill from catalog co-occurrence
+
+        Skills are related by normalised PMI over the jobs listing them,
+        log(p(a, b) / (p(a) p(b))) / -log p(a, b), which is 1 for skills that always appear
+        together and 0 for independent ones. Only positive scores of pairs sharing at least
+        min_cooccurrence jobs are kept, the best neighbours_per_skill per skill, in a skill x skill
+        CSR matrix whose rows are sorted best first; a lookup is one row read.
+        """
+        n_jobs, n_skills = self.skill_matrix.shape
+        by_skill = self.skill_matrix.T.tocsr()
+        job_counts = self._skill_job_counts.astype(np.float64)
+
+        rows, columns, scores, shared = [], [], [], []
+        for start in range(0, n_skills, SKILL_NEIGHBOUR_BLOCK):
+            end = min(start + SKILL_NEIGHBOUR_BLOCK, n_skills)
+            # Jobs shared by each skill of the block with every skill
+            block = (by_skill[start:end] @ self.skill_matrix).tocoo()
+            row = block.row.astype(np.int64) + start
+            keep = (block.data >= self.min_cooccurrence) & (row != block.col)
+            row, column, count = row[keep], block.col[keep], block.data[keep].astype(np.float64)
+
+            joint = count / n_jobs
+            pmi = np.log(joint * n_jobs * n_jobs / (job_counts[row] * job_counts[column]))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                # Pairs present in every job are perfectly related
+                npmi = np.where(joint < 1.0, pmi / -np.log(joint), 1.0)
+            keep = npmi > 0
+            rows.append(row[keep])
+            columns.append(column[keep])
+            scores.append(npmi[keep])
+            shared.append(count[keep])
+
+        row = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        column = np.concatenate(columns) if columns else np.empty(0, dtype=np.int32)
+        score = np.concatenate(scores) if scores else np.empty(0)
+        count = np.concatenate(shared) if shared else np.empty(0)
+
+        # Best first within each row, then keep the first neighbours_per_skill of every row
+        order = np.lexsort((column, -score, row))
+        row, column, score, count = row[order], column[order], score[order], count[order]
+        row_starts = np.searchsorted(row, row, side="left")
+        keep = np.arange(len(row)) - row_starts < self.neighbours_per_skill
+        row, column, score, count = row[keep], column[keep], score[keep], count[keep]
+
+        indptr = np.zeros(n_skills + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row, minlength=n_skills), out=indptr[1:])
+        self.skill_neighbours = sparse.csr_matrix(
+            (score.astype(np.float32), column.astype(np.int32), indptr),
+            shape=(n_skills, n_skills)
+        )
+        self._skill_cooccurrence = count.astype(np.int32)
+        # Vectors of the skills themselves, for query expansion
+        self._skill_vectors = sparse.csr_matrix(self.vectorizer.transform(self.skill_vocabulary))
+        logger.info(f"Related skills built with {self.skill_neighbours.nnz} skill pairs")
+
+    def related_skills(self, skill: str, top_n: int = 10) -> Optional[Dict]:
+        """
+        Skills most often required together with a skill
+
+        Args:
+            skill: Skill name (case-insensitive)
+            top_n: Maximum number of related skills
+
+        Returns:
+            The skill, its job count and its related skills, best first, with their
+            normalised PMI score, number of shared jobs and job count; None if no job
+            requires the skill
+        """
+        skill = skill.strip().lower()
+        column = self._skill_index.get(skill)
+        if column is None:
+            return None
+        start = self.skill_neighbours.indptr[column]
+        end = min(self.skill_neighbours.indptr[column + 1], start + top_n)
+        related = [
+            {
+                "skill": self.skill_vocabulary[other],
+                "score": round(float(score), 4),
+                "co_occurrences": int(count),
+                "job_count": int(self._skill_job_counts[other])
+            }
+            for other, score, count in zip(
+                self.skill_neighbours.indices[start:end],
+                self.skill_neighbours.data[start:end],
+                self._skill_cooccurrence[start:end]
+            )
+        ]
+        return {"skill": skill, "job_count": int(self._skill_job_counts[column]), "related": related}
+
+    def expand_skills(self, user_skills: List[str], limit: int) -> List[Tuple[str, float]]:
+        """
+        Related skills of a skill set, for query expansion
+
+        Args:
+            user_skills: List of user's skills
+            limit: Maximum number of skills to add
+
+        Returns:
+            (skill, score) pairs the user does not have, best first; a skill related to
+            several of the user's skills gets its highest score
+        """
+        user_columns = sorted({
+            self._skill_index[skill]
+            for skill in (s.strip().lower() for s in user_skills)
+            if skill in self._skill_index
+        })
+        if not user_columns or limit <= 0:
+            return []
+
+        related = self.skill_neighbours[user_columns].tocoo()
+        order = np.lexsort((-related.data, related.col))
+        columns, first = np.unique(related.col[order], return_index=True)
+        scores = related.data[order][first]
+        keep = ~np.isin(columns, user_columns)
+        columns, scores = columns[keep], scores[keep]
+        best = np.argsort(-scores, kind="stable")[:limit]
+        return [(self.skill_vocabulary[columns[i]], float(scores[i])) for i in best]
+
+    @staticmethod
+    def _normalize_filter_value(value) -> Optional[str]:
+        """Normalise a categorical value for filtering (None for missing values)"""
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return None
+        return str(value).strip().lower()
+
+    def _build_filter_indexes(self):
+        """Dictionary-encode the filter columns present in the catalog"""
+        for column in FILTER_COLUMNS:
+            if column not in self.jobs_df.columns:
+                continue
+            values = self.jobs_df[column].map(self._normalize_filter_value)
+            codes, uniques = pd.factorize(values, use_na_sentinel=True)
+            code_dtype = np.int8 if len(uniques) < 127 else np.int16 if len(uniques) < 32767 else np.int32
+            self._filter_indexes[column] = (
+                codes.astype(code_dtype),
+                {value: code for code, value in enumerate(uniques)}
+            )
+        if self._filter_indexes:
+            logger.info(f"Filter indexes built for {list(self._filter_indexes)}")
+
+    def filter_values(self) -> Dict[str, List[str]]:
+        """Filterable columns and their values"""
+        return {column: sorted(lookup) for column, (_, lookup) in self._filter_indexes.items()}
+
+    def normalize_filters(self, filters: Optional[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+        """
+        Validate and normalise filter predicates
+
+        Args:
+            filters: Allowed values per column; a job matches if it has one of the
+                values of every column
+
+        Returns:
+            Filters with lowercased, sorted, de-duplicated values
+
+        Raises:
+            ValueError: If a column cannot be filtered on
+        """
+        if not filters:
+            return {}
+        unknown = [column for column in filters if column not in self._filter_indexes]
+        if unknown:
+            raise ValueError(f"Cannot filter on {unknown}. Filterable columns: {list(self._filter_indexes)}")
+        return {
+            column: sorted({self._normalize_filter_value(value) for value in values if value is not None})
+            for column, values in sorted(filters.items())
+        }
+
+    def filter_mask(self, filters: Optional[Dict[str, List[str]]]) -> Optional[np.ndarray]:
+        """Boolean mask of the jobs matching normalised filters (None when unfiltered)"""
+        if not filters:
+            return None
+        mask = np.ones(len(self.jobs_df), dtype=bool)
+        for column, values in filters.items():
+            codes, lookup = self._filter_indexes[column]
+            # One extra slot, left False, is what the -1 code of missing values reads
+            allowed = np.zeros(len(lookup) + 1, dtype=bool)
+            allowed[[lookup[value] for value in values if value in lookup]] = True
+            mask &= allowed[codes]
+        return mask
+
+    @staticmethod
+    def parse_skills(skills_str: str) -> List[str]:
+        """Parse required skills (space-separated within quoted CSV field)"""
+        return [
+            s.strip().lower()
+            for s in str(skills_str).split()
+            if s.strip()
+        ]
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """
+        Get a job from the catalog by ID
+        
+        Args:
+            job_id: Job ID
+            
+        Returns:
+            Dictionary with job_id, job_title and required_skills, or None if not found
+        """
+        position = self.job_position(job_id)
+        if position is None:
+            return None
+        
+        return self._job_at(position)
+
+    def job_position(self, job_id: str) -> Optional[int]:
+        """Catalog row position of a job, or None if it is not in the catalog"""
+        return self._job_positions.get(str(job_id))
+
+    def list_jobs(self, offset: int = 0, limit: int = 50) -> List[Dict]:
+        """
+        Get a slice of the catalog in dataset order
+        
+        Args:
+            offset: Position of the first job
+            limit: Maximum number of jobs
+            
+        Returns:
+            List of jobs as returned by get_job
+        """
+        if self.jobs_df is None:
+            return []
+        
+        end = min(offset + limit, len(self.jobs_df))
+        return [self._job_at(position) for position in range(offset, end)]
+
+    def _job_at(self, position: int) -> Dict:
+        """Get the job at a row position of the catalog"""
+        job_row = self.jobs_df.iloc[position]
+        return {
+            "job_id": str(job_row["job_id"]),
+            "job_title": str(job_row["job_title"]),
+            "required_skills": self.parse_skills(job_row["skills"])
+        }
+
+    @staticmethod
+    def build_recommendation(
+        job: Dict,
+        similarity_score: float,
+        user_skills: List[str],
+        missing_skills: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Build a recommendation entry for a catalog job
+        
+        Args:
+            job: Job as returned by get_job
+            similarity_score: Cosine similarity between user and job
+            user_skills: List of user's skills
+            missing_skills: Precomputed skill gap; computed from user_skills if omitted
+            
+        Returns:
+            Recommendation dictionary
+        """
+        if missing_skills is None:
+            user_skills_lower = {s.lower() for s in user_skills}
+            missing_skills = [
+                skill for skill in job["required_skills"]
+                if skill not in user_skills_lower
+            ]
+        
+        return {
+            "job_id": job["job_id"],
+            "job_title": job["job_title"],
+            "match_score": similarity_score,
+            "match_percentage": round(similarity_score * 100, 2),
+            "required_skills": job["required_skills"],
+            "user_skills": user_skills,
+            "missing_skills": missing_skills,
+            "skill_gap_count": len(missing_skills)
+        }
+    
     def recommend_jobs(
         self, 
         user_skills: List[str], 
         top_n: int = 10,
-        min_similarity: float = 0.1
+        min_similarity: float = 0.1,
+        filters: Optional[Dict[str, List[str]]] = None,
+        expand_skills: int = 0,
+        expansion_weight: float = 0.5
     ) -> List[Dict]:
         """
         Recommend jobs based on user skills
@@ -117,6 +491,9 @@ class JobRecommender:
             user_skills: List of user's skills
             top_n: Number of top recommendations to return
             min_similarity: Minimum similarity threshold
+            filters: Allowed values per filter column (see normalize_filters)
+            expand_skills: Related skills added to the query (see rank)
+            expansion_weight: Weight of the added skills relative to the user's own
             
         Returns:
             List of job recommendations with match scores
@@ -126,69 +503,210 @@ class JobRecommender:
             return []
         
         try:
-            # Convert user skills to text
-            user_skills_text = " ".join(user_skills).lower()
+            positions, scores = self.rank(
+                user_skills, top_n, min_similarity, filters,
+                expand_skills=expand_skills, expansion_weight=expansion_weight
+            )
             
-            # Transform user skills to TF-IDF vector
-            user_vector = self.vectorizer.transform([user_skills_text])
+            with time_stage("materialise"):
+                recommendations = self.materialise(positions, scores, user_skills)
             
-            # Calculate cosine similarity
-            similarities = cosine_similarity(user_vector, self.job_vectors)[0]
-            
-            # Get top N recommendations
-            top_indices = np.argsort(similarities)[::-1][:top_n]
-            
-            recommendations = []
-            
-            for idx in top_indices:
-                similarity_score = float(similarities[idx])
-                
-                # Filter by minimum similarity
-                if similarity_score < min_similarity:
-                    continue
-                
-                job_row = self.jobs_df.iloc[idx]
-                job_id = str(job_row["job_id"])
-                job_title = str(job_row["job_title"])
-                required_skills_str = str(job_row["skills"])
-                
-                # Parse required skills (space-separated within quoted CSV field)
-                required_skills = [
-                    s.strip().lower()
-                    for s in required_skills_str.split()
-                    if s.strip()
-                ]
-                
-                # Calculate skill gap
-                user_skills_lower = [s.lower() for s in user_skills]
-                missing_skills = [
-                    skill for skill in required_skills 
-                    if skill not in user_skills_lower
-                ]
-                
-                recommendation = {
-                    "job_id": job_id,
-                    "job_title": job_title,
-                    "match_score": similarity_score,
-                    "match_percentage": round(similarity_score * 100, 2),
-                    "required_skills": required_skills,
-                    "user_skills": user_skills,
-                    "missing_skills": missing_skills,
-                    "skill_gap_count": len(missing_skills)
-                }
-                
-                recommendations.append(recommendation)
-            
-            # Sort by match score (descending)
-            recommendations.sort(key=lambda x: x["match_score"], reverse=True)
-            
-            logger.info(f"Generated {len(recommendations)} job recommendations")
+            logger.debug(f"Generated {len(recommendations)} job recommendations")
             return recommendations
             
         except Exception as e:
             logger.error(f"Error generating recommendations: {str(e)}")
             raise ValueError(f"Failed to generate recommendations: {str(e)}")
+
+    def rank(
+        self,
+        user_skills: List[str],
+        depth: int,
+        min_similarity: float = 0.1,
+        filters: Optional[Dict[str, List[str]]] = None,
+        expand_skills: int = 0,
+        expansion_weight: float = 0.5
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank jobs for a skill set without building recommendation dicts
+        
+        Args:
+            user_skills: List of user's skills
+            depth: Maximum number of ranked jobs
+            min_similarity: Minimum similarity threshold
+            filters: Allowed values per filter column (see normalize_filters)
+            expand_skills: Add up to this many related skills (see expand_skills) to the query
+            expansion_weight: Weight of the added skills relative to the user's own; each
+                added skill is further weighted by its relatedness score
+            
+        Returns:
+            Tuple of (catalog row positions, similarity scores), best first
+        """
+        with time_stage("vectorize"):
+            # Convert user skills to text
+            user_skills_text = " ".join(user_skills).lower()
+            
+            # Transform user skills to TF-IDF vector
+            user_vector = self.vectorizer.transform([user_skills_text])
+
+            related = self.expand_skills(user_skills, expand_skills) if expand_skills else []
+            if related:
+                weights = np.array([[score for _, score in related]])
+                expansion = sparse.csr_matrix(
+                    weights @ self._skill_vectors[[self._skill_index[skill] for skill, _ in related]]
+                )
+                expansion_norm = np.sqrt(expansion.multiply(expansion).sum())
+                if expansion_norm > 0:
+                    user_vector = normalize(user_vector + expansion * (expansion_weight / expansion_norm))
+        
+        with time_stage("score"):
+            mask = self.filter_mask(self.normalize_filters(filters))
+            positions, scores = self._top_k(user_vector, depth, mask)
+            
+            # Filter by minimum similarity; scores are sorted, so this is a prefix
+            keep = int(np.count_nonzero(scores >= min_similarity))
+        return positions[:keep], scores[:keep]
+
+    def _top_k(self, user_vector, top_n: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Row positions and cosine similarities of the top_n jobs for a query vector"""
+        if self.scorer is not None:
+            try:
+                return self.scorer.top_k(user_vector, top_n, mask)
+            except Exception as e:
+                logger.error(f"Sharded scoring failed, scoring in process: {str(e)}")
+        
+        # Job and query vectors are L2-normalised, so the dot product is the cosine similarity
+        similarities = self.score_all(user_vector)
+        if mask is not None:
+            # Excluded jobs fall below any min_similarity before top-k selection
+            similarities[~mask] = -1.0
+        
+        # Get top N recommendations
+        top_n = min(top_n, len(similarities))
+        if top_n <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        top_indices = np.argpartition(-similarities, top_n - 1)[:top_n]
+        top_indices = top_indices[np.argsort(-similarities[top_indices], kind="stable")]
+        return top_indices, similarities[top_indices]
+
+    def score_all(self, user_vector) -> np.ndarray:
+        """Cosine similarity of a vectorised query with every job"""
+        query = compact_vectors.dense_query(user_vector, np.float64)
+        return compact_vectors.score(self.job_vectors, query, self._row_scales)
+
+    def job_vector(self, position: int):
+        """Job vector at a catalog row position, as a 1 x n_features float matrix"""
+        return compact_vectors.dequantise_row(self.job_vectors, self._row_scales, position)
+
+    def memory_report(self) -> Dict:
+        """Bytes held by the catalog structures"""
+        return {
+            "vector_dtype": self.vector_dtype,
+            "job_vectors_nnz": int(self.job_vectors.nnz),
+            "job_vectors_bytes": compact_vectors.nbytes(self.job_vectors) + (
+                self._row_scales.nbytes if self._row_scales is not None else 0
+            ),
+            "skill_matrix_bytes": compact_vectors.nbytes(self.skill_matrix),
+            "skill_neighbours_bytes": compact_vectors.nbytes(self.skill_neighbours) + self._skill_cooccurrence.nbytes,
+            "jobs_df_bytes": int(self.jobs_df.memory_usage(deep=True).sum())
+        }
+
+    def enable_sharding(self, shards: int):
+        """
+        Score queries on a pool of processes, one per row shard of job_vectors
+        
+        Args:
+            shards: Number of shards (and pool processes)
+        """
+        from app.services.sharded_scorer import ShardedScorer
+        
+        self.close()
+        self.scorer = ShardedScorer(self.job_vectors, shards, self._row_scales)
+
+    def close(self):
+        """Stop the sharded scorer, if any"""
+        if self.scorer is not None:
+            self.scorer.close()
+            self.scorer = None
+
+    def iter_recommendations(self, positions: np.ndarray, scores: np.ndarray, user_skills: List[str]):
+        """Yield recommendation dicts for ranked catalog rows, one at a time"""
+        for position, score in zip(positions, scores):
+            yield self.build_recommendation(self._job_at(int(position)), float(score), user_skills)
+
+    def materialise(self, positions: np.ndarray, scores: np.ndarray, user_skills: List[str]) -> List[Dict]:
+        """Build recommendation dicts for ranked catalog rows"""
+        return list(self.iter_recommendations(positions, scores, user_skills))
     
+    def rank_missing_skills(
+        self,
+        user_skills: List[str],
+        top_n: int = 10,
+        match_threshold: float = 0.5,
+        rank_by: str = "jobs"
+    ) -> Dict:
+        """
+        Rank the skills a user lacks by how much each would raise their match across the catalog
+
+        A job counts as matched when the user has at least match_threshold of its required
+        skills (the match_percentage of get_skill_gap_analysis). For every missing skill this
+        computes, in one sparse product over the job x skill matrix:
+        unlocked_jobs, the jobs that would become matched by learning it, and match_gain, the
+        summed match percentage points it adds across jobs the user already partially matches.
+
+        Args:
+            user_skills: List of user's skills
+            top_n: Number of skills to return
+            match_threshold: Fraction of a job's required skills needed to match it
+            rank_by: "jobs" to rank by unlocked_jobs, "score" to rank by match_gain
+
+        Returns:
+            Dictionary with the number of currently matched jobs and the ranked skills
+        """
+        user_columns = sorted({
+            self._skill_index[skill]
+            for skill in (s.strip().lower() for s in user_skills)
+            if skill in self._skill_index
+        })
+        user_vector = np.zeros(len(self.skill_vocabulary), dtype=np.float32)
+        user_vector[user_columns] = 1.0
+
+        with time_stage("skill_gap_catalog"):
+            counts = self._skill_counts
+            matched = self.skill_matrix @ user_vector
+            needed = match_threshold * counts
+            has_skills = counts > 0
+
+            # Per-job weight of a missing skill: whether it crosses the threshold, and the
+            # percentage points it adds to jobs the user already partially matches
+            weights = np.zeros((len(counts), 2), dtype=np.float32)
+            weights[:, 0] = has_skills & (matched < needed) & (matched + 1 >= needed)
+            partial = has_skills & (matched > 0)
+            weights[partial, 1] = 100.0 / counts[partial]
+
+            gains = np.asarray(self.skill_matrix.T @ weights)
+
+            primary, secondary = (gains[:, 0], gains[:, 1]) if rank_by == "jobs" else (gains[:, 1], gains[:, 0])
+            primary = primary.copy()
+            primary[user_columns] = -1.0
+            order = np.lexsort((-secondary, -primary))[:top_n]
+
+        skills = [
+            {
+                "skill": self.skill_vocabulary[column],
+                "unlocked_jobs": int(gains[column, 0]),
+                "match_gain": round(float(gains[column, 1]), 2),
+                "job_count": int(self._skill_job_counts[column])
+            }
+            for column in order
+            if primary[column] > 0
+        ]
+        return {
+            "matched_jobs": int(np.count_nonzero(has_skills & (matched >= needed))),
+            "match_threshold": match_threshold,
+            "skills": skills
+        }
+
     def get_skill_gap_analysis(
         self, 
         user_skills: List[str], 
@@ -205,19 +723,15 @@ class JobRecommender:
             Dictionary with skill gap analysis
         """
         try:
-            job_row = self.jobs_df[self.jobs_df["job_id"] == job_id]
+            job = self.get_job(job_id)
             
-            if job_row.empty:
+            if job is None:
                 raise ValueError(f"Job with ID {job_id} not found")
             
-            required_skills_str = str(job_row.iloc[0]["skills"])
-            required_skills = [
-                s.strip().lower()
-                for s in required_skills_str.split()
-                if s.strip()
-            ]
+            # Repeated skills count once, as in the skill matrix behind rank_missing_skills
+            required_skills = list(dict.fromkeys(job["required_skills"]))
             
-            user_skills_lower = [s.lower() for s in user_skills]
+            user_skills_lower = {s.strip().lower() for s in user_skills}
             
             matching_skills = [
                 skill for skill in required_skills 
@@ -44,7 +44,7 @@ class ResumeParser:
             if not full_text.strip():
                 raise ValueError("No text content found in PDF")
             
-            logger.info(f"Successfully extracted {len(full_text)} characters from PDF")
+            logger.debug(f"Successfully extracted {len(full_text)} characters from PDF")
             return full_text
             
         except Exception as e:
@@ -0,0 +1,169 @@
+"""
+Sharded multi-process scoring for large job catalogs
+The job vector matrix is copied once into shared memory and split into row shards.
+A persistent process pool scores a query against every shard in parallel; each process
+attaches to the shared arrays at startup, so only the query and the per-shard top-k
+results cross process boundaries.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+from scipy import sparse
+
+from app.services.compact_vectors import row_view, score
+
+logger = logging.getLogger(__name__)
+
+# Per-process state of pool workers, set by _attach
+_worker_segments: List[shared_memory.SharedMemory] = []
+_worker_matrix: Optional[sparse.csr_matrix] = None
+_worker_scales: Optional[np.ndarray] = None
+_worker_shards: Dict[int, sparse.csr_matrix] = {}
+
+
+def _attach(layout: Dict[str, Tuple[str, str, int]], shape: Tuple[int, int]):
+    """Pool initializer: map the shared CSR arrays into this process"""
+    global _worker_matrix, _worker_scales
+    arrays = {}
+    for name, (segment_name, dtype, length) in layout.items():
+        # Spawned processes share the parent's resource tracker, so the parent's
+        # unlink on close also covers these attachments
+        segment = shared_memory.SharedMemory(name=segment_name)
+        _worker_segments.append(segment)
+        arrays[name] = np.ndarray((length,), dtype=dtype, buffer=segment.buf)
+    _worker_matrix = sparse.csr_matrix(
+        (arrays["data"], arrays["indices"], arrays["indptr"]), shape=shape, copy=False
+    )
+    _worker_scales = arrays.get("scales")
+
+
+def _shard(start: int, end: int) -> sparse.csr_matrix:
+    """CSR view of rows [start, end) sharing data and indices with the shared arrays"""
+    shard = _worker_shards.get(start)
+    if shard is None:
+        shard = row_view(_worker_matrix, start, end)
+        _worker_shards[start] = shard
+    return shard
+
+
+def _score_shard(
+    start: int,
+    end: int,
+    query_indices: np.ndarray,
+    query_data: np.ndarray,
+    k: int,
+    packed_mask: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Score rows [start, end) against a normalised query; return the shard's top k"""
+    query = np.zeros(_worker_matrix.shape[1], dtype=np.float64)
+    query[query_indices] = query_data
+    scales = _worker_scales[start:end] if _worker_scales is not None else None
+    scores = score(_shard(start, end), query, scales)
+    if packed_mask is not None:
+        scores[~np.unpackbits(packed_mask, count=end - start).astype(bool)] = -1.0
+
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top + start, scores[top]
+
+
+def _warm_up(bounds: Tuple[int, int]) -> Optional[int]:
+    """Build a shard view in a pool process"""
+    return _shard(*bounds).shape[0]
+
+
+class ShardedScorer:
+    """Top-k cosine scoring of a query against job vectors split across processes"""
+
+    def __init__(self, job_vectors: sparse.spmatrix, shards: int, row_scales: Optional[np.ndarray] = None):
+        """
+        Copy job vectors to shared memory and start the pool
+
+        Args:
+            job_vectors: L2-normalised job vectors (one row per job), as from compact_vectors.compact
+            shards: Number of row shards and pool processes
+            row_scales: Per-row scales of int8 job vectors
+        """
+        matrix = sparse.csr_matrix(job_vectors)
+        self.shape = matrix.shape
+        self.shards = max(1, min(shards, self.shape[0]))
+        self._segments: List[shared_memory.SharedMemory] = []
+
+        layout = {}
+        try:
+            arrays = [("data", matrix.data), ("indices", matrix.indices), ("indptr", matrix.indptr)]
+            if row_scales is not None:
+                arrays.append(("scales", row_scales))
+            for name, array in arrays:
+                segment = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+                self._segments.append(segment)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[:] = array
+                layout[name] = (segment.name, array.dtype.str, len(array))
+
+            # Equal row ranges; rows have similar numbers of non-zeros
+            bounds = np.linspace(0, self.shape[0], self.shards + 1).astype(int)
+            self._ranges = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+            # spawn: forking a process that already runs server threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.shards,
+                mp_context=get_context("spawn"),
+                initializer=_attach,
+                initargs=(layout, self.shape)
+            )
+            # Start every process and map its shard before the first request
+            list(self._pool.map(_warm_up, self._ranges))
+        except Exception:
+            self.close()
+            raise
+
+        logger.info(f"Sharded scorer started: {self.shape[0]} jobs in {self.shards} shards")
+
+    def top_k(self, query: sparse.spmatrix, k: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cosine similarity top k of a single query vector
+
+        Args:
+            query: 1 x n_features sparse query vector
+            k: Number of results
+            mask: Boolean mask of eligible rows; other rows score -1
+
+        Returns:
+            Tuple of (row positions, scores), sorted by descending score
+        """
+        query = sparse.csr_matrix(query)
+        norm = np.sqrt(query.multiply(query).sum())
+        if not norm or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        query_indices = query.indices
+        query_data = query.data / norm
+
+        # Masks are sent bit-packed: one byte per eight jobs
+        futures = [
+            self._pool.submit(
+                _score_shard, start, end, query_indices, query_data, k,
+                np.packbits(mask[start:end]) if mask is not None else None
+            )
+            for start, end in self._ranges
+        ]
+        positions, scores = zip(*(future.result() for future in futures))
+
+        # Merge the per-shard top-k lists
+        positions = np.concatenate(positions)
+        scores = np.concatenate(scores)
+        order = np.argsort(-scores, kind="stable")[:k]
+        return positions[order], scores[order]
+
+    def close(self):
+        """Stop the pool and free the shared memory"""
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
@@ -102,7 +102,7 @@ class SkillExtractor:
         # Sort skills for consistency
         sorted_skills = sorted(list(found_skills))
         
-        logger.info(f"Extracted {len(sorted_skills)} skills from resume")
+        logger.debug(f"Extracted {len(sorted_skills)} skills from resume")
         return sorted_skills
     
     def get_skill_categories(self, skills: List[str]) -> dict:
@@ -0,0 +1,64 @@
+"""
+Storage backends for DatabaseService
+Selected with the STORAGE_BACKEND setting ("supabase" or "sqlite")
+"""
+from typing import Optional
+import threading
+import logging
+
+from app.core.config import settings
+from app.services.storage.base import StorageBackend, Keyset, DuplicateRecordError
+
+logger = logging.getLogger(__name__)
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+
+def create_storage_backend(name: str) -> Optional[StorageBackend]:
+    """
+    Create a storage backend by name
+
+    Returns:
+        Backend instance, or None if the supabase client is not configured
+    """
+    if name == "sqlite":
+        from app.services.storage.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(settings.SQLITE_PATH)
+
+    if name == "supabase":
+        from app.core.config import get_supabase_client
+        client = get_supabase_client()
+        if not client:
+            return None
+        from app.services.storage.supabase_backend import SupabaseBackend
+        return SupabaseBackend(client)
+
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+def get_storage_backend() -> Optional[StorageBackend]:
+    """Get the configured storage backend, creating it on first use"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                try:
+                    _backend = create_storage_backend(settings.STORAGE_BACKEND)
+                except Exception as e:
+                    logger.error(f"Could not initialize {settings.STORAGE_BACKEND} storage backend: {str(e)}")
+                    return None
+    return _backend
+
+
+def set_storage_backend(backend: Optional[StorageBackend]):
+    """Replace the storage backend (used by benchmarks and load tests)"""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+__all__ = [
+    "StorageBackend", "Keyset", "DuplicateRecordError",
+    "create_storage_backend", "get_storage_backend", "set_storage_backend"
+]
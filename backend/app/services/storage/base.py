@@ -0,0 +1,70 @@
+"""
+Storage backend interface used by DatabaseService
+"""
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List, Sequence, Tuple, NamedTuple
+
+
+class DuplicateRecordError(Exception):
+    """Raised when a write violates a unique constraint (e.g. users.email)"""
+
+
+class Keyset(NamedTuple):
+    """Keyset pagination bound: rows with (time_column, id_column) < (last_time, last_id)"""
+    time_column: str
+    id_column: str
+    last_time: str
+    last_id: str
+
+
+class StorageBackend(ABC):
+    """
+    Table operations needed by DatabaseService
+
+    Implementations raise on failure (DuplicateRecordError for unique constraint
+    violations); DatabaseService handles logging and fallbacks.
+    Columns are given as comma-separated strings, matching the supabase select syntax.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def insert(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert rows with a single statement and return them with defaults filled in"""
+
+    @abstractmethod
+    def upsert(self, table: str, rows: List[Dict[str, Any]], on_conflict: str) -> List[Dict[str, Any]]:
+        """Insert rows, replacing existing rows with the same on_conflict key"""
+
+    @abstractmethod
+    def select(
+        self,
+        table: str,
+        columns: str,
+        filters: Dict[str, Any],
+        order: Sequence[Tuple[str, bool]] = (),
+        limit: Optional[int] = None,
+        keyset: Optional[Keyset] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Select rows matching all equality filters
+
+        Args:
+            table: Table name
+            columns: Comma-separated column names
+            filters: Column -> value equality filters
+            order: Sequence of (column, descending) pairs
+            limit: Maximum number of rows
+            keyset: Optional keyset pagination bound
+        """
+
+    @abstractmethod
+    def update(self, table: str, values: Dict[str, Any], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Update rows matching all equality filters and return them"""
+
+    @abstractmethod
+    def delete(self, table: str, filters: Dict[str, Any], exclude: Optional[Dict[str, Any]] = None) -> None:
+        """Delete rows matching all equality filters and none of the exclude values"""
+
+    def close(self):
+        """Release connections held by the backend"""
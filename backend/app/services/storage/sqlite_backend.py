@@ -0,0 +1,349 @@
+"""
+Local SQLite storage backend
+Mirrors the tables in database_setup.sql for single-node deployments, benchmarks and CI
+"""
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+from datetime import datetime, timezone
+import json
+import os
+import sqlite3
+import threading
+import uuid
+import logging
+
+from app.services.storage.base import StorageBackend, Keyset, DuplicateRecordError
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f+00:00"
+
+# Same tables, keys and cascades as database_setup.sql
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    email TEXT UNIQUE NOT NULL,
+    full_name TEXT,
+    password_hash TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS resumes (
+    resume_id TEXT PRIMARY KEY,
+    user_id TEXT REFERENCES users(user_id) ON DELETE CASCADE,
+    filename TEXT,
+    extracted_text TEXT,
+    extracted_text_compressed TEXT,
+    extracted_skills TEXT,
+    uploaded_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS job_recommendations (
+    recommendation_id TEXT PRIMARY KEY,
+    user_id TEXT REFERENCES users(user_id) ON DELETE CASCADE,
+    user_skills TEXT,
+    recommendations TEXT,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS recommendation_cache (
+    cache_key TEXT PRIMARY KEY,
+    catalog_version TEXT NOT NULL,
+    recommendations TEXT,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS user_sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id TEXT REFERENCES users(user_id) ON DELETE CASCADE,
+    token_hash TEXT UNIQUE NOT NULL,
+    expires_at TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_resumes_user_uploaded ON resumes(user_id, uploaded_at DESC, resume_id DESC);
+CREATE INDEX IF NOT EXISTS idx_recommendations_user_created ON job_recommendations(user_id, created_at DESC, recommendation_id DESC);
+CREATE INDEX IF NOT EXISTS idx_recommendation_cache_version ON recommendation_cache(catalog_version);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON user_sessions(user_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON user_sessions(expires_at);
+
+CREATE TRIGGER IF NOT EXISTS update_users_updated_at
+    AFTER UPDATE ON users
+    FOR EACH ROW WHEN NEW.updated_at = OLD.updated_at
+    BEGIN
+        UPDATE users SET updated_at = strftime('%Y-%m-%dT%H:%M:%f000+00:00', 'now')
+        WHERE user_id = NEW.user_id;
+    END;
+"""
+
+# Per-table column metadata: primary key (generated like gen_random_uuid() where flagged),
+# JSONB columns and timestamp columns defaulting to NOW()
+TABLES = {
+    'users': {
+        'columns': ['user_id', 'email', 'full_name', 'password_hash', 'created_at', 'updated_at'],
+        'primary_key': 'user_id',
+        'generate_key': True,
+        'json': set(),
+        'now': ['created_at', 'updated_at'],
+    },
+    'resumes': {
+        'columns': ['resume_id', 'user_id', 'filename', 'extracted_text', 'extracted_text_compressed',
+                    'extracted_skills', 'uploaded_at'],
+        'primary_key': 'resume_id',
+        'generate_key': True,
+        'json': {'extracted_skills'},
+        'now': ['uploaded_at'],
+    },
+    'job_recommendations': {
+        'columns': ['recommendation_id', 'user_id', 'user_skills', 'recommendations', 'created_at'],
+        'primary_key': 'recommendation_id',
+        'generate_key': True,
+        'json': {'user_skills', 'recommendations'},
+        'now': ['created_at'],
+    },
+    'recommendation_cache': {
+        'columns': ['cache_key', 'catalog_version', 'recommendations', 'created_at'],
+        'primary_key': 'cache_key',
+        'generate_key': False,
+        'json': {'recommendations'},
+        'now': ['created_at'],
+    },
+    'user_sessions': {
+        'columns': ['session_id', 'user_id', 'token_hash', 'expires_at', 'created_at'],
+        'primary_key': 'session_id',
+        'generate_key': True,
+        'json': set(),
+        'now': ['created_at'],
+    },
+}
+
+
+class SQLiteBackend(StorageBackend):
+    """Storage backend on a local SQLite database in WAL mode, one connection per thread"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        """
+        Initialize SQLite backend
+
+        Args:
+            path: Database file path, or ":memory:" for a shared in-memory database
+        """
+        self.path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        if path == ":memory:":
+            # Shared-cache URI so every thread sees the same in-memory database
+            self._uri = f"file:app-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            self._uri = None
+
+        # Create the schema eagerly; an in-memory database lives as long as this connection
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+        logger.info(f"SQLite storage backend ready at {path}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._uri:
+                conn = sqlite3.connect(self._uri, uri=True, timeout=5.0, cached_statements=256)
+            else:
+                conn = sqlite3.connect(self.path, timeout=5.0, cached_statements=256)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.row_factory = sqlite3.Row
+
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _now() -> str:
+        """Current UTC time in a fixed-width format that sorts lexically"""
+        return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+    @staticmethod
+    def _timestamp(value: Any) -> str:
+        """Normalise an ISO timestamp to the stored fixed-width format"""
+        parsed = datetime.fromisoformat(str(value))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+    @staticmethod
+    def _table(table: str) -> Dict[str, Any]:
+        """Get table metadata, rejecting unknown tables"""
+        if table not in TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        return TABLES[table]
+
+    def _columns(self, table: str, columns) -> List[str]:
+        """Validate column names against the schema"""
+        meta = self._table(table)
+        if isinstance(columns, str):
+            columns = [c.strip() for c in columns.split(",")]
+        if columns == ["*"]:
+            return list(meta['columns'])
+
+        unknown = [c for c in columns if c not in meta['columns']]
+        if unknown:
+            raise ValueError(f"Unknown columns for {table}: {unknown}")
+        return list(columns)
+
+    def _with_defaults(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Fill primary key and timestamp defaults like the Postgres schema does"""
+        meta = self._table(table)
+        row = dict(row)
+        if meta['generate_key'] and meta['primary_key'] not in row:
+            row[meta['primary_key']] = str(uuid.uuid4())
+        now = self._now()
+        for column in meta['now']:
+            row.setdefault(column, now)
+        return row
+
+    def _encode(self, table: str, row: Dict[str, Any], columns: List[str]) -> Tuple:
+        """Encode row values for binding, serialising JSON columns"""
+        json_columns = self._table(table)['json']
+        return tuple(
+            json.dumps(row.get(column)) if column in json_columns and row.get(column) is not None
+            else row.get(column)
+            for column in columns
+        )
+
+    def _decode(self, table: str, row: sqlite3.Row) -> Dict[str, Any]:
+        """Decode a fetched row, parsing JSON columns"""
+        json_columns = self._table(table)['json']
+        decoded = dict(row)
+        for column in json_columns.intersection(decoded):
+            if decoded[column] is not None:
+                decoded[column] = json.loads(decoded[column])
+        return decoded
+
+    @staticmethod
+    def _where(filters: Dict[str, Any], exclude: Optional[Dict[str, Any]] = None) -> Tuple[List[str], List[Any]]:
+        """Build WHERE clauses and parameters for equality filters"""
+        clauses = [f"{column} = ?" for column in filters]
+        params = list(filters.values())
+        for column, value in (exclude or {}).items():
+            clauses.append(f"{column} != ?")
+            params.append(value)
+        return clauses, params
+
+    def _write(self, table: str, rows: List[Dict[str, Any]], conflict: Optional[str]) -> List[Dict[str, Any]]:
+        """Insert or upsert rows in one transaction with a single prepared statement"""
+        if not rows:
+            return []
+
+        rows = [self._with_defaults(table, row) for row in rows]
+        columns = self._columns(table, list(rows[0].keys()))
+
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        if conflict:
+            self._columns(table, [conflict])
+            updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != conflict)
+            sql += f" ON CONFLICT({conflict}) DO UPDATE SET {updates}"
+
+        conn = self._connection()
+        try:
+            with conn:
+                conn.executemany(sql, [self._encode(table, row, columns) for row in rows])
+        except sqlite3.IntegrityError as e:
+            if "UNIQUE" in str(e):
+                raise DuplicateRecordError(str(e)) from e
+            raise
+        return rows
+
+    def insert(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self._write(table, rows, conflict=None)
+
+    def upsert(self, table: str, rows: List[Dict[str, Any]], on_conflict: str) -> List[Dict[str, Any]]:
+        return self._write(table, rows, conflict=on_conflict)
+
+    def select(
+        self,
+        table: str,
+        columns: str,
+        filters: Dict[str, Any],
+        order: Sequence[Tuple[str, bool]] = (),
+        limit: Optional[int] = None,
+        keyset: Optional[Keyset] = None
+    ) -> List[Dict[str, Any]]:
+        selected = self._columns(table, columns)
+        self._columns(table, list(filters) + [column for column, _ in order])
+        clauses, params = self._where(filters)
+
+        if keyset:
+            self._columns(table, [keyset.time_column, keyset.id_column])
+            last_time = self._timestamp(keyset.last_time)
+            clauses.append(
+                f"({keyset.time_column} < ? OR ({keyset.time_column} = ? AND {keyset.id_column} < ?))"
+            )
+            params.extend([last_time, last_time, keyset.last_id])
+
+        sql = f"SELECT {', '.join(selected)} FROM {table}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order:
+            sql += " ORDER BY " + ", ".join(f"{c} {'DESC' if d else 'ASC'}" for c, d in order)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        rows = self._connection().execute(sql, params).fetchall()
+        return [self._decode(table, row) for row in rows]
+
+    def update(self, table: str, values: Dict[str, Any], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        columns = self._columns(table, list(values))
+        self._columns(table, list(filters))
+        clauses, params = self._where(filters)
+
+        sql = f"UPDATE {table} SET {', '.join(f'{c} = ?' for c in columns)}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " RETURNING *"
+
+        conn = self._connection()
+        try:
+            with conn:
+                rows = conn.execute(sql, list(self._encode(table, values, columns)) + params).fetchall()
+        except sqlite3.IntegrityError as e:
+            if "UNIQUE" in str(e):
+                raise DuplicateRecordError(str(e)) from e
+            raise
+        return [self._decode(table, row) for row in rows]
+
+    def delete(self, table: str, filters: Dict[str, Any], exclude: Optional[Dict[str, Any]] = None) -> None:
+        # Child rows go with their parent through ON DELETE CASCADE (foreign_keys is on)
+        self._columns(table, list(filters) + list(exclude or {}))
+        clauses, params = self._where(filters, exclude)
+
+        sql = f"DELETE FROM {table}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+
+        conn = self._connection()
+        with conn:
+            conn.execute(sql, params)
+
+    def close(self):
+        """Close every thread's connection"""
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.ProgrammingError:
+                    # Connections of other threads may refuse cross-thread close
+                    pass
+            self._connections = []
+        self._local = threading.local()
@@ -0,0 +1,83 @@
+"""
+Supabase (PostgREST) storage backend
+"""
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+from postgrest.exceptions import APIError
+
+from app.services.storage.base import StorageBackend, Keyset, DuplicateRecordError
+
+# Postgres SQLSTATE for unique_violation
+UNIQUE_VIOLATION = "23505"
+
+
+class SupabaseBackend(StorageBackend):
+    """Storage backend issuing queries through the supabase client"""
+
+    name = "supabase"
+
+    def __init__(self, client):
+        """
+        Initialize supabase backend
+
+        Args:
+            client: Client returned by supabase.create_client
+        """
+        self.client = client
+
+    @staticmethod
+    def _execute(query):
+        """Execute a query, translating unique violations"""
+        try:
+            return query.execute().data or []
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise DuplicateRecordError(e.message) from e
+            raise
+
+    def insert(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self._execute(self.client.table(table).insert(rows))
+
+    def upsert(self, table: str, rows: List[Dict[str, Any]], on_conflict: str) -> List[Dict[str, Any]]:
+        return self._execute(self.client.table(table).upsert(rows, on_conflict=on_conflict))
+
+    def select(
+        self,
+        table: str,
+        columns: str,
+        filters: Dict[str, Any],
+        order: Sequence[Tuple[str, bool]] = (),
+        limit: Optional[int] = None,
+        keyset: Optional[Keyset] = None
+    ) -> List[Dict[str, Any]]:
+        query = self.client.table(table).select(columns)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+
+        if keyset:
+            query = query.or_(
+                f'{keyset.time_column}.lt."{keyset.last_time}",'
+                f'and({keyset.time_column}.eq."{keyset.last_time}",{keyset.id_column}.lt.{keyset.last_id})'
+            )
+
+        for column, descending in order:
+            query = query.order(column, desc=descending)
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        return query.execute().data or []
+
+    def update(self, table: str, values: Dict[str, Any], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        query = self.client.table(table).update(values)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        return self._execute(query)
+
+    def delete(self, table: str, filters: Dict[str, Any], exclude: Optional[Dict[str, Any]] = None) -> None:
+        query = self.client.table(table).delete()
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        for column, value in (exclude or {}).items():
+            query = query.neq(column, value)
+        query.execute()
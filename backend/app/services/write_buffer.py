@@ -0,0 +1,277 @@
+"""
+Write-behind buffer for non-critical database inserts
+Collects single-row inserts off the request path and flushes them as multi-row inserts
+"""
+from collections import defaultdict
+from typing import Callable, Dict, List, Any, Optional
+import threading
+import time
+import logging
+
+from app.core.metrics import WRITE_BUFFER_PENDING, WRITE_BUFFER_DROPPED
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Bounded in-memory buffer that batches inserts per table on a background thread"""
+
+    def __init__(
+        self,
+        flush_fn: Callable[[str, List[Dict[str, Any]]], bool],
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+        max_retries: int = 2,
+        retry_backoff: float = 0.1
+    ):
+        """
+        Initialize write-behind buffer
+
+        Args:
+            flush_fn: Callable inserting a list of rows into a table, returns success
+            batch_size: Number of pending rows that triggers an immediate flush
+            flush_interval: Maximum seconds a row waits before being flushed
+            max_pending: Maximum number of buffered rows; further writes are dropped
+            max_retries: Retries of a failed multi-row insert before falling back to
+                inserting its rows one by one, so only rows that fail alone are dropped
+            retry_backoff: Seconds before the first retry, doubled for each further retry
+        """
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._pending: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._pending_count = 0
+        # Batches taken from _pending that are being written, by id of the batches dict
+        self._in_flight: Dict[int, Dict[str, List[Dict[str, Any]]]] = {}
+        # Callbacks per table, called with the rows once they are inserted
+        self._listeners: Dict[str, List[Callable[[List[Dict[str, Any]]], None]]] = defaultdict(list)
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+        # Counters
+        self.submitted = 0
+        self.flushed = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of rows waiting to be flushed"""
+        return self._pending_count
+
+    def stats(self) -> Dict[str, int]:
+        """Get buffer counters"""
+        return {
+            "pending": self._pending_count,
+            "submitted": self.submitted,
+            "flushed": self.flushed,
+            "dropped": self.dropped
+        }
+
+    def submit(self, table: str, row: Dict[str, Any]) -> bool:
+        """
+        Queue a row for insertion
+
+        Args:
+            table: Target table name
+            row: Row to insert
+
+        Returns:
+            True if the row was queued, False if it was dropped
+        """
+        with self._condition:
+            if self._stopping:
+                self.dropped += 1
+                WRITE_BUFFER_DROPPED.inc()
+                logger.warning(f"Write buffer stopped, dropping write to {table}")
+                return False
+
+            if self._pending_count >= self.max_pending:
+                self.dropped += 1
+                WRITE_BUFFER_DROPPED.inc()
+                logger.warning(f"Write buffer full ({self.max_pending} rows), dropping write to {table}")
+                return False
+
+            self._ensure_started()
+            self._pending[table].append(row)
+            self._pending_count += 1
+            self.submitted += 1
+            WRITE_BUFFER_PENDING.set(self._pending_count)
+
+            if self._pending_count >= self.batch_size:
+                self._condition.notify()
+
+        return True
+
+    def discard(self, predicate: Callable[[str, Dict[str, Any]], bool]) -> int:
+        """
+        Remove pending rows matching a predicate (e.g. rows of a deleted user)
+
+        Returns:
+            Number of rows removed
+        """
+        removed = 0
+        with self._condition:
+            for table, rows in self._pending.items():
+                kept = [row for row in rows if not predicate(table, row)]
+                removed += len(rows) - len(kept)
+                self._pending[table] = kept
+            self._pending_count -= removed
+            WRITE_BUFFER_PENDING.set(self._pending_count)
+        return removed
+
+    def find(self, table: str, predicate: Callable[[Dict[str, Any]], bool]) -> Optional[Dict[str, Any]]:
+        """
+        Find a row that is buffered or being written, for read-your-writes lookups
+
+        Returns:
+            A copy of the first matching row, or None
+        """
+        with self._condition:
+            candidates = [self._pending.get(table, [])]
+            candidates += [batches.get(table, []) for batches in self._in_flight.values()]
+            for rows in candidates:
+                for row in rows:
+                    if predicate(row):
+                        return dict(row)
+        return None
+
+    def on_written(self, table: str, callback: Callable[[List[Dict[str, Any]]], None]):
+        """
+        Call callback with rows of table once they are inserted
+
+        Rows that are dropped never reach it. Registering the same callback again is a no-op.
+        """
+        with self._condition:
+            if callback not in self._listeners[table]:
+                self._listeners[table].append(callback)
+
+    def notify_written(self, table: str, rows: List[Dict[str, Any]]):
+        """Pass inserted rows to the table's callbacks (also used for inserts made without the buffer)"""
+        for callback in list(self._listeners.get(table, ())):
+            try:
+                callback(rows)
+            except Exception as e:
+                logger.error(f"Error in write listener for {table}: {str(e)}")
+
+    def start(self):
+        """Start (or restart after stop) the flush thread ahead of the first write"""
+        with self._condition:
+            self._stopping = False
+            self._ensure_started()
+
+    def flush(self):
+        """Flush all pending rows synchronously"""
+        with self._condition:
+            batches = self._take_pending()
+        self._write(batches)
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background thread and flush remaining rows"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout)
+
+        # Flush anything the thread did not get to
+        self.flush()
+        logger.info(f"Write buffer stopped: {self.stats()}")
+
+    def _ensure_started(self):
+        """Start the flush thread on first use (must hold the condition lock)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                name="write-behind-buffer",
+                daemon=True
+            )
+            self._thread.start()
+
+    def _take_pending(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Swap out pending rows (must hold the condition lock)"""
+        batches = {table: rows for table, rows in self._pending.items() if rows}
+        if batches:
+            self._in_flight[id(batches)] = batches
+        self._pending = defaultdict(list)
+        self._pending_count = 0
+        WRITE_BUFFER_PENDING.set(0)
+        return batches
+
+    def _run(self):
+        """Background loop flushing on size or time trigger"""
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self.flush_interval
+                while (
+                    not self._stopping
+                    and self._pending_count < self.batch_size
+                    and time.monotonic() < deadline
+                ):
+                    self._condition.wait(max(deadline - time.monotonic(), 0))
+
+                stopping = self._stopping
+                batches = self._take_pending()
+
+            self._write(batches)
+
+            if stopping:
+                return
+
+    def _insert(self, table: str, rows: List[Dict[str, Any]]) -> bool:
+        """Call flush_fn, treating exceptions as failures"""
+        try:
+            return self.flush_fn(table, rows)
+        except Exception as e:
+            logger.error(f"Error flushing {len(rows)} rows to {table}: {str(e)}")
+            return False
+
+    def _write_chunk(self, table: str, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Insert a chunk, retrying with backoff, then row by row
+
+        Returns:
+            Rows that were inserted
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+            if self._insert(table, chunk):
+                return chunk
+
+        if len(chunk) == 1:
+            return []
+        # One bad row (e.g. a user deleted while their rows were buffered) fails the whole
+        # multi-row insert; isolate it so the other users' rows are kept
+        logger.warning(f"Inserting {len(chunk)} rows to {table} one by one after repeated failures")
+        return [row for row in chunk if self._insert(table, [row])]
+
+    def _write(self, batches: Dict[str, List[Dict[str, Any]]]):
+        """Insert batches table by table, in chunks of batch_size"""
+        try:
+            for table, rows in batches.items():
+                for start in range(0, len(rows), self.batch_size):
+                    chunk = rows[start:start + self.batch_size]
+                    written = self._write_chunk(table, chunk)
+                    failed = len(chunk) - len(written)
+
+                    with self._condition:
+                        self.flushed += len(written)
+                        if failed:
+                            self.dropped += failed
+                            WRITE_BUFFER_DROPPED.inc(failed)
+
+                    if failed:
+                        logger.error(f"Dropped {failed} of {len(chunk)} buffered writes to {table}")
+                    if written:
+                        self.notify_written(table, written)
+        finally:
+            with self._condition:
+                self._in_flight.pop(id(batches), None)
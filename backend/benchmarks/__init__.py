@@ -0,0 +1,4 @@
+"""
+Benchmarks for the core services
+Run from the backend directory: python -m benchmarks.run --help
+"""
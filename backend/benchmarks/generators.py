@@ -0,0 +1,166 @@
+"""
+Synthetic data generators for benchmarks
+Jobs and resumes are drawn from the SkillExtractor vocabulary so that recommendations
+and skill extraction behave as they do on real data
+"""
+from typing import List, Optional
+import csv
+import random
+
+from app.services.skill_extractor import SkillExtractor
+
+SKILL_VOCABULARY = sorted(SkillExtractor.TECHNICAL_SKILLS | SkillExtractor.SOFT_SKILLS)
+
+JOB_TITLE_LEVELS = ["Junior", "Mid-level", "Senior", "Lead", "Principal", "Staff"]
+JOB_TITLE_ROLES = [
+    "Software Engineer", "Backend Developer", "Frontend Developer", "Data Scientist",
+    "Machine Learning Engineer", "DevOps Engineer", "Data Analyst", "Mobile Developer",
+    "Cloud Architect", "QA Engineer", "Full Stack Developer", "Site Reliability Engineer"
+]
+
+JOB_LOCATIONS = ["berlin", "london", "new york", "bangalore", "toronto", "singapore", "paris", "austin"]
+JOB_SALARY_BANDS = ["<50k", "50-80k", "80-120k", "120-160k", ">160k"]
+
+FILLER_SENTENCES = [
+    "Delivered features end to end with a focus on reliability.",
+    "Worked closely with product and design to ship on schedule.",
+    "Improved performance of critical services and reduced costs.",
+    "Mentored new team members and reviewed code daily.",
+    "Owned on-call rotations and incident follow-ups.",
+    "Designed internal tooling used across several teams."
+]
+
+
+def generate_jobs_csv(
+    path: str,
+    rows: int,
+    seed: int = 42,
+    min_skills: int = 5,
+    max_skills: int = 15,
+    attributes: bool = False
+) -> str:
+    """
+    Write a synthetic jobs catalog in the dataset/jobs.csv format
+
+    Args:
+        path: Output CSV path
+        rows: Number of jobs
+        seed: Random seed, so runs are comparable
+        min_skills: Minimum skills per job
+        max_skills: Maximum skills per job
+        attributes: Also write location, seniority, remote and salary_band columns
+
+    Returns:
+        The output path
+    """
+    rng = random.Random(seed)
+    # Separate stream, so titles and skills are the same with or without attributes
+    attribute_rng = random.Random(seed + 1)
+    header = ["job_id", "job_title", "skills"]
+    if attributes:
+        header += ["location", "seniority", "remote", "salary_band"]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(header)
+        for job_id in range(1, rows + 1):
+            level = rng.choice(JOB_TITLE_LEVELS)
+            title = f"{level} {rng.choice(JOB_TITLE_ROLES)}"
+            skills = rng.sample(SKILL_VOCABULARY, rng.randint(min_skills, max_skills))
+            row = [job_id, title, " ".join(skills)]
+            if attributes:
+                row += [
+                    attribute_rng.choice(JOB_LOCATIONS),
+                    level.lower(),
+                    attribute_rng.random() < 0.3,
+                    attribute_rng.choice(JOB_SALARY_BANDS)
+                ]
+            writer.writerow(row)
+    return path
+
+
+def generate_user_skills(rng: random.Random, count: int = 8) -> List[str]:
+    """Draw a random skill list for a recommendation request"""
+    return rng.sample(SKILL_VOCABULARY, count)
+
+
+def generate_resume_text(rng: random.Random, skills: int = 12, paragraphs: int = 6) -> str:
+    """
+    Generate resume-like text mentioning a random set of skills
+
+    Args:
+        rng: Random generator
+        skills: Number of distinct skills mentioned
+        paragraphs: Number of experience paragraphs
+
+    Returns:
+        Resume text
+    """
+    chosen = rng.sample(SKILL_VOCABULARY, skills)
+    lines = ["Jane Doe", "Software professional", "", "Experience"]
+    for index in range(paragraphs):
+        mentioned = chosen[index::paragraphs] or chosen[:2]
+        lines.append(
+            f"{rng.choice(JOB_TITLE_ROLES)} - used {', '.join(mentioned)} daily. "
+            f"{rng.choice(FILLER_SENTENCES)} {rng.choice(FILLER_SENTENCES)}"
+        )
+    lines += ["", "Skills", ", ".join(chosen)]
+    return "\n".join(lines)
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str, lines_per_page: int = 45, max_line_length: int = 90) -> bytes:
+    """
+    Render text as a minimal multi-page PDF (Helvetica, one text object per page)
+
+    Args:
+        text: Text to render
+        lines_per_page: Lines per page before starting a new one
+        max_line_length: Lines are wrapped at this many characters
+
+    Returns:
+        PDF file bytes readable by ResumeParser
+    """
+    lines: List[str] = []
+    for raw_line in text.splitlines() or [""]:
+        while len(raw_line) > max_line_length:
+            cut = raw_line.rfind(" ", 0, max_line_length)
+            cut = cut if cut > 0 else max_line_length
+            lines.append(raw_line[:cut])
+            raw_line = raw_line[cut:].lstrip()
+        lines.append(raw_line)
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then a (page, content) pair per page
+    objects: List[Optional[bytes]] = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in page_lines:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", errors="replace")
+        page_number = len(objects) + 1
+        content_number = page_number + 1
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_number} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        page_refs.append(f"{page_number} 0 R")
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(page_refs)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    return bytes(out)
@@ -0,0 +1,350 @@
+"""
+End-to-end load test for the FastAPI app
+
+Usage (from the backend directory):
+    python -m benchmarks.loadtest --users 20 --duration 30 --mix journey=1,recommend=4,browse=2
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --users 50 --duration 60
+
+Without --url the app is driven in-process through httpx's ASGI transport, with the
+lifespan run as a real worker would, and storage replaced by a local SQLite database
+(the Supabase client is never created). Note the client shares the event loop and CPU
+with the app in this mode; use --url against a separately started server
+(STORAGE_BACKEND=sqlite) to measure a real worker count.
+
+Reports per-endpoint throughput, latency percentiles and histograms, and error rates.
+"""
+from collections import defaultdict
+from contextlib import AsyncExitStack
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+from benchmarks.generators import generate_user_skills, generate_resume_text, make_pdf
+
+API = "/api/v1"
+
+# Histogram bucket upper bounds in milliseconds
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+class EndpointStats:
+    """Latencies and status codes recorded for one endpoint"""
+
+    def __init__(self):
+        self.durations: List[float] = []
+        self.statuses: Dict[str, int] = defaultdict(int)
+
+    def record(self, duration: float, status: str):
+        self.durations.append(duration)
+        self.statuses[status] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        durations = sorted(self.durations)
+        count = len(durations)
+        errors = sum(n for status, n in self.statuses.items() if not status.startswith(("2", "3")))
+
+        def percentile(fraction: float) -> float:
+            index = min(count - 1, max(0, int(round(fraction * count)) - 1))
+            return round(durations[index] * 1000, 3)
+
+        histogram = {}
+        remaining = iter(durations)
+        bucket_counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        for duration in remaining:
+            ms = duration * 1000
+            for index, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+                if ms <= bound:
+                    bucket_counts[index] += 1
+                    break
+            else:
+                bucket_counts[-1] += 1
+        for index, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            histogram[f"<={bound}ms"] = bucket_counts[index]
+        histogram[f">{HISTOGRAM_BUCKETS_MS[-1]}ms"] = bucket_counts[-1]
+
+        return {
+            "requests": count,
+            "throughput_per_s": round(count / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(errors / count, 4) if count else 0.0,
+            "statuses": dict(self.statuses),
+            "p50_ms": percentile(0.50),
+            "p90_ms": percentile(0.90),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(durations[-1] * 1000, 3),
+            "histogram": histogram
+        }
+
+
+class VirtualUser:
+    """One simulated client with its own account and token"""
+
+    def __init__(self, client: httpx.AsyncClient, stats: Dict[str, EndpointStats], rng: random.Random, run_id: str, index: int):
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.email = f"loadtest-{run_id}-{index}@example.com"
+        self.password = "loadtest-password"
+        self.token: Optional[str] = None
+        self.skills: List[str] = generate_user_skills(rng)
+        self.job_ids: List[str] = []
+
+    async def request(self, name: str, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        """Send a request and record it under the endpoint name"""
+        if self.token:
+            kwargs.setdefault("headers", {})["Authorization"] = f"Bearer {self.token}"
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, **kwargs)
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            response = None
+            status = type(e).__name__
+        self.stats[name].record(time.perf_counter() - start, status)
+        return response
+
+    async def register(self):
+        response = await self.request(
+            "POST /auth/register", "POST", f"{API}/auth/register",
+            json={"email": self.email, "password": self.password, "full_name": "Load Test"}
+        )
+        if response is not None and response.status_code == 201:
+            self.token = response.json()["access_token"]
+
+    async def login(self):
+        self.token = None
+        response = await self.request(
+            "POST /auth/login", "POST", f"{API}/auth/login",
+            json={"email": self.email, "password": self.password}
+        )
+        if response is not None and response.status_code == 200:
+            self.token = response.json()["access_token"]
+
+    async def upload(self):
+        pdf = make_pdf(generate_resume_text(self.rng))
+        response = await self.request(
+            "POST /resume/upload", "POST", f"{API}/resume/upload",
+            files={"file": ("resume.pdf", pdf, "application/pdf")}
+        )
+        if response is not None and response.status_code == 200:
+            self.skills = response.json()["extracted_skills"] or self.skills
+
+    async def recommend(self):
+        response = await self.request(
+            "POST /jobs/recommend", "POST", f"{API}/jobs/recommend",
+            json={"user_skills": self.skills, "top_n": 10}
+        )
+        if response is not None and response.status_code == 200:
+            self.job_ids = [rec["job_id"] for rec in response.json()["recommendations"]]
+
+    async def skill_gap(self):
+        if not self.job_ids:
+            return
+        await self.request(
+            "POST /jobs/skill-gap/{job_id}", "POST", f"{API}/jobs/skill-gap/{self.rng.choice(self.job_ids)}",
+            json={"user_skills": self.skills}
+        )
+
+    async def browse(self):
+        response = await self.request("GET /jobs/catalog", "GET", f"{API}/jobs/catalog", params={"limit": 20})
+        if response is not None and response.status_code == 200:
+            jobs = response.json()["jobs"]
+            if jobs:
+                await self.request("GET /jobs/{job_id}", "GET", f"{API}/jobs/{self.rng.choice(jobs)['job_id']}")
+
+    async def history(self):
+        await self.request("GET /jobs/history", "GET", f"{API}/jobs/history", params={"limit": 10})
+
+
+# Scenarios are sequences of VirtualUser steps
+SCENARIOS: Dict[str, Callable[[VirtualUser], Awaitable[None]]] = {}
+
+
+def scenario(name: str):
+    def register(fn):
+        SCENARIOS[name] = fn
+        return fn
+    return register
+
+
+@scenario("journey")
+async def journey(user: VirtualUser):
+    """login -> upload -> recommend -> skill-gap"""
+    await user.login()
+    await user.upload()
+    await user.recommend()
+    await user.skill_gap()
+
+
+@scenario("recommend")
+async def recommend_only(user: VirtualUser):
+    """recommend -> skill-gap with the existing token"""
+    await user.recommend()
+    await user.skill_gap()
+
+
+@scenario("browse")
+async def browse(user: VirtualUser):
+    """catalog page -> job detail -> recommendation history"""
+    await user.browse()
+    await user.history()
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse "journey=1,recommend=4" into scenario weights"""
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r}; available: {sorted(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    users: int,
+    duration: float,
+    mix: Dict[str, float],
+    seed: int
+) -> Dict[str, Any]:
+    """
+    Run virtual users against a client until the duration elapses
+
+    Returns:
+        Report with overall and per-endpoint results
+    """
+    stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+    run_id = uuid.uuid4().hex[:8]
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    scenario_counts: Dict[str, int] = defaultdict(int)
+
+    virtual_users = [
+        VirtualUser(client, stats, random.Random(seed + index), run_id, index)
+        for index in range(users)
+    ]
+    await asyncio.gather(*(user.register() for user in virtual_users))
+
+    # Registration is setup, not part of the measured mix
+    setup = stats.pop("POST /auth/register", EndpointStats())
+    registered = setup.statuses.get("201", 0)
+
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+
+    async def loop(user: VirtualUser):
+        while time.perf_counter() < deadline:
+            name = user.rng.choices(names, weights)[0]
+            scenario_counts[name] += 1
+            await SCENARIOS[name](user)
+
+    await asyncio.gather(*(loop(user) for user in virtual_users))
+    elapsed = time.perf_counter() - started
+
+    endpoints = {name: endpoint.summary(elapsed) for name, endpoint in sorted(stats.items()) if endpoint.durations}
+    total = sum(e["requests"] for e in endpoints.values())
+    errors = sum(round(e["error_rate"] * e["requests"]) for e in endpoints.values())
+    return {
+        "users": users,
+        "registered_users": registered,
+        "duration_s": round(elapsed, 2),
+        "scenarios": dict(scenario_counts),
+        "requests": total,
+        "throughput_per_s": round(total / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "endpoints": endpoints
+    }
+
+
+async def run_in_process(args, mix: Dict[str, float]) -> Dict[str, Any]:
+    """Drive app.main:app through the ASGI transport with a SQLite stand-in for storage"""
+    from app.core.config import settings
+    from app.services.storage import set_storage_backend
+    from app.services.storage.sqlite_backend import SQLiteBackend
+
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as workdir:
+        set_storage_backend(SQLiteBackend(os.path.join(workdir, "loadtest.db")))
+        if not args.rate_limits:
+            settings.RATE_LIMIT_ENABLED = False
+
+        from app.main import app
+
+        async with AsyncExitStack() as stack:
+            # Run startup and shutdown like a server would; ASGITransport does not
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout)
+            )
+            return await run_load(client, args.users, args.duration, mix, args.seed)
+
+
+async def run_remote(args, mix: Dict[str, float]) -> Dict[str, Any]:
+    """Drive a running server over HTTP"""
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        return await run_load(client, args.users, args.duration, mix, args.seed)
+
+
+def print_report(report: Dict[str, Any]):
+    print(
+        f"\n{report['requests']} requests in {report['duration_s']}s "
+        f"({report['throughput_per_s']}/s), error rate {report['error_rate']:.2%}, "
+        f"{report['users']} users, scenarios {report['scenarios']}"
+    )
+    print(f"{'endpoint':<32} {'reqs':>7} {'req/s':>8} {'err%':>7} {'p50ms':>9} {'p90ms':>9} {'p99ms':>9} {'maxms':>9}")
+    for name, e in report["endpoints"].items():
+        print(
+            f"{name:<32} {e['requests']:>7} {e['throughput_per_s']:>8.1f} {e['error_rate']:>7.2%} "
+            f"{e['p50_ms']:>9.2f} {e['p90_ms']:>9.2f} {e['p99_ms']:>9.2f} {e['max_ms']:>9.2f}"
+        )
+    for name, e in report["endpoints"].items():
+        peak = max(e["histogram"].values()) or 1
+        print(f"\n{name}  statuses {e['statuses']}")
+        for bucket, count in e["histogram"].items():
+            if count:
+                print(f"  {bucket:>9} {count:>7} {'#' * max(1, round(40 * count / peak))}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the API with mixed scenarios")
+    parser.add_argument("--url", help="Base URL of a running server; omit to run the app in-process")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load after setup")
+    parser.add_argument("--mix", default="journey=1,recommend=4,browse=2", help=f"Scenario weights; available: {sorted(SCENARIOS)}")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rate-limits", action="store_true", help="Keep per-user rate limits on (in-process only)")
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    runner = run_remote if args.url else run_in_process
+    report = asyncio.run(runner(args, mix))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""
+Benchmark runner for the core services
+
+Usage (from the backend directory):
+    python -m benchmarks.run run --sizes 1000,10000 --output results.json
+    python -m benchmarks.run compare baseline.json results.json --threshold 0.15
+    python -m benchmarks.run vectors --size 100000
+
+The run command times JobRecommender.__init__, recommend_jobs (plain, filtered and with
+related-skill expansion), related_skills, get_skill_gap_analysis and rank_missing_skills
+on synthetic catalogs of each size, and
+SkillExtractor.extract_skills and ResumeParser.extract_text_from_pdf on synthetic
+resumes. Each benchmark reports throughput, latency percentiles and peak traced memory.
+The compare command exits with status 1 if any benchmark regressed past the threshold.
+The vectors command reports the memory saved by the float32 and int8 job vector types
+and their largest score deviation from float64.
+"""
+from typing import Any, Callable, Dict, List
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.generators import (
+    generate_jobs_csv, generate_user_skills, generate_resume_text, make_pdf
+)
+
+# Metrics compared by the compare command; higher is worse for all of them
+COMPARED_METRICS = ["p50_ms", "p95_ms", "p99_ms", "peak_memory_mb"]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def measure(fn: Callable[[], Any], iterations: int, warmup: int = 1) -> Dict[str, float]:
+    """
+    Time repeated calls of fn
+
+    Latency is measured without tracing; peak memory comes from one extra traced call
+    so tracemalloc overhead does not distort the timings.
+
+    Args:
+        fn: Callable to benchmark
+        iterations: Timed calls
+        warmup: Untimed calls made first
+
+    Returns:
+        Throughput, latency percentiles (ms) and peak traced memory (MB)
+    """
+    for _ in range(warmup):
+        fn()
+
+    durations = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    durations.sort()
+    return {
+        "iterations": iterations,
+        "throughput_per_s": round(iterations / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(durations) / len(durations) * 1000, 4),
+        "p50_ms": round(_percentile(durations, 0.50) * 1000, 4),
+        "p95_ms": round(_percentile(durations, 0.95) * 1000, 4),
+        "p99_ms": round(_percentile(durations, 0.99) * 1000, 4),
+        "max_ms": round(durations[-1] * 1000, 4),
+        "peak_memory_mb": round(peak / (1024 * 1024), 3)
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _report(name: str, result: Dict[str, float]):
+    print(
+        f"{name:<56} p50 {result['p50_ms']:>10.3f}ms  p99 {result['p99_ms']:>10.3f}ms  "
+        f"{result['throughput_per_s']:>10.1f}/s  peak {result['peak_memory_mb']:>8.2f}MB"
+    )
+
+
+def run_benchmarks(sizes: List[int], iterations: int, seed: int, workdir: str) -> Dict[str, Dict[str, float]]:
+    """
+    Run every benchmark
+
+    Args:
+        sizes: Catalog sizes to benchmark the recommender on
+        iterations: Timed calls per benchmark (the constructor uses fewer)
+        seed: Random seed for the generators
+        workdir: Directory for generated catalogs
+
+    Returns:
+        Results keyed by benchmark name
+    """
+    from app.services.recommender import JobRecommender
+    from app.services.skill_extractor import SkillExtractor
+    from app.services.resume_parser import ResumeParser
+
+    results: Dict[str, Dict[str, float]] = {}
+    rng = random.Random(seed)
+
+    def record(name: str, result: Dict[str, float]):
+        results[name] = result
+        _report(name, result)
+
+    for size in sizes:
+        csv_path = generate_jobs_csv(os.path.join(workdir, f"jobs_{size}.csv"), size, seed=seed, attributes=True)
+        init_iterations = max(1, min(5, iterations // 20))
+
+        record(
+            f"recommender.init[n={size}]",
+            measure(lambda: JobRecommender(dataset_path=csv_path), init_iterations, warmup=0)
+        )
+
+        recommender = JobRecommender(dataset_path=csv_path)
+        queries = [generate_user_skills(rng) for _ in range(64)]
+        job_ids = [str(rng.randint(1, size)) for _ in range(64)]
+        counter = iter(range(10 ** 12))
+
+        record(
+            f"recommender.recommend_jobs[n={size}]",
+            measure(lambda: recommender.recommend_jobs(queries[next(counter) % 64], top_n=10), iterations)
+        )
+        filters = {"location": ["berlin", "london"], "remote": ["true"]}
+        record(
+            f"recommender.recommend_jobs_filtered[n={size}]",
+            measure(
+                lambda: recommender.recommend_jobs(queries[next(counter) % 64], top_n=10, filters=filters),
+                iterations
+            )
+        )
+        record(
+            f"recommender.recommend_jobs_expanded[n={size}]",
+            measure(
+                lambda: recommender.recommend_jobs(queries[next(counter) % 64], top_n=10, expand_skills=10),
+                iterations
+            )
+        )
+        record(
+            f"recommender.related_skills[n={size}]",
+            measure(lambda: recommender.related_skills(queries[next(counter) % 64][0], 10), iterations)
+        )
+        record(
+            f"recommender.get_skill_gap_analysis[n={size}]",
+            measure(
+                lambda: recommender.get_skill_gap_analysis(queries[next(counter) % 64], job_ids[next(counter) % 64]),
+                iterations
+            )
+        )
+        record(
+            f"recommender.rank_missing_skills[n={size}]",
+            measure(lambda: recommender.rank_missing_skills(queries[next(counter) % 64]), iterations)
+        )
+        del recommender
+
+    extractor = SkillExtractor()
+    for paragraphs in (6, 60):
+        texts = [generate_resume_text(rng, paragraphs=paragraphs) for _ in range(16)]
+        counter = iter(range(10 ** 12))
+        record(
+            f"skill_extractor.extract_skills[paragraphs={paragraphs}]",
+            measure(lambda: extractor.extract_skills(texts[next(counter) % 16]), iterations)
+        )
+
+    for paragraphs in (6, 120):
+        pdfs = [make_pdf(generate_resume_text(rng, paragraphs=paragraphs)) for _ in range(8)]
+        counter = iter(range(10 ** 12))
+        record(
+            f"resume_parser.extract_text_from_pdf[paragraphs={paragraphs}]",
+            measure(lambda: ResumeParser.extract_text_from_pdf(pdfs[next(counter) % 8]), iterations)
+        )
+
+    return results
+
+
+def vector_report(size: int, queries: int, top_n: int, seed: int, workdir: str) -> Dict[str, Dict[str, float]]:
+    """
+    Compare compact job vector types against float64
+
+    Args:
+        size: Catalog size
+        queries: Random queries to score
+        top_n: Ranking depth compared
+        seed: Random seed for the generators
+        workdir: Directory for the generated catalog
+
+    Returns:
+        Memory and ranking deviation per vector type
+    """
+    import numpy as np
+    from app.services.recommender import JobRecommender
+
+    csv_path = generate_jobs_csv(os.path.join(workdir, f"jobs_{size}.csv"), size, seed=seed)
+    rng = random.Random(seed)
+    skill_sets = [generate_user_skills(rng) for _ in range(queries)]
+
+    reference = JobRecommender(dataset_path=csv_path, vector_dtype="float64")
+    reference_memory = reference.memory_report()
+    reference_scores = [
+        reference.score_all(reference.vectorizer.transform([" ".join(skills).lower()]))
+        for skills in skill_sets
+    ]
+    del reference
+
+    report = {"float64": {**reference_memory, "saved_pct": 0.0}}
+    print(f"{'dtype':<8} {'vectors MB':>11} {'saved':>7} {'max score dev':>14} {'min top-k overlap':>18}")
+    print(f"{'float64':<8} {reference_memory['job_vectors_bytes'] / 2 ** 20:>11.2f} {0:>6.0%}")
+    for dtype in ("float32", "int8"):
+        compact = JobRecommender(dataset_path=csv_path, vector_dtype=dtype)
+        memory = compact.memory_report()
+        max_deviation = 0.0
+        min_overlap = 1.0
+        for skills, expected in zip(skill_sets, reference_scores):
+            scores = compact.score_all(compact.vectorizer.transform([" ".join(skills).lower()]))
+            max_deviation = max(max_deviation, float(np.max(np.abs(scores - expected))))
+            # Compare top-k sets by score so ties between equally scored jobs do not count
+            threshold = np.sort(expected)[-top_n]
+            top = np.argsort(-scores, kind="stable")[:top_n]
+            min_overlap = min(min_overlap, float(np.mean(expected[top] >= threshold - 1e-6)))
+
+        saved = 1 - memory["job_vectors_bytes"] / reference_memory["job_vectors_bytes"]
+        report[dtype] = {
+            **memory,
+            "saved_pct": round(saved * 100, 2),
+            "max_score_deviation": max_deviation,
+            "min_top_k_overlap": min_overlap
+        }
+        print(
+            f"{dtype:<8} {memory['job_vectors_bytes'] / 2 ** 20:>11.2f} {saved:>6.0%} "
+            f"{max_deviation:>14.2e} {min_overlap:>18.2%}"
+        )
+        del compact
+    return report
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare two result files
+
+    Args:
+        baseline: Baseline results document
+        current: Current results document
+        threshold: Allowed relative increase, e.g. 0.15 for 15%
+
+    Returns:
+        Descriptions of regressions (empty if none)
+    """
+    regressions = []
+    baseline_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+
+    print(f"{'benchmark':<56} {'metric':<16} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name in sorted(set(baseline_results) & set(current_results)):
+        for metric in COMPARED_METRICS:
+            before = baseline_results[name].get(metric)
+            after = current_results[name].get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else 0.0
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}: {before} -> {after} (+{change:.0%})")
+            print(f"{name:<56} {metric:<16} {before:>12.3f} {after:>12.3f} {change:>+8.0%}{flag}")
+
+    for name in sorted(set(baseline_results) ^ set(current_results)):
+        print(f"{name:<56} only in {'baseline' if name in baseline_results else 'current'}")
+
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the core services")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks and write results as JSON")
+    run_parser.add_argument("--sizes", default="1000,10000", help="Comma-separated catalog sizes (up to 1000000)")
+    run_parser.add_argument("--iterations", type=int, default=100, help="Timed calls per benchmark")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--output", default="benchmark_results.json")
+
+    compare_parser = subparsers.add_parser("compare", help="Flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative increase")
+
+    vectors_parser = subparsers.add_parser("vectors", help="Report memory and ranking deviation of compact job vectors")
+    vectors_parser.add_argument("--size", type=int, default=100000, help="Catalog size")
+    vectors_parser.add_argument("--queries", type=int, default=200)
+    vectors_parser.add_argument("--top-n", type=int, default=10)
+    vectors_parser.add_argument("--seed", type=int, default=42)
+    vectors_parser.add_argument("--output", default=None)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions")
+        return 0
+
+    # Keep per-call service logging out of the timings
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.command == "vectors":
+        with tempfile.TemporaryDirectory(prefix="benchmarks-") as workdir:
+            report = vector_report(args.size, args.queries, args.top_n, args.seed, workdir)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    with tempfile.TemporaryDirectory(prefix="benchmarks-") as workdir:
+        results = run_benchmarks(sizes, args.iterations, args.seed, workdir)
+
+    document = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "iterations": args.iterations,
+            "seed": args.seed
+        },
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,7 +23,8 @@ CREATE TABLE resumes (
     resume_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     user_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
     filename VARCHAR(255),
-    extracted_text TEXT,
+    extracted_text TEXT,                -- legacy rows only; new rows use extracted_text_compressed
+    extracted_text_compressed TEXT,     -- base64-encoded zlib of the extracted text
     extracted_skills JSONB,
     uploaded_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -35,10 +36,14 @@ CREATE TABLE job_recommendations (
     recommendation_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     user_id UUID REFERENCES users(user_id) ON DELETE CASCADE,
     user_skills JSONB,
+    -- {"format": "refs-v1", "catalog_version": ..., "items": [[job_id, score, [missing skill positions]], ...]}
+    -- job titles and required skills are rehydrated from the in-memory catalog on read
     recommendations JSONB,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Existing databases: ALTER TABLE resumes ADD COLUMN extracted_text_compressed TEXT;
+
 -- ============================================
 -- 4. Create User Sessions Table (Optional - for session management)
 -- ============================================
@@ -50,6 +55,18 @@ CREATE TABLE user_sessions (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- ============================================
+-- 4a. Create Recommendation Cache Table (shared across users)
+-- ============================================
+-- Keyed by a hash of (normalised skill set, top_n, catalog version); rows
+-- from older catalog versions are purged by the backend on startup
+CREATE TABLE recommendation_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    catalog_version VARCHAR(64) NOT NULL,
+    recommendations JSONB,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 -- ============================================
 -- 5. Enable Row Level Security (RLS)
 -- ============================================
@@ -57,6 +74,8 @@ ALTER TABLE users ENABLE ROW LEVEL SECURITY;
 ALTER TABLE resumes ENABLE ROW LEVEL SECURITY;
 ALTER TABLE job_recommendations ENABLE ROW LEVEL SECURITY;
 ALTER TABLE user_sessions ENABLE ROW LEVEL SECURITY;
+-- No policies: the cache is served to every user, so only the backend's service role may read or write it
+ALTER TABLE recommendation_cache ENABLE ROW LEVEL SECURITY;
 
 -- ============================================
 -- 6. Create RLS Policies
@@ -111,18 +130,22 @@ CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_users_created_at ON users(created_at);
 
 -- Resumes table indexes
-CREATE INDEX idx_resumes_user_id ON resumes(user_id);
-CREATE INDEX idx_resumes_uploaded_at ON resumes(uploaded_at);
+-- Composite index serves both the per-user filter and the keyset pagination
+-- order used by GET /resume/history: (uploaded_at, resume_id) DESC
+CREATE INDEX idx_resumes_user_uploaded ON resumes(user_id, uploaded_at DESC, resume_id DESC);
 
 -- Job recommendations table indexes
-CREATE INDEX idx_recommendations_user_id ON job_recommendations(user_id);
-CREATE INDEX idx_recommendations_created_at ON job_recommendations(created_at);
+-- Same pattern for GET /jobs/history: (created_at, recommendation_id) DESC
+CREATE INDEX idx_recommendations_user_created ON job_recommendations(user_id, created_at DESC, recommendation_id DESC);
 
 -- User sessions table indexes
 CREATE INDEX idx_sessions_user_id ON user_sessions(user_id);
 CREATE INDEX idx_sessions_token_hash ON user_sessions(token_hash);
 CREATE INDEX idx_sessions_expires_at ON user_sessions(expires_at);
 
+-- Recommendation cache indexes
+CREATE INDEX idx_recommendation_cache_version ON recommendation_cache(catalog_version);
+
 -- ============================================
 -- 8. Create Functions (Optional - for cleanup)
 -- ============================================
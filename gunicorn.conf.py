@@ -0,0 +1,32 @@
+"""
+Gunicorn configuration
+Loaded automatically when gunicorn is started from the repository root
+"""
+import gc
+import os
+
+# Import the app once in the master so fork-safe components (the job catalog and
+# fitted vectorizer) are built once and shared copy-on-write by every worker.
+# Set GUNICORN_PRELOAD=0 to import the app in each worker instead.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+
+def when_ready(server):
+    """Start fork-safe components in the master before workers are forked"""
+    if not server.cfg.preload_app:
+        return
+
+    from app.core.lifecycle import registry
+    registry.start_all(fork_safe_only=True)
+
+    # Move everything allocated so far out of the collector's view, so collections
+    # in the workers do not touch (and copy) the shared pages
+    gc.freeze()
+    server.log.info(f"Preloaded components: {registry.status()}")
+
+
+def child_exit(server, worker):
+    """Remove a dead worker's live gauge values from the Prometheus multiprocess directory"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)